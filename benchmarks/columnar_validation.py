@@ -0,0 +1,51 @@
+import logging
+import time
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.columnar import ColumnarValidator
+from submission_validator.validation.json import JsonValidator
+from submission_validator.validation.upload import UploadValidator
+from tests.unit.submission_validator.validation.validation_utils import load_schema_files
+
+ROW_COUNT = 50000
+FILE_COUNT = 1000
+
+
+def build_submission() -> Submission:
+    submission = Submission()
+    for index in range(ROW_COUNT):
+        submission.map('run_experiment', f'run{index}', {
+            'experiment_name': f'ERX{index}',
+            'sequencing_platform': 'ILLUMINA',
+            'sequencing_instrument': 'Illumina MiSeq',
+            'library_source': 'GENOMIC',
+            'library_selection': 'RANDOM',
+            'library_strategy': 'WGS',
+            'uploaded_file_1': f'file{index % FILE_COUNT}.fastq.gz'
+        })
+    return submission
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    json_validator = JsonValidator('')
+    load_schema_files(json_validator)
+    file_checksum_map = {f'file{index}.fastq.gz': f'checksum{index}' for index in range(FILE_COUNT)}
+    upload_validator = UploadValidator()
+    upload_validator.file_checksum_map = file_checksum_map
+
+    submission = build_submission()
+    start = time.perf_counter()
+    for entity in submission.get_entities('run_experiment'):
+        json_validator.validate_entity(entity)
+        upload_validator.validate_entity(entity)
+    row_elapsed = time.perf_counter() - start
+
+    submission = build_submission()
+    start = time.perf_counter()
+    ColumnarValidator(json_validator, file_checksum_map).validate_data(submission)
+    column_elapsed = time.perf_counter() - start
+
+    logging.info(f'json and upload validators: {ROW_COUNT / row_elapsed:.0f} rows/s, '
+                 f'by column: {ROW_COUNT / column_elapsed:.0f} rows/s')
@@ -0,0 +1,68 @@
+import gc
+import logging
+import sys
+import time
+import tracemalloc
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.taxonomy import TaxonomyValidator
+
+ENTITY_COUNT = 100000
+DISTINCT_TAX_IDS = 10
+
+
+def build_submission(entity_count: int) -> Submission:
+    submission = Submission()
+    for index in range(entity_count):
+        submission.map('sample', f'sample{index}', {
+            'tax_id': f'unknown{index % DISTINCT_TAX_IDS}',
+            'scientific_name': 'Bacteria'
+        })
+    return submission
+
+
+def dict_path(validator: TaxonomyValidator, submission: Submission):
+    for entity in submission.get_entities('sample'):
+        sample = entity.attributes
+        response = validator.ena_taxonomy.validate_taxonomy(
+            tax_id=sample['tax_id'], scientific_name=sample['scientific_name'])
+        errors = {}
+        for key in ('tax_id', 'scientific_name'):
+            if key in response and 'error' in response[key]:
+                errors.setdefault(key, []).append(response[key]['error'])
+        for key in ('tax_id', 'scientific_name'):
+            if 'error' in response:
+                errors.setdefault(key, []).append(response['error'])
+        for attribute, error_msgs in errors.items():
+            entity.add_errors(attribute, error_msgs)
+
+
+def collector_path(validator: TaxonomyValidator, submission: Submission):
+    validator.validate_data(submission)
+
+
+def measure(name: str, path):
+    validator = TaxonomyValidator()
+    submission = build_submission(ENTITY_COUNT)
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    start = time.perf_counter()
+    path(validator, submission)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    gc.collect()
+    blocks = sys.getallocatedblocks() - blocks_before
+    logging.info(
+        f'{name}: {elapsed:.2f}s (traced), retained {retained / 1e6:.1f} MB in {blocks} blocks, '
+        f'peak {peak / 1e6:.1f} MB for {ENTITY_COUNT} entities')
+    return submission
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    expected = measure('dict of lists per entity (previous path)', dict_path).get_all_errors()
+    actual = measure('ErrorCollector', collector_path).get_all_errors()
+    assert expected == actual
@@ -0,0 +1,45 @@
+import logging
+import re
+import subprocess
+import sys
+
+MODULES = [
+    'submission_validator.validation.taxonomy',
+    'submission_validator.validation.json',
+    'submission_validator.validation.upload',
+    'submission_validator.validation.docker'
+]
+DEFERRED_MODULES = ['requests', 'boto3', 'botocore', 'docker']
+RUNS = 5
+IMPORT_TIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$')
+
+
+def import_times(module: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True, check=True
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def run():
+    regressions = []
+    for module in MODULES:
+        timings = [import_times(module) for _ in range(RUNS)]
+        best = min(timing[module] for timing in timings)
+        logging.info(f'{module}: {best / 1000:.1f} ms cumulative import time (best of {RUNS})')
+        eager = [name for name in DEFERRED_MODULES if name in timings[0]]
+        if eager:
+            regressions.append(module)
+            logging.error(f'{module} eagerly imports {", ".join(eager)}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    sys.exit(run())
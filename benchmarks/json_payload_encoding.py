@@ -0,0 +1,56 @@
+import json
+import logging
+import time
+
+from submission_validator.services.serializer import StdlibSerializer, get_serializer
+from submission_validator.validation.json import JsonValidator
+from tests.unit.submission_validator.validation.validation_utils import load_schema_files
+
+ENTITY_COUNT = 20000
+VALIDATOR_RESPONSE = json.dumps([
+    {'dataPath': '.release_date', 'errors': ["should have required property 'release_date'"]}
+]).encode()
+
+
+def sample_attributes(index: int) -> dict:
+    return {
+        'sample_alias': f'P17157_{index}',
+        'tax_id': '2697049',
+        'scientific_name': 'Severe acute respiratory syndrome coronavirus 2',
+        'collection_date': '2020-04-26',
+        'geographic_location_(country_and_or_sea)': 'Sweden',
+        'host_common_name': 'Human',
+        'host_health_state': 'Diseased',
+        'host_sex': 'NC'
+    }
+
+
+def dict_payloads(schema: dict, entities: list) -> float:
+    start = time.process_time()
+    for attributes in entities:
+        entity_attributes = json.loads(json.dumps(attributes).lower())
+        json.dumps({'schema': schema, 'object': entity_attributes}).encode('utf-8')
+        json.loads(VALIDATOR_RESPONSE)
+    return time.process_time() - start
+
+
+def encoded_payloads(serializer, encoded_schema: bytes, entities: list) -> float:
+    start = time.process_time()
+    for attributes in entities:
+        encoded_entity = serializer.dumps(attributes).lower()
+        b''.join((b'{"schema":', encoded_schema, b',"object":', encoded_entity, b'}'))
+        serializer.loads(VALIDATOR_RESPONSE)
+    return time.process_time() - start
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    validator = JsonValidator('')
+    load_schema_files(validator)
+    schema = validator.schema_by_type['sample']
+    entities = [sample_attributes(index) for index in range(ENTITY_COUNT)]
+    baseline = dict_payloads(schema, entities)
+    logging.info(f'dict payloads (previous path): {baseline / ENTITY_COUNT * 1e6:.1f}us CPU per entity')
+    for serializer in dict.fromkeys((StdlibSerializer, get_serializer())):
+        elapsed = encoded_payloads(serializer, serializer.dumps(schema), entities)
+        logging.info(f'pre-encoded schema with {serializer.name}: {elapsed / ENTITY_COUNT * 1e6:.1f}us CPU per entity')
@@ -0,0 +1,114 @@
+import argparse
+import logging
+import threading
+import time
+from typing import Any, Iterable, List
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy
+from submission_validator.services.rate_limit import AdaptiveConcurrency, RateController, TokenBucket
+from submission_validator.validation.entities import is_independent, prepare_data, validate_entities
+from submission_validator.validation.json import JsonValidator
+from submission_validator.validation.scheduler import ValidationScheduler
+from submission_validator.validation.taxonomy import TaxonomyValidator
+from tests.stub_server import StubBehaviour, StubServer, lognormal_latency
+
+ENTITY_COUNT = 2000
+WORKER_COUNTS = [1, 4, 16]
+MEDIAN_LATENCY = 0.01
+LATENCY_SIGMA = 0.5
+PERCENTILES = [50, 95, 99]
+
+
+class TimedValidator(BaseValidator):
+    def __init__(self, validator: BaseValidator):
+        self.validator = validator
+        self.entity_types = getattr(validator, 'entity_types', None)
+        self.independent_entities = is_independent(validator)
+        self.latencies: List[float] = []
+        self.__lock = threading.Lock()
+
+    def prepare_data(self, data: Submission) -> Any:
+        return prepare_data(self.validator, data)
+
+    def validate_entities(self, entities: Iterable[Entity], context: Any = None):
+        # Entities of a chunk are reported together, so each one waits for the whole chunk
+        entities = list(entities)
+        start = time.perf_counter()
+        validate_entities(self.validator, entities, context)
+        self.__record(time.perf_counter() - start, len(entities))
+
+    def validate_entity(self, entity: Entity, *args):
+        start = time.perf_counter()
+        self.validator.validate_entity(entity, *args)
+        self.__record(time.perf_counter() - start, 1)
+
+    def __record(self, latency: float, entity_count: int):
+        with self.__lock:
+            self.latencies.extend([latency] * entity_count)
+
+
+def build_submission(entity_count: int) -> Submission:
+    submission = Submission()
+    for index in range(entity_count // 2):
+        tax_id = str(100000 + index)
+        submission.map('sample', f'sample{index}', {'tax_id': tax_id, 'scientific_name': f'Species {tax_id}'})
+        submission.map('study', f'study{index}', {'study_alias': f'study{index}'})
+    return submission
+
+
+def build_validators(server: StubServer, concurrency: int, rate: float) -> List[TimedValidator]:
+    controller = RateController(TokenBucket(rate, rate), AdaptiveConcurrency(concurrency, max_limit=concurrency))
+    taxonomy_validator = TaxonomyValidator()
+    taxonomy_validator.ena_taxonomy = EnaTaxonomy(server.url, controller=controller, local_taxonomy=LocalTaxonomy([]))
+    json_validator = JsonValidator(server.validator_url, local_validation=False)
+    json_validator.schema_by_type = {'study': {'type': 'object', 'required': ['study_alias']}}
+    return [TimedValidator(taxonomy_validator), TimedValidator(json_validator)]
+
+
+def percentile(values: List[float], percent: int) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def run(arguments):
+    behaviour = StubBehaviour(
+        latency=lognormal_latency(arguments.median_latency, arguments.latency_sigma),
+        error_rate=arguments.error_rate,
+        throttle_rate=arguments.throttle_rate,
+        retry_after=0,
+        seed=1
+    )
+    with StubServer(behaviour) as server:
+        for workers in arguments.workers:
+            submission = build_submission(arguments.entities)
+            validators = build_validators(server, arguments.concurrency or workers, arguments.rate)
+            requests_before = server.request_count
+            with ValidationScheduler(max_workers=workers) as scheduler:
+                job = scheduler.submit(submission, validators)
+                job.wait()
+            elapsed = job.finished - job.started
+            latencies = [latency for validator in validators for latency in validator.latencies]
+            tail = ', '.join(f'p{percent} {percentile(latencies, percent) * 1000:.1f}ms' for percent in PERCENTILES)
+            logging.info(
+                f'{workers} worker(s): {job.total / elapsed:.0f} entities/s, '
+                f'{(server.request_count - requests_before) / elapsed:.0f} requests/s, {tail}, '
+                f'{len(job.errors)} failed chunk(s)')
+        logging.info(f'Stub responses by status: {server.status_counts}')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser(description='Load test the validators against the local stub server')
+    parser.add_argument('--entities', type=int, default=ENTITY_COUNT)
+    parser.add_argument('--workers', type=int, nargs='+', default=WORKER_COUNTS)
+    parser.add_argument('--concurrency', type=int, help='ENA concurrency limit, defaults to the worker count')
+    parser.add_argument('--rate', type=float, default=1000, help='ENA requests per second')
+    parser.add_argument('--median-latency', type=float, default=MEDIAN_LATENCY)
+    parser.add_argument('--latency-sigma', type=float, default=LATENCY_SIGMA)
+    parser.add_argument('--error-rate', type=float, default=0)
+    parser.add_argument('--throttle-rate', type=float, default=0)
+    run(parser.parse_args())
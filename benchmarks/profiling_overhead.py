@@ -0,0 +1,29 @@
+import logging
+import time
+
+from benchmarks.reference_validation import build_submission
+from submission_validator.services.profiling import ValidationProfiler
+from submission_validator.validation.reference import ReferenceValidator
+
+ENTITY_COUNT = 100000
+SAMPLE_RATES = [0.01, 0.1, 1.0]
+
+
+def validate(sample_rate: float = None) -> float:
+    submission = build_submission(ENTITY_COUNT)
+    validator = ReferenceValidator()
+    if sample_rate is not None:
+        validator = ValidationProfiler(sample_rate=sample_rate).wrap(validator)
+    start = time.perf_counter()
+    validator.validate_data(submission)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    baseline = validate()
+    logging.info(f'profiling off: {baseline / ENTITY_COUNT * 1e6:.2f}us per entity')
+    for sample_rate in SAMPLE_RATES:
+        elapsed = validate(sample_rate)
+        logging.info(f'profiling {sample_rate:.0%} of entities: {elapsed / ENTITY_COUNT * 1e6:.2f}us per entity '
+              f'(+{(elapsed - baseline) / ENTITY_COUNT * 1e6:.2f}us)')
@@ -0,0 +1,34 @@
+import logging
+import time
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.reference import ReferenceValidator
+
+ENTITY_COUNT = 100000
+
+
+def build_submission(entity_count: int) -> Submission:
+    submission = Submission()
+    per_type = entity_count // 4
+    for index in range(per_type):
+        submission.map('study', f'study{index}', {'study_accession': f'PRJEB{index}'})
+        sample = submission.map('sample', f'sample{index}', {'sample_alias': f'sample-alias{index}'})
+        run = submission.map('run_experiment', f'run{index}', {
+            'experiment_name': f'ERX{index}',
+            'sample_ref': f'sample-alias{index}',
+            'study_ref': f'PRJEB{index}'
+        })
+        run.add_link_id(sample.identifier)
+        submission.map('isolate_genome_assembly_information', f'assembly{index}', {'run_ref': f'ERX{index}'})
+    return submission
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    submission = build_submission(ENTITY_COUNT)
+    start = time.perf_counter()
+    ReferenceValidator().validate_data(submission)
+    elapsed = time.perf_counter() - start
+    logging.info(
+        f'Validated references of {ENTITY_COUNT} entities in {elapsed:.3f}s, errors: {submission.has_errors()}')
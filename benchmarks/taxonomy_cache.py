@@ -0,0 +1,43 @@
+import json
+import logging
+import os
+import tempfile
+import time
+from http import HTTPStatus
+from unittest.mock import MagicMock, patch
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy
+from submission_validator.services.taxonomy_cache import SqliteTaxonomyCache
+
+ENA_LATENCY = 0.02
+TAX_IDS = [str(tax_id) for tax_id in range(9600, 9650)]
+
+
+def slow_ena_get(url, **kwargs):
+    time.sleep(ENA_LATENCY)
+    response = MagicMock()
+    response.status_code = HTTPStatus.OK
+    response.text = ''
+    response.content = json.dumps({'taxId': url.rsplit('/', 1)[-1], 'submittable': 'true'}).encode('utf-8')
+    return response
+
+
+def validate_tax_ids(cache_path: str) -> float:
+    cache = SqliteTaxonomyCache(cache_path)
+    ena_taxonomy = EnaTaxonomy(cache=cache, local_taxonomy=LocalTaxonomy([]))
+    start = time.perf_counter()
+    for tax_id in TAX_IDS:
+        ena_taxonomy.validate_tax_id(tax_id)
+    cache.close()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    with tempfile.TemporaryDirectory() as folder, \
+            patch('submission_validator.services.ena_taxonomy.requests.get', side_effect=slow_ena_get):
+        path = os.path.join(folder, 'taxonomy.sqlite')
+        cold = validate_tax_ids(path)
+        warm = validate_tax_ids(path)
+    logging.info(f'{len(TAX_IDS)} tax ids with {ENA_LATENCY * 1000:.0f}ms ENA latency: '
+                 f'cold start {cold:.3f}s, warm start {warm:.3f}s')
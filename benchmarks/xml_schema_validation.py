@@ -0,0 +1,39 @@
+import logging
+import time
+
+from submission_validator.validation.xml import XmlSchemaValidator
+
+DOCUMENT_COUNT = 5000
+
+RUN_TEMPLATE = '<RUN_SET><RUN alias="run{index}" center_name="EBI">' \
+               '<EXPERIMENT_REF refname="experiment{index}"/>' \
+               '<DATA_BLOCK><FILES>' \
+               '<FILE filename="run{index}.fastq.gz" filetype="fastq" checksum_method="MD5" ' \
+               'checksum="0123456789abcdef0123456789abcdef"/>' \
+               '</FILES></DATA_BLOCK>' \
+               '</RUN></RUN_SET>'
+
+EXPERIMENT_TEMPLATE = '<EXPERIMENT_SET><EXPERIMENT alias="experiment{index}" center_name="EBI">' \
+                      '<STUDY_REF accession="PRJEB39632"/>' \
+                      '<DESIGN><DESIGN_DESCRIPTION/><SAMPLE_DESCRIPTOR accession="ERS4858671"/>' \
+                      '<LIBRARY_DESCRIPTOR><LIBRARY_STRATEGY>WGS</LIBRARY_STRATEGY>' \
+                      '<LIBRARY_SOURCE>GENOMIC</LIBRARY_SOURCE><LIBRARY_SELECTION>RANDOM</LIBRARY_SELECTION>' \
+                      '<LIBRARY_LAYOUT><SINGLE/></LIBRARY_LAYOUT></LIBRARY_DESCRIPTOR></DESIGN>' \
+                      '<PLATFORM><ILLUMINA><INSTRUMENT_MODEL>Illumina MiSeq</INSTRUMENT_MODEL></ILLUMINA></PLATFORM>' \
+                      '</EXPERIMENT></EXPERIMENT_SET>'
+
+
+def benchmark(name: str, documents: list):
+    validator = XmlSchemaValidator()
+    start = time.perf_counter()
+    results = validator.validate_all(documents)
+    elapsed = time.perf_counter() - start
+    invalid = sum(1 for errors in results if errors)
+    logging.info(f'{name}: {len(documents)} documents in {elapsed:.3f}s '
+                 f'({len(documents) / elapsed:.0f} documents/s, {invalid} invalid)')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    benchmark('RUN', [RUN_TEMPLATE.format(index=index) for index in range(DOCUMENT_COUNT)])
+    benchmark('EXPERIMENT', [EXPERIMENT_TEMPLATE.format(index=index) for index in range(DOCUMENT_COUNT)])
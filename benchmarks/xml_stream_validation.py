@@ -0,0 +1,32 @@
+import logging
+import resource
+import tempfile
+import time
+
+from submission_validator.validation.xml import XmlSchemaValidator
+from benchmarks.xml_schema_validation import RUN_TEMPLATE
+
+RUN_COUNT = 200000
+
+
+def write_run_set(xml_file, run_count: int):
+    run_xml = RUN_TEMPLATE[len('<RUN_SET>'):-len('</RUN_SET>')]
+    xml_file.write(b'<RUN_SET>\n')
+    for index in range(run_count):
+        xml_file.write(run_xml.format(index=index).encode('utf-8'))
+        xml_file.write(b'\n')
+    xml_file.write(b'</RUN_SET>\n')
+    xml_file.flush()
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    with tempfile.NamedTemporaryFile(suffix='.xml') as run_set_file:
+        write_run_set(run_set_file, RUN_COUNT)
+        size_mb = run_set_file.tell() / 1024 / 1024
+        start = time.perf_counter()
+        errors = list(XmlSchemaValidator().validate_stream(run_set_file.name))
+        elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    logging.info(f'Streamed {RUN_COUNT} runs ({size_mb:.0f} MB) in {elapsed:.2f}s '
+                 f'with {len(errors)} error(s), peak RSS {peak_mb:.0f} MB')
@@ -19,6 +19,9 @@ setup(
     url="https://github.com/ebi-ait/submission-validator",
     packages=find_packages(exclude=['tests', 'tests.*']),
     install_requires=install_requires,
+    extras_require={
+        'orjson': ['orjson']
+    },
     include_package_data=True,
     classifiers=[
         "Development Status :: 3 - Alpha",
@@ -0,0 +1,102 @@
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from submission_validator.services.lazy_import import lazy_import
+from submission_validator.services.profiling import external_call
+
+botocore_exceptions = lazy_import('botocore.exceptions')
+
+CHUNK_SIZE = 1024 * 1024
+RANGE_SIZE = 64 * CHUNK_SIZE
+MAX_WORKERS = 4
+
+Progress = Callable[[str, int, int], None]
+
+
+class ChecksumCalculator:
+    def __init__(self, s3_client=None, bucket: str = None, max_workers: int = MAX_WORKERS,
+                 chunk_size: int = CHUNK_SIZE, range_size: int = RANGE_SIZE, progress: Progress = None):
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.range_size = range_size
+        self.progress = progress
+
+    def md5_of_object(self, key: str) -> str:
+        with external_call('s3_checksum'):
+            return self.__object_md5(key)[0]
+
+    def md5_of_path(self, path: str) -> str:
+        with external_call('local_checksum'):
+            return self.__path_md5(path)[0]
+
+    def md5_of_objects(self, keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        with external_call('s3_checksum'):
+            return self.__md5_all(keys, self.__object_md5)
+
+    def md5_of_paths(self, paths: Iterable[str]) -> Dict[str, Optional[str]]:
+        with external_call('local_checksum'):
+            return self.__md5_all(paths, self.__path_md5)
+
+    def __object_md5(self, key: str) -> Tuple[str, int]:
+        size = self.s3_client.head_object(Bucket=self.bucket, Key=key)['ContentLength']
+        return self.__md5(key, self.__object_chunks(key, size), size)
+
+    def __path_md5(self, path: str) -> Tuple[str, int]:
+        with open(path, 'rb') as file:
+            file.seek(0, 2)
+            size = file.tell()
+            file.seek(0)
+            return self.__md5(path, iter(lambda: file.read(self.chunk_size), b''), size)
+
+    def __md5_all(self, names: Iterable[str],
+                  md5_function: Callable[[str], Tuple[str, int]]) -> Dict[str, Optional[str]]:
+        names = list(names)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = list(executor.map(lambda name: self.__safe_md5(name, md5_function), names))
+        elapsed = time.perf_counter() - start
+        total_size = sum(size for _, size in results)
+        throughput = total_size / elapsed / 1e9 if elapsed > 0 else 0
+        logging.info(
+            f'Calculated checksums of {len(names)} file(s), {total_size} bytes in {elapsed:.2f}s '
+            f'({throughput:.3f} GB/s)')
+        return {name: checksum for name, (checksum, _) in zip(names, results)}
+
+    @staticmethod
+    def __safe_md5(name: str, md5_function: Callable[[str], Tuple[str, int]]) -> Tuple[Optional[str], int]:
+        try:
+            return md5_function(name)
+        except botocore_exceptions.ClientError as error:
+            error_info = error.response.get('Error', {})
+            logging.warning(f"Could not read {name} from drag-and-drop server: "
+                            f"{error_info.get('Code', 'Unknown')} {error_info.get('Message', 'Unknown')}")
+        except botocore_exceptions.BotoCoreError as error:
+            logging.warning(f'Could not read {name} from drag-and-drop server: {error}')
+        except OSError as error:
+            logging.warning(f'Could not read {name}: {error}')
+        return None, 0
+
+    def __object_chunks(self, key: str, size: int) -> Iterator[bytes]:
+        for range_start in range(0, size, self.range_size):
+            range_end = min(range_start + self.range_size, size) - 1
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=key, Range=f'bytes={range_start}-{range_end}')
+            yield from response['Body'].iter_chunks(self.chunk_size)
+
+    def __md5(self, name: str, chunks: Iterator[bytes], size: int) -> Tuple[str, int]:
+        md5 = hashlib.md5()
+        read = 0
+        start = time.perf_counter()
+        for chunk in chunks:
+            md5.update(chunk)
+            read += len(chunk)
+            if self.progress:
+                self.progress(name, read, size)
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            logging.debug(f'Calculated checksum of {name}: {read} bytes at {read / elapsed / 1e9:.3f} GB/s')
+        return md5.hexdigest(), read
@@ -0,0 +1,58 @@
+import logging
+import threading
+import time
+
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 30
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+RETRY_LATER = 'please retry later'
+NOT_VALIDATED_KEY = 'not_validated'
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD, reset_timeout: float = RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.__opened_at = 0.0
+        self.__probing = False
+        self.__lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.__lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.__opened_at >= self.reset_timeout:
+                logging.info(f'Probing {self.name} after {self.reset_timeout}s')
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self.__probing:
+                self.__probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.__lock:
+            if self.state != CLOSED:
+                logging.info(f'{self.name} recovered, closing circuit')
+            self.state = CLOSED
+            self.failures = 0
+            self.__probing = False
+
+    def record_failure(self):
+        with self.__lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logging.warning(
+                        f'{self.name} failed {self.failures} time(s), opening circuit for {self.reset_timeout}s')
+                self.state = OPEN
+                self.__opened_at = time.monotonic()
+                self.__probing = False
+
+
+def is_retry_later(error_msg: str) -> bool:
+    return RETRY_LATER in error_msg
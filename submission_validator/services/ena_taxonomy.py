@@ -1,15 +1,62 @@
+import json
+import logging
+import random
+import re
+import time
 from http import HTTPStatus
-import requests
+from typing import Iterable, Optional
 
+from submission_validator.services.circuit_breaker import CircuitBreaker, RETRY_LATER, is_retry_later
+from submission_validator.services.lazy_import import lazy_import
+from submission_validator.services.profiling import external_call
+from submission_validator.services.rate_limit import RateController
+from submission_validator.services.serializer import get_serializer
+
+requests = lazy_import('requests')
 
 TAX_ID_KEY = 'tax_id'
 SPECIES_KEY = 'scientific_name'
+REQUEST_TIMEOUT = 10
+LATENCY_BUDGET = 30
+INITIAL_BACKOFF = 0.5
+TRANSIENT_STATUSES = {
+    HTTPStatus.REQUEST_TIMEOUT,
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT
+}
+SHARED_CONTROLLER = RateController()
+TAX_ID_PATTERN = re.compile(r'^[0-9]+$')
+MALFORMED_NAME_PATTERN = re.compile(r'[?#%\x00-\x1f]')
+NOT_NUMERIC_DETAILS = 'Taxon Id must be numeric.'
+KNOWN_TAXA = [
+    {'taxId': '9606', 'scientificName': 'Homo sapiens', 'submittable': 'true'},
+    {'taxId': '10090', 'scientificName': 'Mus musculus', 'submittable': 'true'},
+    {'taxId': '562', 'scientificName': 'Escherichia coli', 'submittable': 'true'},
+    {'taxId': '2697049', 'scientificName': 'Severe acute respiratory syndrome coronavirus 2', 'submittable': 'true'},
+    {'taxId': '2', 'scientificName': 'Bacteria', 'submittable': 'false'},
+    {'taxId': '1234', 'scientificName': 'Nitrospira', 'submittable': 'false'},
+    {'taxId': '9443', 'scientificName': 'Primates', 'submittable': 'false'},
+    {'taxId': '10239', 'scientificName': 'Viruses', 'submittable': 'false'}
+]
 
 
 class EnaTaxonomy:
-    def __init__(self, ena_url='https://www.ebi.ac.uk/ena'):
+    def __init__(self, ena_url='https://www.ebi.ac.uk/ena', cache=None, controller: RateController = None,
+                 latency_budget: float = LATENCY_BUDGET, local_taxonomy: 'LocalTaxonomy' = None,
+                 serializer: str = None, breaker: CircuitBreaker = None, session=None):
         self.tax_id_url = f'{ena_url.rstrip("/")}/taxonomy/rest/tax-id/'
         self.species_url = f'{ena_url.rstrip("/")}/data/taxonomy/v1/taxon/scientific-name/'
+        self.cache = cache
+        self.controller = controller if controller else SHARED_CONTROLLER
+        self.latency_budget = latency_budget
+        self.local_taxonomy = local_taxonomy if local_taxonomy else LocalTaxonomy()
+        self.avoided_calls = 0
+        self.serializer = get_serializer(serializer)
+        self.breaker = breaker if breaker else CircuitBreaker(f'ENA taxonomy {ena_url}')
+        self.session = session
 
     def validate_tax_id(self, tax_id: str):
         return self.__validate(self.tax_id_url, TAX_ID_KEY, tax_id)
@@ -24,6 +71,8 @@ class EnaTaxonomy:
             SPECIES_KEY: species_response,
             TAX_ID_KEY: tax_id_response
         }
+        if EnaTaxonomy.is_unavailable(species_response) or EnaTaxonomy.is_unavailable(tax_id_response):
+            return response
         if 'taxId' not in species_response or 'scientificName' not in tax_id_response or \
                 species_response['taxId'] != tax_id or \
                 tax_id_response['scientificName'] != scientific_name:
@@ -31,27 +80,102 @@ class EnaTaxonomy:
                 f"Information is not consistent between taxId: {tax_id} and scientificName: {scientific_name}"
         return response
 
+    def __validate(self, url, data_type, value):
+        local_response = self.local_taxonomy.validate(data_type, value)
+        if local_response is not None:
+            self.avoided_calls += 1
+            return local_response
+        value_url = f'{url.rstrip("/")}/{value}'
+        if self.cache is not None:
+            cached_response = self.cache.get(value_url)
+            if cached_response is not None:
+                return cached_response
+        get_response = self.__get(value_url)
+        if get_response is None or EnaTaxonomy.is_transient(get_response):
+            return EnaTaxonomy.format_unavailable_error(data_type, value)
+        taxonomy_response = self.__taxonomy_response(get_response, data_type, value)
+        if taxonomy_response is None:
+            self.breaker.record_failure()
+            return EnaTaxonomy.format_unavailable_error(data_type, value)
+        if self.cache is not None and EnaTaxonomy.is_cacheable(get_response):
+            self.cache.set(value_url, taxonomy_response)
+        return taxonomy_response
+
+    def __get(self, url):
+        http = self.session if self.session is not None else requests
+        deadline = time.monotonic() + self.latency_budget
+        backoff = INITIAL_BACKOFF
+        while True:
+            if not self.breaker.allow():
+                return None
+            response = None
+            with self.controller.slot():
+                try:
+                    with external_call('ena_taxonomy'):
+                        response = http.get(url, timeout=REQUEST_TIMEOUT)
+                except requests.RequestException:
+                    pass
+                finally:
+                    if response is None:
+                        self.breaker.record_failure()
+            if response is not None and not EnaTaxonomy.is_transient(response):
+                self.controller.on_success()
+                self.breaker.record_success()
+                return response
+            self.controller.on_overload()
+            if response is not None:
+                self.breaker.record_failure()
+            wait = EnaTaxonomy.__retry_after(response, backoff)
+            if time.monotonic() + wait > deadline:
+                return response
+            time.sleep(wait)
+            backoff = backoff * 2
+
     @staticmethod
-    def __validate(url, data_type, value):
-        get_response = requests.get(f'{url.rstrip("/")}/{value}')
-        json_response = EnaTaxonomy.ena_json_response(get_response, data_type, value)
+    def __retry_after(response, backoff: float) -> float:
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if isinstance(retry_after, str) and retry_after.isdigit():
+                return float(retry_after)
+        return backoff * random.uniform(0.5, 1.5)
+
+    def __taxonomy_response(self, get_response, data_type, value) -> Optional[dict]:
+        try:
+            json_response = EnaTaxonomy.ena_json_response(get_response, data_type, value, self.serializer)
+        except ValueError as error:
+            logging.warning(f'ENA taxonomy returned a malformed response for {data_type} {value}: {error}')
+            return None
 
         if isinstance(json_response, dict) and 'error' in json_response:
             return json_response
 
         if isinstance(json_response, list):
             json_response = json_response[0]
+        return EnaTaxonomy.submittable_response(json_response, data_type, value)
+
+    @staticmethod
+    def submittable_response(json_response: dict, data_type, value) -> dict:
         if 'submittable' in json_response and json_response['submittable'] == "false":
             return EnaTaxonomy.format_error(data_type, value, 'It is not submittable.')
         return json_response
 
     @staticmethod
-    def ena_json_response(response, data_type, value) -> dict:
+    def is_transient(response) -> bool:
+        return response.status_code in TRANSIENT_STATUSES
+
+    @staticmethod
+    def is_cacheable(response) -> bool:
+        return response.status_code < HTTPStatus.INTERNAL_SERVER_ERROR and not EnaTaxonomy.is_transient(response)
+
+    @staticmethod
+    def ena_json_response(response, data_type, value, serializer=None) -> dict:
         if not response.status_code == HTTPStatus(200):
             return EnaTaxonomy.format_error(data_type, value, response.text.strip())
         if response.text == 'No results.':
             return EnaTaxonomy.format_error(data_type, value)
-        return response.json()
+        if serializer is None:
+            serializer = get_serializer()
+        return serializer.loads(response.content)
 
     @staticmethod
     def format_error(data_type: str, value: str, details: str = None) -> dict:
@@ -59,3 +183,42 @@ class EnaTaxonomy:
         if details:
             error_msg = f'{error_msg} {details}'
         return {'error': error_msg}
+
+    @staticmethod
+    def is_unavailable(taxonomy_response: dict) -> bool:
+        return 'error' in taxonomy_response and is_retry_later(taxonomy_response['error'])
+
+    @staticmethod
+    def format_unavailable_error(data_type: str, value: str) -> dict:
+        return {
+            'error': f'Could not validate {data_type}: {value}. ENA taxonomy service is unavailable, {RETRY_LATER}.'
+        }
+
+
+class LocalTaxonomy:
+    def __init__(self, taxa: Iterable[dict] = None, check_format: bool = True):
+        self.check_format = check_format
+        self.by_tax_id = {}
+        self.by_scientific_name = {}
+        for taxon in KNOWN_TAXA if taxa is None else taxa:
+            self.by_tax_id[taxon['taxId']] = taxon
+            self.by_scientific_name[taxon['scientificName']] = taxon
+
+    @staticmethod
+    def from_snapshot(snapshot_path: str) -> 'LocalTaxonomy':
+        with open(snapshot_path, encoding='utf-8') as snapshot_file:
+            return LocalTaxonomy(json.load(snapshot_file))
+
+    def validate(self, data_type: str, value) -> Optional[dict]:
+        value = str(value)
+        if data_type == TAX_ID_KEY:
+            if self.check_format and not TAX_ID_PATTERN.match(value):
+                return EnaTaxonomy.format_error(data_type, value, NOT_NUMERIC_DETAILS)
+            taxon = self.by_tax_id.get(value)
+        else:
+            if self.check_format and (not value.strip() or MALFORMED_NAME_PATTERN.search(value)):
+                return EnaTaxonomy.format_error(data_type, value)
+            taxon = self.by_scientific_name.get(value)
+        if taxon is None:
+            return None
+        return EnaTaxonomy.submittable_response(dict(taxon), data_type, value)
@@ -0,0 +1,13 @@
+import importlib
+import sys
+from types import ModuleType
+
+
+class LazyModule(ModuleType):
+    def __getattr__(self, attribute: str):
+        module = importlib.import_module(self.__name__)
+        return getattr(module, attribute)
+
+
+def lazy_import(name: str) -> ModuleType:
+    return sys.modules.get(name) or LazyModule(name)
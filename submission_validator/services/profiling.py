@@ -0,0 +1,158 @@
+import cProfile
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.validation.entities import entity_types_of, is_independent, prepare_data, validate_entities
+
+TOP_N = 10
+
+_active = threading.local()
+
+
+class EntityProfile:
+    __slots__ = ('validator', 'entity_type', 'index', 'wall_time', 'cpu_time', 'spans')
+
+    def __init__(self, validator: str, entity_type: str, index: str):
+        self.validator = validator
+        self.entity_type = entity_type
+        self.index = index
+        self.wall_time = 0.0
+        self.cpu_time = 0.0
+        self.spans: Dict[str, List[float]] = {}
+
+    def add_span(self, name: str, elapsed: float):
+        span = self.spans.setdefault(name, [0, 0.0])
+        span[0] += 1
+        span[1] += elapsed
+
+    def __repr__(self):
+        spans = ', '.join(f'{name} {count}x {total * 1000:.1f}ms' for name, (count, total) in self.spans.items())
+        return f'{self.validator} {self.entity_type}:{self.index} wall {self.wall_time * 1000:.1f}ms ' \
+               f'cpu {self.cpu_time * 1000:.1f}ms [{spans}]'
+
+
+@contextmanager
+def external_call(name: str):
+    profile: Optional[EntityProfile] = getattr(_active, 'profile', None)
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_span(name, time.perf_counter() - start)
+
+
+class ValidationProfiler:
+    def __init__(self, top_n: int = TOP_N, sample_rate: float = 1.0, cprofile: bool = False, seed: int = None):
+        self.top_n = top_n
+        self.sample_rate = sample_rate
+        self.profiled_entities = 0
+        self.stacks: Dict[str, float] = {}
+        self.__slowest: List[tuple] = []
+        self.__sequence = itertools.count()
+        self.__random = random.Random(seed)
+        self.__profile = cProfile.Profile() if cprofile else None
+        self.__lock = threading.Lock()
+
+    def wrap(self, validator: BaseValidator) -> 'ProfilingValidator':
+        return ProfilingValidator(validator, self)
+
+    @contextmanager
+    def entity(self, validator_name: str, entity: Entity):
+        if getattr(_active, 'profile', None) is not None or self.__random.random() >= self.sample_rate:
+            yield
+            return
+        profile = EntityProfile(validator_name, entity.identifier.entity_type, entity.identifier.index)
+        _active.profile = profile
+        profiling = self.__profile is not None and threading.current_thread() is threading.main_thread()
+        if profiling:
+            self.__profile.enable()
+        start_wall, start_cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            profile.wall_time = time.perf_counter() - start_wall
+            profile.cpu_time = time.thread_time() - start_cpu
+            if profiling:
+                self.__profile.disable()
+            _active.profile = None
+            self.__record(profile)
+
+    def slowest(self) -> List[EntityProfile]:
+        return [profile for _, _, profile in sorted(self.__slowest, key=lambda item: item[0], reverse=True)]
+
+    def log_summary(self):
+        logging.info(f'Profiled {self.profiled_entities} entities, {len(self.__slowest)} slowest:')
+        for profile in self.slowest():
+            logging.info(f'  {profile}')
+
+    def dump_collapsed(self, path: str):
+        with open(path, 'w', encoding='utf-8') as stacks_file:
+            for stack, elapsed in sorted(self.stacks.items()):
+                stacks_file.write(f'{stack} {int(elapsed * 1e6)}\n')
+
+    def dump_stats(self, path: str):
+        if self.__profile is None:
+            raise ValueError('cProfile was not enabled for this profiler')
+        self.__profile.dump_stats(path)
+
+    def __record(self, profile: EntityProfile):
+        base = f'{profile.validator};{profile.entity_type}'
+        with self.__lock:
+            self.profiled_entities += 1
+            span_time = 0.0
+            for name, (_, elapsed) in profile.spans.items():
+                self.stacks[f'{base};{name}'] = self.stacks.get(f'{base};{name}', 0.0) + elapsed
+                span_time += elapsed
+            self.stacks[base] = self.stacks.get(base, 0.0) + max(0.0, profile.wall_time - span_time)
+            item = (profile.wall_time, next(self.__sequence), profile)
+            if len(self.__slowest) < self.top_n:
+                heapq.heappush(self.__slowest, item)
+            elif item[0] > self.__slowest[0][0]:
+                heapq.heapreplace(self.__slowest, item)
+
+
+class ProfilingValidator(BaseValidator):
+    def __init__(self, validator: BaseValidator, profiler: ValidationProfiler):
+        self.validator = validator
+        self.profiler = profiler
+        self.name = type(validator).__name__
+
+    def __getattr__(self, name: str):
+        if name == 'validator':
+            raise AttributeError(name)
+        return getattr(self.validator, name)
+
+    def validate_data(self, data: Submission, *args, **kwargs):
+        if args or kwargs:
+            self.validator.validate_data(data, *args, **kwargs)
+        elif is_independent(self.validator):
+            context = prepare_data(self.validator, data)
+            for entity_type in entity_types_of(self.validator, data):
+                self.validate_entities(data.get_entities(entity_type), context)
+        elif type(self.validator).validate_data is BaseValidator.validate_data:
+            BaseValidator.validate_data(self, data)
+        else:
+            # Validators without per-entity entry points are timed as a whole by their caller
+            self.validator.validate_data(data)
+
+    def validate_entities(self, entities: Iterable[Entity], context: Any = None):
+        for entity in entities:
+            with self.profiler.entity(self.name, entity):
+                validate_entities(self.validator, [entity], context)
+
+    def validate_entity(self, entity: Entity, *args):
+        with self.profiler.entity(self.name, entity):
+            self.validator.validate_entity(entity, *args)
@@ -0,0 +1,81 @@
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_RATE = 50
+DEFAULT_BURST = 10
+DEFAULT_CONCURRENCY = 4
+MIN_CONCURRENCY = 1
+MAX_CONCURRENCY = 32
+DECREASE_FACTOR = 0.5
+
+
+class TokenBucket:
+    def __init__(self, rate: float = DEFAULT_RATE, capacity: float = DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.__tokens = capacity
+        self.__updated = time.monotonic()
+        self.__lock = threading.Lock()
+
+    def acquire(self):
+        with self.__lock:
+            now = time.monotonic()
+            self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated) * self.rate)
+            self.__updated = now
+            self.__tokens -= 1
+            wait = -self.__tokens / self.rate if self.__tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AdaptiveConcurrency:
+    def __init__(self, initial_limit: float = DEFAULT_CONCURRENCY, min_limit: float = MIN_CONCURRENCY,
+                 max_limit: float = MAX_CONCURRENCY, decrease_factor: float = DECREASE_FACTOR):
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.in_flight = 0
+        self.__condition = threading.Condition()
+
+    def acquire(self):
+        with self.__condition:
+            while self.in_flight >= int(self.limit):
+                self.__condition.wait()
+            self.in_flight += 1
+
+    def release(self):
+        with self.__condition:
+            self.in_flight -= 1
+            self.__condition.notify()
+
+    def on_success(self):
+        with self.__condition:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.__condition.notify_all()
+
+    def on_overload(self):
+        with self.__condition:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+
+
+class RateController:
+    def __init__(self, bucket: TokenBucket = None, concurrency: AdaptiveConcurrency = None):
+        self.bucket = bucket if bucket else TokenBucket()
+        self.concurrency = concurrency if concurrency else AdaptiveConcurrency()
+
+    @contextmanager
+    def slot(self):
+        self.concurrency.acquire()
+        try:
+            self.bucket.acquire()
+            yield
+        finally:
+            self.concurrency.release()
+
+    def on_success(self):
+        self.concurrency.on_success()
+
+    def on_overload(self):
+        self.concurrency.on_overload()
@@ -0,0 +1,112 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+DEFAULT_TTL = 24 * 60 * 60
+MAX_ENTRIES = 128
+RESULT_SUFFIX = '.json'
+
+
+class MemoryResultStore:
+    def __init__(self, max_entries: int = MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.__entries: OrderedDict = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.time():
+                del self.__entries[key]
+                return None
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: dict):
+        with self.__lock:
+            self.__entries[key] = (time.time() + self.ttl, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.max_entries:
+                self.__entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class DiskResultStore:
+    def __init__(self, directory: str, max_entries: int = MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self.__path(key)
+        try:
+            with open(path, encoding='utf-8') as result_file:
+                entry = json.load(result_file)
+        except (OSError, ValueError):
+            return None
+        if entry['expires_at'] <= time.time():
+            self.__remove(path)
+            return None
+        try:
+            self.__touch(path)
+        except FileNotFoundError:
+            return None
+        return entry['value']
+
+    def set(self, key: str, value: dict):
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(file_descriptor, 'w', encoding='utf-8') as result_file:
+            json.dump({'expires_at': time.time() + self.ttl, 'value': value}, result_file)
+        path = self.__path(key)
+        os.replace(temporary_path, path)
+        self.__touch(path)
+        self.__evict()
+
+    def __len__(self):
+        return len(self.__result_paths())
+
+    def __evict(self):
+        paths = self.__result_paths()
+        if len(paths) <= self.max_entries:
+            return
+        paths.sort(key=self.__last_used)
+        for path in paths[:len(paths) - self.max_entries]:
+            self.__remove(path)
+
+    def __result_paths(self):
+        return [
+            os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(RESULT_SUFFIX)
+        ]
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}{RESULT_SUFFIX}')
+
+    @staticmethod
+    def __touch(path: str):
+        now = time.time_ns()
+        os.utime(path, ns=(now, now))
+
+    @staticmethod
+    def __last_used(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return 0
+
+    @staticmethod
+    def __remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,45 @@
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class StdlibSerializer:
+    name = 'json'
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer:
+    name = 'orjson'
+
+    @staticmethod
+    def dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+    @staticmethod
+    def loads(data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+SERIALIZERS = {
+    StdlibSerializer.name: StdlibSerializer,
+    OrjsonSerializer.name: OrjsonSerializer
+}
+
+
+def get_serializer(name: str = None):
+    if name is None:
+        name = OrjsonSerializer.name if orjson is not None else StdlibSerializer.name
+    if name == OrjsonSerializer.name and orjson is None:
+        raise ImportError('orjson is not installed, install submission-validator[orjson] to use it')
+    return SERIALIZERS[name]
@@ -0,0 +1,77 @@
+import json
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Optional
+
+DEFAULT_TTL = 7 * 24 * 60 * 60
+BUSY_TIMEOUT = 30
+
+
+class ThreadConnection:
+    __slots__ = ('connection', 'generation', 'close', '__weakref__')
+
+    def __init__(self, connection: sqlite3.Connection, generation: int):
+        self.connection = connection
+        self.generation = generation
+        # Closes the connection once its thread has exited and dropped its thread-local reference
+        self.close = weakref.finalize(self, connection.close)
+
+
+class SqliteTaxonomyCache:
+    def __init__(self, path: str, ttl: float = DEFAULT_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.__local = threading.local()
+        self.__connections = weakref.WeakSet()
+        self.__generation = 0
+        self.__lock = threading.Lock()
+        self.__create_table()
+
+    def get(self, key: str) -> Optional[dict]:
+        row = self.__connection().execute(
+            'SELECT value FROM taxonomy WHERE key = ? AND expires_at > ?', (key, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict):
+        with self.__connection() as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO taxonomy (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), time.time() + self.ttl)
+            )
+
+    def purge_expired(self):
+        with self.__connection() as connection:
+            connection.execute('DELETE FROM taxonomy WHERE expires_at <= ?', (time.time(),))
+
+    def close(self):
+        with self.__lock:
+            connections = list(self.__connections)
+            self.__connections = weakref.WeakSet()
+            self.__generation += 1
+        for connection in connections:
+            connection.close()
+
+    def __create_table(self):
+        with self.__connection() as connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS taxonomy '
+                '(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def __connection(self) -> sqlite3.Connection:
+        thread_connection = getattr(self.__local, 'connection', None)
+        if thread_connection is None or thread_connection.generation != self.__generation:
+            # Connections stay private to their thread; close() and the finalizer are the only calls from elsewhere
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with self.__lock:
+                thread_connection = ThreadConnection(connection, self.__generation)
+                self.__connections.add(thread_connection)
+            self.__local.connection = thread_connection
+        return thread_connection.connection
@@ -0,0 +1,139 @@
+import logging
+from typing import Any, Dict, List, Sequence, Tuple
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.validation.json import JsonValidator, CASE_SENSITIVE_TYPES
+from submission_validator.validation.rules import CompiledSchema, ascii_lower, required_error
+from submission_validator.validation.upload import UploadValidator
+
+MISSING = object()
+
+RowErrors = Dict[int, Dict[str, List[str]]]
+
+
+class ColumnarValidator(BaseValidator):
+    def __init__(self, json_validator: JsonValidator, file_checksum_map: Dict[str, str] = None):
+        self.json_validator = json_validator
+        self.file_checksum_map = file_checksum_map
+        self.__compiled_schemas: Dict[str, Tuple[dict, CompiledSchema]] = {}
+
+    def validate_data(self, data: Submission):
+        for entity_type in data.get_entity_types():
+            entities = list(data.get_entities(entity_type))
+            logging.info(f'Validating {len(entities)} {entity_type}(s) by column')
+            self.validate_entities(entity_type, entities)
+
+    def validate_entity(self, entity: Entity):
+        self.validate_entities(entity.identifier.entity_type, [entity])
+
+    def cache_config(self) -> dict:
+        return dict(self.json_validator.cache_config(), checksums=self.file_checksum_map)
+
+    def validate_entities(self, entity_type: str, entities: Sequence[Entity]):
+        errors: RowErrors = {}
+        if entity_type in self.json_validator.schema_by_type:
+            compiled_schema = self.__compiled_schema(entity_type)
+            columns = self.load_columns(entities, entity_type not in CASE_SENSITIVE_TYPES)
+            self.__check_schema(compiled_schema, columns, len(entities), errors)
+            # Rows the compiled rules cannot fully check are validated one by one by the JSON validator
+            for row in self.uncovered_rows(compiled_schema, columns, len(entities)):
+                errors.pop(row, None)
+                self.json_validator.validate_entity(entities[row])
+        if self.file_checksum_map is not None and entity_type in UploadValidator.entity_types:
+            self.__check_files(entities, errors)
+        for row, attribute_errors in errors.items():
+            for attribute, messages in attribute_errors.items():
+                entities[row].add_errors(attribute, messages)
+
+    @staticmethod
+    def uncovered_rows(compiled_schema: CompiledSchema, columns: Dict[str, List[Any]], row_count: int) -> List[int]:
+        if not compiled_schema.covers_all:
+            return list(range(row_count))
+        rows = set()
+        for attribute in compiled_schema.uncovered_properties.intersection(columns):
+            rows.update(row for row, value in enumerate(columns[attribute]) if value is not MISSING)
+        return sorted(rows)
+
+    @staticmethod
+    def load_columns(entities: Sequence[Entity], lowercase: bool) -> Dict[str, List[Any]]:
+        columns: Dict[str, List[Any]] = {}
+        for row, entity in enumerate(entities):
+            for attribute, value in entity.attributes.items():
+                if lowercase:
+                    attribute, value = ascii_lower(attribute), ascii_lower(value)
+                column = columns.get(attribute)
+                if column is None:
+                    column = columns[attribute] = [MISSING] * len(entities)
+                column[row] = value
+        return columns
+
+    @staticmethod
+    def __check_schema(compiled_schema: CompiledSchema, columns: Dict[str, List[Any]], row_count: int,
+                       errors: RowErrors):
+        for attribute in compiled_schema.required:
+            column = columns.get(attribute)
+            missing_rows = range(row_count) if column is None else [
+                row for row, value in enumerate(column) if value is MISSING
+            ]
+            add_errors(errors, missing_rows, attribute, [required_error(attribute)])
+        for attribute, checks in compiled_schema.checks.items():
+            column = columns.get(attribute)
+            if column is None:
+                continue
+            for value, rows in distinct_values(column):
+                messages = [message for message in (check(value) for check in checks) if message]
+                if messages:
+                    add_errors(errors, rows, attribute, messages)
+
+    def __compiled_schema(self, entity_type: str) -> CompiledSchema:
+        schema = self.json_validator.schema_by_type[entity_type]
+        cached_schema, compiled_schema = self.__compiled_schemas.get(entity_type, (None, None))
+        if cached_schema is not schema:
+            compiled_schema = CompiledSchema(entity_type, schema)
+            self.__compiled_schemas[entity_type] = (schema, compiled_schema)
+        return compiled_schema
+
+    def __check_files(self, entities: Sequence[Entity], errors: RowErrors):
+        rows = range(len(entities))
+        file_number = 1
+        while rows:
+            file_attribute = f'uploaded_file_{file_number}'
+            check_attribute = file_attribute + '_checksum'
+            rows = [row for row in rows if file_attribute in entities[row].attributes]
+            files: Dict[tuple, List[int]] = {}
+            for row in rows:
+                attributes = entities[row].attributes
+                files.setdefault((attributes[file_attribute], attributes.get(check_attribute, MISSING)), []).append(row)
+            for (file_name, stated_checksum), file_rows in files.items():
+                if file_name not in self.file_checksum_map:
+                    add_errors(errors, file_rows, file_attribute, [UploadValidator.missing_file_error(file_name)])
+                    continue
+                upload_checksum = self.file_checksum_map[file_name]
+                if stated_checksum is MISSING:
+                    for row in file_rows:
+                        entities[row].attributes[check_attribute] = upload_checksum
+                elif stated_checksum != upload_checksum:
+                    error = UploadValidator.checksum_mismatch_error(upload_checksum, stated_checksum)
+                    add_errors(errors, file_rows, check_attribute, [error])
+            file_number = file_number + 1
+
+
+def distinct_values(column: List[Any]) -> List[Tuple[Any, List[int]]]:
+    distinct: Dict[Any, List[int]] = {}
+    unhashable: List[Tuple[Any, List[int]]] = []
+    for row, value in enumerate(column):
+        if value is MISSING:
+            continue
+        try:
+            distinct.setdefault((type(value), value), []).append(row)
+        except TypeError:
+            unhashable.append((value, [row]))
+    return [(value, rows) for (_, value), rows in distinct.items()] + unhashable
+
+
+def add_errors(errors: RowErrors, rows, attribute: str, messages: List[str]):
+    for row in rows:
+        errors.setdefault(row, {}).setdefault(attribute, []).extend(messages)
@@ -1,15 +1,23 @@
 import logging
 import time
 
-import docker
+from submission_validator.services.lazy_import import lazy_import
 from .json import JsonValidator
 
+docker = lazy_import('docker')
+
 
 class JsonValidatorDocker(JsonValidator):
-    def __init__(self, image_name, validator_url, port=3020):
+    def __init__(self, image_name, validator_url, port=3020, **kwargs):
         self.__client = docker.from_env()
         self.container = self.__launch(self.__client, image_name, port)
-        super().__init__(validator_url)
+        super().__init__(validator_url, **kwargs)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
 
     def close(self):
         self.container.reload()
@@ -0,0 +1,30 @@
+from typing import Any, List, Sequence
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+
+def is_independent(validator: BaseValidator) -> bool:
+    return getattr(validator, 'independent_entities', False)
+
+
+def entity_types_of(validator: BaseValidator, data: Submission) -> List[str]:
+    entity_types = getattr(validator, 'entity_types', None)
+    if entity_types is None:
+        return list(data.get_entity_types())
+    return [entity_type for entity_type in entity_types if entity_type in data.get_entity_types()]
+
+
+def prepare_data(validator: BaseValidator, data: Submission) -> Any:
+    prepare = getattr(validator, 'prepare_data', None)
+    return prepare(data) if prepare else None
+
+
+def validate_entities(validator: BaseValidator, entities: Sequence[Entity], context: Any = None):
+    validate = getattr(validator, 'validate_entities', None)
+    if validate is not None:
+        validate(entities, context)
+        return
+    for entity in entities:
+        validator.validate_entity(entity)
@@ -0,0 +1,70 @@
+from array import array
+from typing import Dict, List, Tuple, Union
+
+from submission_broker.submission.entity import Entity
+
+MessageKey = Union[str, Tuple[str, tuple]]
+
+
+class ErrorCollector:
+    __slots__ = ('__entities', '__entity_ids', '__attributes', '__attribute_ids', '__messages', '__message_ids',
+                 '__entity_column', '__attribute_column', '__message_column')
+
+    def __init__(self):
+        self.__entities: List[Entity] = []
+        self.__entity_ids: Dict[int, int] = {}
+        self.__attributes: List[str] = []
+        self.__attribute_ids: Dict[str, int] = {}
+        self.__messages: List[str] = []
+        self.__message_ids: Dict[MessageKey, int] = {}
+        self.__entity_column = array('L')
+        self.__attribute_column = array('L')
+        self.__message_column = array('L')
+
+    def add(self, entity: Entity, attribute: str, template: str, *parameters):
+        self.__entity_column.append(self.__entity_id(entity))
+        self.__attribute_column.append(self.__attribute_id(attribute))
+        self.__message_column.append(self.__message_id(template, parameters))
+
+    def __len__(self):
+        return len(self.__message_column)
+
+    @property
+    def message_count(self) -> int:
+        return len(self.__messages)
+
+    def flush(self):
+        entities, attributes, messages = self.__entities, self.__attributes, self.__messages
+        for entity_id, attribute_id, message_id in zip(
+                self.__entity_column, self.__attribute_column, self.__message_column):
+            entities[entity_id].add_error(attributes[attribute_id], messages[message_id])
+        self.__clear()
+
+    def __clear(self):
+        self.__entities.clear()
+        self.__entity_ids.clear()
+        del self.__entity_column[:]
+        del self.__attribute_column[:]
+        del self.__message_column[:]
+
+    def __entity_id(self, entity: Entity) -> int:
+        entity_id = self.__entity_ids.get(id(entity))
+        if entity_id is None:
+            entity_id = self.__entity_ids[id(entity)] = len(self.__entities)
+            self.__entities.append(entity)
+        return entity_id
+
+    def __attribute_id(self, attribute: str) -> int:
+        attribute_id = self.__attribute_ids.get(attribute)
+        if attribute_id is None:
+            attribute_id = self.__attribute_ids[attribute] = len(self.__attributes)
+            self.__attributes.append(attribute)
+        return attribute_id
+
+    def __message_id(self, template: str, parameters: tuple) -> int:
+        key = (template, parameters) if parameters else template
+        message_id = self.__message_ids.get(key)
+        if message_id is None:
+            message_id = self.__message_ids[key] = len(self.__messages)
+            self.__messages.append(template.format(*parameters) if parameters else template)
+        return message_id
@@ -1,37 +1,116 @@
 import json
+import logging
 from fnmatch import fnmatch
 from os import listdir
 from os.path import dirname, join, splitext
-from typing import Dict
-
-import requests
+from typing import Dict, Optional, Tuple
 
 from submission_broker.submission.entity import Entity
 from submission_broker.validation.base import BaseValidator
 
+from submission_validator.services.circuit_breaker import CircuitBreaker, NOT_VALIDATED_KEY, RETRY_LATER
+from submission_validator.services.lazy_import import lazy_import
+from submission_validator.services.profiling import external_call
+from submission_validator.services.serializer import get_serializer
+from submission_validator.validation.rules import CompiledSchema, ascii_lower, not_valid_error
+
+requests = lazy_import('requests')
+
+JSON_HEADERS = {'Content-Type': 'application/json'}
+REQUEST_TIMEOUT = 10
+CASE_SENSITIVE_TYPES = ['run_experiment']
+
 
 class JsonValidator(BaseValidator):
-    def __init__(self, validator_url: str):
+    independent_entities = True
+
+    def __init__(self, validator_url: str, serializer: str = None, local_validation: bool = True,
+                 breaker: CircuitBreaker = None, session=None):
         self.validator_url = validator_url
-        self.schema_by_type = self.__load_schema_files()
+        self.session = session
+        self.breaker = breaker if breaker else CircuitBreaker(f'JSON validator {validator_url}')
+        self.serializer = get_serializer(serializer)
+        self.local_validation = local_validation
+        self.schema_by_type = self.load_schema_files()
+        self.__encoded_schemas: Dict[str, Tuple[dict, bytes]] = {}
+        self.__compiled_schemas: Dict[str, Tuple[dict, CompiledSchema]] = {}
+        for entity_type in self.schema_by_type:
+            self.__compiled_schema(entity_type)
 
     def validate_entity(self, entity: Entity):
-        if entity.identifier.entity_type not in self.schema_by_type:
+        entity_type = entity.identifier.entity_type
+        if entity_type not in self.schema_by_type:
+            return
+        if self.local_validation and self.__validate_locally(entity):
+            return
+        encoded_schema = self.__encoded_schema(entity_type)
+        encoded_entity = self.serializer.dumps(entity.attributes)
+        if entity_type not in CASE_SENSITIVE_TYPES:
+            encoded_entity = encoded_entity.lower()
+        schema_errors = self.__validate(encoded_schema, encoded_entity)
+        if schema_errors is None:
+            entity.add_error(NOT_VALIDATED_KEY, self.format_not_validated_error(entity_type))
             return
-        schema = self.schema_by_type[entity.identifier.entity_type]
-        entity_string = json.dumps(entity.attributes)
-        if entity.identifier.entity_type != 'run_experiment':
-            entity_string = entity_string.lower()
-        schema_errors = self.__validate(schema, json.loads(entity_string))
         self.__add_errors_to_entity(entity, schema_errors)
 
-    def __validate(self, schema: dict, entity_attributes: dict):
-        schema.pop('id', None)
-        payload = self.__create_validator_payload(schema, entity_attributes)
-        return requests.post(self.validator_url, json=payload).json()
+    def cache_config(self) -> dict:
+        return {
+            'validator_url': self.validator_url,
+            'local_validation': self.local_validation,
+            'schemas': self.schema_by_type
+        }
+
+    def __validate(self, encoded_schema: bytes, encoded_entity: bytes) -> Optional[list]:
+        if not self.breaker.allow():
+            return None
+        payload = self.__create_validator_payload(encoded_schema, encoded_entity)
+        http = self.session if self.session is not None else requests
+        schema_errors = None
+        try:
+            with external_call('validator_service'):
+                response = http.post(self.validator_url, data=payload, headers=JSON_HEADERS, timeout=REQUEST_TIMEOUT)
+            if not response.ok:
+                raise ValueError(f'HTTP status {response.status_code}')
+            schema_errors = self.serializer.loads(response.content)
+        except (requests.RequestException, ValueError) as error:
+            logging.warning(f'Schema validation service {self.validator_url} failed: {error}')
+        finally:
+            if schema_errors is None:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+        return schema_errors
+
+    def __validate_locally(self, entity: Entity) -> bool:
+        entity_type = entity.identifier.entity_type
+        compiled_schema = self.__compiled_schema(entity_type)
+        attributes = entity.attributes
+        if entity_type not in CASE_SENSITIVE_TYPES:
+            attributes = ascii_lower(attributes)
+        if not compiled_schema.covers(attributes):
+            return False
+        for attribute_name, errors in compiled_schema.validate(attributes).items():
+            entity.add_errors(attribute_name, errors)
+        return True
+
+    def __compiled_schema(self, entity_type: str) -> CompiledSchema:
+        schema = self.schema_by_type[entity_type]
+        cached_schema, compiled_schema = self.__compiled_schemas.get(entity_type, (None, None))
+        if cached_schema is not schema:
+            compiled_schema = CompiledSchema(entity_type, schema)
+            self.__compiled_schemas[entity_type] = (schema, compiled_schema)
+        return compiled_schema
+
+    def __encoded_schema(self, entity_type: str) -> bytes:
+        schema = self.schema_by_type[entity_type]
+        cached_schema, encoded_schema = self.__encoded_schemas.get(entity_type, (None, None))
+        if cached_schema is not schema:
+            encoded_schema = self.serializer.dumps({name: value for name, value in schema.items() if name != 'id'})
+            self.__encoded_schemas[entity_type] = (schema, encoded_schema)
+        return encoded_schema
 
     @staticmethod
-    def __load_schema_files() -> Dict[str, dict]:
+    def load_schema_files() -> Dict[str, dict]:
         schema_by_type = {}
         schema_dir = join(dirname(__file__), 'schema')
         for file in listdir(schema_dir):
@@ -43,11 +122,8 @@ class JsonValidator(BaseValidator):
         return schema_by_type
 
     @staticmethod
-    def __create_validator_payload(schema: dict, entity_attributes: dict):
-        return {
-            "schema": schema,
-            "object": entity_attributes
-        }
+    def __create_validator_payload(encoded_schema: bytes, encoded_entity: bytes) -> bytes:
+        return b''.join((b'{"schema":', encoded_schema, b',"object":', encoded_entity, b'}'))
 
     @staticmethod
     def __add_errors_to_entity(entity: Entity, schema_errors: dict):
@@ -57,11 +133,16 @@ class JsonValidator(BaseValidator):
             for error in schema_error['errors']:
                 error.replace('"', '\'')
                 if error == 'should NOT be valid':
-                    error = JsonValidator.__improve_not_be_valid_message(entity.identifier.entity_type, attribute_name)
+                    error = JsonValidator.improve_not_be_valid_message(entity.identifier.entity_type, attribute_name)
                 if error != 'should match some schema in anyOf':
                     stripped_errors.append(error)
             entity.add_errors(attribute_name, stripped_errors)
 
     @staticmethod
-    def __improve_not_be_valid_message(entity_type, attribute_name):
-        return f'{entity_type} should have required property: \'{attribute_name}\''
+    def format_not_validated_error(entity_type: str) -> str:
+        return f'Could not validate {entity_type} against its schema. ' \
+               f'The schema validation service is unavailable, {RETRY_LATER}.'
+
+    @staticmethod
+    def improve_not_be_valid_message(entity_type, attribute_name):
+        return not_valid_error(entity_type, attribute_name)
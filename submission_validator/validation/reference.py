@@ -0,0 +1,115 @@
+import logging
+import re
+from typing import Dict, Iterable, List, Set
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+REFERENCE_ATTRIBUTES = {
+    'isolate_genome_assembly_information': {'run_ref': 'run_experiment'},
+    'run_experiment': {'sample_ref': 'sample', 'study_ref': 'study'}
+}
+IDENTIFIER_ATTRIBUTES = {
+    'study': ['accession', 'study_accession', 'study_alias'],
+    'sample': ['accession', 'sample_accession', 'sample_alias'],
+    'run_experiment': ['accession', 'experiment_name', 'run_accession', 'experiment_accession']
+}
+ACCESSION_PATTERNS = {
+    'study': r'(PRJ[EDN][A-Z]\d+|[EDS]RP\d{6,})',
+    'sample': r'(SAM[EDN][A-Z]?\d+|[EDS]RS\d{6,})',
+    'run_experiment': r'[EDS]R[RX]\d{6,}'
+}
+LINKED_TYPES = {
+    'run_experiment': ['sample', 'study']
+}
+
+
+class ReferenceValidator(BaseValidator):
+    independent_entities = True
+
+    def __init__(self, reference_attributes: Dict[str, Dict[str, str]] = None,
+                 identifier_attributes: Dict[str, List[str]] = None,
+                 linked_types: Dict[str, List[str]] = None,
+                 accession_patterns: Dict[str, str] = None):
+        self.reference_attributes = REFERENCE_ATTRIBUTES if reference_attributes is None else reference_attributes
+        self.identifier_attributes = IDENTIFIER_ATTRIBUTES if identifier_attributes is None else identifier_attributes
+        self.linked_types = LINKED_TYPES if linked_types is None else linked_types
+        self.accession_patterns = ACCESSION_PATTERNS if accession_patterns is None else accession_patterns
+        self.__accession_regexes = {
+            entity_type: re.compile(pattern) for entity_type, pattern in self.accession_patterns.items()
+        }
+
+    @property
+    def entity_types(self) -> List[str]:
+        return list(dict.fromkeys(list(self.reference_attributes) + list(self.linked_types)))
+
+    def prepare_data(self, data: Submission) -> Dict[str, Set[str]]:
+        return self.index_identifiers(data)
+
+    def validate_data(self, data: Submission):
+        identifiers = self.prepare_data(data)
+        for entity_type in data.get_entity_types():
+            if entity_type not in self.reference_attributes and entity_type not in self.linked_types:
+                continue
+            entities = data.get_entities(entity_type)
+            logging.info(f'Validating references in {len(entities)} {entity_type}(s)')
+            self.validate_entities(entities, identifiers)
+
+    def cache_config(self) -> dict:
+        return {
+            'reference_attributes': self.reference_attributes,
+            'identifier_attributes': self.identifier_attributes,
+            'linked_types': self.linked_types,
+            'accession_patterns': self.accession_patterns
+        }
+
+    def validate_entities(self, entities: Iterable[Entity], identifiers: Dict[str, Set[str]] = None):
+        for entity in entities:
+            self.validate_entity(entity, identifiers)
+
+    def validate_entity(self, entity: Entity, identifiers: Dict[str, Set[str]] = None):
+        identifiers = {} if identifiers is None else identifiers
+        entity_type = entity.identifier.entity_type
+        for attribute, referenced_type in self.reference_attributes.get(entity_type, {}).items():
+            if attribute not in entity.attributes:
+                continue
+            reference = entity.attributes[attribute]
+            if reference not in identifiers.get(referenced_type, ()) \
+                    and not self.is_archived_accession(referenced_type, reference):
+                entity.add_error(attribute, self.format_error(referenced_type, reference))
+        for linked_type in self.linked_types.get(entity_type, []):
+            known_indexes = identifiers.get(linked_type, ())
+            for index in entity.get_linked_indexes(linked_type):
+                if index not in known_indexes:
+                    entity.add_error(linked_type, self.format_error(linked_type, index))
+
+    def is_archived_accession(self, entity_type: str, reference: str) -> bool:
+        regex = self.__accession_regexes.get(entity_type)
+        return regex is not None and regex.fullmatch(reference) is not None
+
+    def index_identifiers(self, data: Submission) -> Dict[str, Set[str]]:
+        identifiers = {}
+        for entity_type in data.get_entity_types():
+            identifiers[entity_type] = self.__entity_identifiers(
+                data.get_entities(entity_type),
+                self.identifier_attributes.get(entity_type, [])
+            )
+        return identifiers
+
+    @staticmethod
+    def __entity_identifiers(entities: Iterable[Entity], identifier_attributes: List[str]) -> Set[str]:
+        identifiers = set()
+        for entity in entities:
+            identifiers.add(entity.identifier.index)
+            for _, accession in entity.get_accessions():
+                identifiers.add(accession)
+            attributes = entity.attributes
+            for attribute in identifier_attributes:
+                if attribute in attributes:
+                    identifiers.add(attributes[attribute])
+        return identifiers
+
+    @staticmethod
+    def format_error(entity_type: str, reference: str) -> str:
+        return f'Referenced {entity_type} has not been found in the submission: {reference}'
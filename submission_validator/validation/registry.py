@@ -0,0 +1,96 @@
+import logging
+import threading
+from typing import Any, Callable, Dict, List
+
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy
+from submission_validator.services.lazy_import import lazy_import
+from submission_validator.services.taxonomy_cache import SqliteTaxonomyCache
+from submission_validator.validation.json import JsonValidator
+from submission_validator.validation.reference import ReferenceValidator
+from submission_validator.validation.taxonomy import TaxonomyValidator
+from submission_validator.validation.upload import UploadValidator
+
+requests = lazy_import('requests')
+
+Factory = Callable[['ValidatorRegistry'], Any]
+
+
+class ValidatorRegistry:
+    def __init__(self):
+        self.__factories: Dict[str, Factory] = {}
+        self.__validator_names: List[str] = []
+        self.__instances: Dict[str, Any] = {}
+        self.__lock = threading.RLock()
+
+    def register_resource(self, name: str, factory: Factory):
+        self.__factories[name] = factory
+
+    def register_validator(self, name: str, factory: Factory):
+        self.__factories[name] = factory
+        self.__validator_names.append(name)
+
+    def get(self, name: str):
+        with self.__lock:
+            if name not in self.__instances:
+                logging.info(f'Creating shared {name}')
+                self.__instances[name] = self.__factories[name](self)
+            return self.__instances[name]
+
+    def validators(self, folder_uuid: str = None) -> List[BaseValidator]:
+        validators = []
+        for name in self.__validator_names:
+            validator = self.get(name)
+            if hasattr(validator, 'for_folder'):
+                if folder_uuid is None:
+                    logging.warning(f'No upload folder given, skipping the {name} validator')
+                    continue
+                validator = validator.for_folder(folder_uuid)
+            validators.append(validator)
+        return validators
+
+    def close(self):
+        with self.__lock:
+            instances = list(self.__instances.items())
+            self.__instances.clear()
+        for name, instance in reversed(instances):
+            close = getattr(instance, 'close', None)
+            if close is not None:
+                logging.debug(f'Closing shared {name}')
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def create_registry(validator_url: str, ena_url: str = None, taxonomy_cache_path: str = None, docker_image: str = None,
+                    verify_checksums: bool = False, local_folder: str = None) -> ValidatorRegistry:
+    registry = ValidatorRegistry()
+    registry.register_resource('http_session', lambda _: requests.Session())
+    registry.register_resource(
+        'taxonomy_cache', lambda _: SqliteTaxonomyCache(taxonomy_cache_path) if taxonomy_cache_path else None)
+    registry.register_validator('json', lambda shared: create_json_validator(
+        validator_url, docker_image, session=shared.get('http_session')))
+    registry.register_validator('taxonomy', lambda shared: TaxonomyValidator(ena_taxonomy=create_ena_taxonomy(
+        ena_url, cache=shared.get('taxonomy_cache'), session=shared.get('http_session'))))
+    registry.register_validator('reference', lambda _: ReferenceValidator())
+    registry.register_validator('upload', lambda _: UploadValidator(
+        verify_checksums=verify_checksums, local_folder=local_folder))
+    return registry
+
+
+def create_json_validator(validator_url: str, docker_image: str = None, **kwargs) -> JsonValidator:
+    if docker_image:
+        from submission_validator.validation.docker import JsonValidatorDocker
+        return JsonValidatorDocker(docker_image, validator_url, **kwargs)
+    return JsonValidator(validator_url, **kwargs)
+
+
+def create_ena_taxonomy(ena_url: str = None, **kwargs) -> EnaTaxonomy:
+    if ena_url:
+        return EnaTaxonomy(ena_url, **kwargs)
+    return EnaTaxonomy(**kwargs)
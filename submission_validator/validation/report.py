@@ -0,0 +1,199 @@
+import json
+import sys
+import threading
+from queue import Queue
+from typing import Any, Callable, Dict, ItemsView, Iterable, Iterator, List, NamedTuple, Set, TextIO
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.validation.entities import entity_types_of, is_independent, prepare_data, validate_entities
+
+CHUNK_SIZE = 100
+
+
+class ErrorRecord(NamedTuple):
+    entity_type: str
+    index: str
+    attribute: str
+    message: str
+
+
+class JsonLinesSink:
+    def __init__(self, output: TextIO, message_ids: bool = False):
+        self.output = output
+        self.message_ids = message_ids
+        self.__ids: Dict[str, int] = {}
+
+    def emit(self, record: ErrorRecord):
+        line = {'entity_type': record.entity_type, 'index': record.index, 'attribute': record.attribute}
+        if self.message_ids:
+            message_id = self.__ids.get(record.message)
+            if message_id is None:
+                message_id = self.__ids[record.message] = len(self.__ids)
+                self.output.write(json.dumps({'message_id': message_id, 'message': record.message}) + '\n')
+            line['message_id'] = message_id
+        else:
+            line['message'] = record.message
+        self.output.write(json.dumps(line) + '\n')
+
+    def close(self):
+        self.output.flush()
+
+
+class CallbackSink:
+    def __init__(self, callback: Callable[[ErrorRecord], None]):
+        self.callback = callback
+
+    def emit(self, record: ErrorRecord):
+        self.callback(record)
+
+    def close(self):
+        pass
+
+
+class QueueSink:
+    def __init__(self, maxsize: int = 1000):
+        self.queue = Queue(maxsize)
+
+    def emit(self, record: ErrorRecord):
+        self.queue.put(record)
+
+    def close(self):
+        self.queue.put(None)
+
+    def records(self) -> Iterator[ErrorRecord]:
+        while True:
+            record = self.queue.get()
+            if record is None:
+                return
+            yield record
+
+
+class ErrorReport:
+    def __init__(self, sink):
+        self.sink = sink
+        self.count = 0
+        self.__lock = threading.Lock()
+
+    def wrap(self, validator: BaseValidator, chunk_size: int = CHUNK_SIZE) -> 'ReportingValidator':
+        return ReportingValidator(validator, self, chunk_size)
+
+    def emit_error(self, entity: Entity, attribute: str, error_msg: str):
+        identifier = entity.identifier
+        self.emit(ErrorRecord(
+            sys.intern(identifier.entity_type), identifier.index, sys.intern(attribute), sys.intern(error_msg)))
+
+    def emit_new_errors(self, entity: Entity, previous_counts: Dict[str, int]):
+        if not entity.has_errors():
+            return
+        for attribute, error_msgs in entity.get_errors().items():
+            for error_msg in error_msgs[previous_counts.get(attribute, 0):]:
+                self.emit_error(entity, attribute, error_msg)
+
+    def emit(self, record: ErrorRecord):
+        with self.__lock:
+            self.count += 1
+            self.sink.emit(record)
+
+    def close(self):
+        self.sink.close()
+
+    @staticmethod
+    def error_counts(entity: Entity) -> Dict[str, int]:
+        if not entity.has_errors():
+            return {}
+        return {attribute: len(error_msgs) for attribute, error_msgs in entity.get_errors().items()}
+
+    @staticmethod
+    def records(submission: Submission) -> Iterator[ErrorRecord]:
+        for entity_type, entities in submission.get_all_entities().items():
+            for entity in entities:
+                if not entity.has_errors():
+                    continue
+                for attribute, error_msgs in entity.get_errors().items():
+                    for error_msg in error_msgs:
+                        yield ErrorRecord(entity_type, entity.identifier.index, attribute, error_msg)
+
+
+class ReportedEntity(Entity):
+    # Stands in for an entity while it is validated: errors go straight to the report and are not kept
+    def __init__(self, entity: Entity, report: ErrorReport):
+        self.identifier = entity.identifier
+        self.attributes = entity.attributes
+        self.entity = entity
+        self.report = report
+        self.error_count = 0
+
+    def add_error(self, attribute: str, error_msg: str):
+        self.error_count += 1
+        self.report.emit_error(self, attribute, error_msg)
+
+    def add_errors(self, attribute: str, error_msgs: Iterable[str]):
+        for error_msg in error_msgs:
+            self.add_error(attribute, error_msg)
+
+    def get_errors(self) -> Dict[str, List[str]]:
+        return self.entity.get_errors()
+
+    def has_errors(self) -> bool:
+        return self.error_count > 0 or self.entity.has_errors()
+
+    def add_link(self, entity_type: str, index: str):
+        self.entity.add_link(entity_type, index)
+
+    def get_linked_indexes(self, entity_type) -> Set[str]:
+        return self.entity.get_linked_indexes(entity_type)
+
+    def add_accession(self, service: str, accession_value: str):
+        self.entity.add_accession(service, accession_value)
+
+    def get_accession(self, service: str) -> str:
+        return self.entity.get_accession(service)
+
+    def get_accessions(self) -> ItemsView[str, str]:
+        return self.entity.get_accessions()
+
+    def as_dict(self, with_id: bool = False, string_lists: bool = False) -> dict:
+        return self.entity.as_dict(with_id, string_lists)
+
+
+class ReportingValidator(BaseValidator):
+    def __init__(self, validator: BaseValidator, report: ErrorReport, chunk_size: int = CHUNK_SIZE):
+        self.validator = validator
+        self.report = report
+        self.chunk_size = chunk_size
+
+    def __getattr__(self, name: str):
+        if name == 'validator':
+            raise AttributeError(name)
+        return getattr(self.validator, name)
+
+    def validate_data(self, data: Submission, *args, **kwargs):
+        if args or kwargs:
+            self.__validate_whole_submission(data, *args, **kwargs)
+        elif is_independent(self.validator):
+            context = prepare_data(self.validator, data)
+            for entity_type in entity_types_of(self.validator, data):
+                entities = list(data.get_entities(entity_type))
+                for start in range(0, len(entities), self.chunk_size):
+                    self.validate_entities(entities[start:start + self.chunk_size], context)
+        elif type(self.validator).validate_data is BaseValidator.validate_data:
+            BaseValidator.validate_data(self, data)
+        else:
+            self.__validate_whole_submission(data)
+
+    def validate_entities(self, entities: Iterable[Entity], context: Any = None):
+        validate_entities(self.validator, [ReportedEntity(entity, self.report) for entity in entities], context)
+
+    def validate_entity(self, entity: Entity, *args):
+        self.validator.validate_entity(ReportedEntity(entity, self.report), *args)
+
+    def __validate_whole_submission(self, data: Submission, *args, **kwargs):
+        # Validators without per-entity entry points can only be reported on once their pass has finished
+        entities = [entity for entities in data.get_all_entities().values() for entity in entities]
+        previous_counts = [self.report.error_counts(entity) for entity in entities]
+        self.validator.validate_data(data, *args, **kwargs)
+        for entity, counts in zip(entities, previous_counts):
+            self.report.emit_new_errors(entity, counts)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import logging
+from typing import Dict, List, Sequence, Set, Tuple
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.circuit_breaker import is_retry_later
+from submission_validator.services.result_store import MemoryResultStore
+
+CACHE_FORMAT = 2
+
+SubmissionErrors = Dict[str, Dict[str, Dict[str, List[str]]]]
+AttributeChanges = Dict[str, Dict[str, dict]]
+
+
+class CachingValidator(BaseValidator):
+    def __init__(self, validators: Sequence[BaseValidator], store=None):
+        self.validators = validators
+        self.store = store if store is not None else MemoryResultStore()
+        self.hits = 0
+        self.misses = 0
+
+    def validate_data(self, data: Submission):
+        if data.has_errors():
+            logging.info('Submission already has errors, validating without the result cache')
+            self.__validate(data)
+            return
+        fingerprint = self.fingerprint(data)
+        result = self.store.get(fingerprint)
+        if result is not None:
+            self.hits += 1
+            logging.info(f'Restoring cached validation results for submission {fingerprint}')
+            self.restore_attributes(data, result['attributes'])
+            self.restore_errors(data, result['errors'])
+            return
+        self.misses += 1
+        previous_attributes = self.snapshot_attributes(data)
+        self.__validate(data)
+        errors = data.get_all_errors()
+        if self.is_cacheable(errors):
+            attributes = self.changed_attributes(data, previous_attributes)
+            self.store.set(fingerprint, {'errors': errors, 'attributes': attributes})
+
+    def validate_entity(self, entity: Entity):
+        for validator in self.validators:
+            validator.validate_entity(entity)
+
+    def fingerprint(self, data: Submission) -> str:
+        digest = hashlib.sha256()
+        digest.update(self.__encode(CACHE_FORMAT))
+        for validator in self.validators:
+            digest.update(self.__encode([type(validator).__qualname__, validator_config(validator)]))
+        entity_types = sorted(data.get_entity_types())
+        link_types = sorted(set(entity_types).union(*(linked_types(validator) for validator in self.validators)))
+        for entity_type in entity_types:
+            entities = sorted(data.get_entities(entity_type), key=lambda entity: entity.identifier.index)
+            for entity in entities:
+                digest.update(self.__encode(entity_contents(entity, link_types)))
+        return digest.hexdigest()
+
+    def __validate(self, data: Submission):
+        for validator in self.validators:
+            validator.validate_data(data)
+
+    @staticmethod
+    def restore_errors(data: Submission, errors: SubmissionErrors):
+        for entity_type, entity_errors in errors.items():
+            for index, attribute_errors in entity_errors.items():
+                entity = data.get_entity(entity_type, index)
+                for attribute, error_msgs in attribute_errors.items():
+                    entity.add_errors(attribute, error_msgs)
+
+    @staticmethod
+    def snapshot_attributes(data: Submission) -> Dict[Tuple[str, str], dict]:
+        return {
+            (entity.identifier.entity_type, entity.identifier.index): dict(entity.attributes)
+            for entities in data.get_all_entities().values() for entity in entities
+        }
+
+    @staticmethod
+    def changed_attributes(data: Submission, previous_attributes: Dict[Tuple[str, str], dict]) -> AttributeChanges:
+        changes = {}
+        for entity_type, entities in data.get_all_entities().items():
+            for entity in entities:
+                previous = previous_attributes.get((entity_type, entity.identifier.index), {})
+                updated = {name: value for name, value in entity.attributes.items()
+                           if name not in previous or previous[name] != value}
+                removed = [name for name in previous if name not in entity.attributes]
+                if updated or removed:
+                    changes.setdefault(entity_type, {})[entity.identifier.index] = {
+                        'updated': updated,
+                        'removed': removed
+                    }
+        return changes
+
+    @staticmethod
+    def restore_attributes(data: Submission, changes: AttributeChanges):
+        for entity_type, entity_changes in changes.items():
+            for index, change in entity_changes.items():
+                attributes = data.get_entity(entity_type, index).attributes
+                attributes.update(change['updated'])
+                for name in change['removed']:
+                    attributes.pop(name, None)
+
+    @staticmethod
+    def is_cacheable(errors: SubmissionErrors) -> bool:
+        for entity_errors in errors.values():
+            for attribute_errors in entity_errors.values():
+                for error_msgs in attribute_errors.values():
+                    if any(is_retry_later(error_msg) for error_msg in error_msgs):
+                        return False
+        return True
+
+    @staticmethod
+    def __encode(value) -> bytes:
+        return json.dumps(value, sort_keys=True, default=str).encode('utf-8') + b'\n'
+
+
+def validator_config(validator: BaseValidator):
+    cache_config = getattr(validator, 'cache_config', None)
+    return cache_config() if cache_config else None
+
+
+def linked_types(validator: BaseValidator) -> Set[str]:
+    types = set()
+    for types_by_entity in getattr(validator, 'linked_types', {}).values():
+        types.update(types_by_entity)
+    return types
+
+
+def entity_contents(entity: Entity, link_types: List[str]) -> list:
+    links = {}
+    for entity_type in link_types:
+        linked_indexes = entity.get_linked_indexes(entity_type)
+        if linked_indexes:
+            links[entity_type] = sorted(linked_indexes)
+    identifier = entity.identifier
+    return [identifier.entity_type, identifier.index, entity.attributes, dict(entity.get_accessions()), links]
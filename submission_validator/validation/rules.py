@@ -0,0 +1,141 @@
+import re
+import string
+from typing import Any, Callable, Dict, List, Optional
+
+ASCII_LOWERCASE = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+JSON_TYPES = {
+    'string': (str,),
+    'number': (int, float),
+    'integer': (int,),
+    'boolean': (bool,),
+    'array': (list,),
+    'object': (dict,),
+    'null': (type(None),)
+}
+ANNOTATION_KEYWORDS = {'id', '$id', '$schema', '$async', '$comment', 'title', 'description', 'version', 'author',
+                       'default', 'examples'}
+PROPERTY_KEYWORDS = {'type', 'enum', 'pattern', 'not'}
+SCHEMA_KEYWORDS = {'type', 'required', 'properties', 'dependencies'}
+
+ValueCheck = Callable[[Any], Optional[str]]
+
+
+class CompiledSchema:
+    def __init__(self, entity_type: str, schema: dict):
+        self.required = list(schema.get('required', []))
+        self.checks: Dict[str, List[ValueCheck]] = {}
+        self.uncovered_properties = set(schema.get('dependencies', {}))
+        self.covers_all = schema.get('type', 'object') == 'object' and \
+            not set(schema).difference(ANNOTATION_KEYWORDS, SCHEMA_KEYWORDS)
+        for attribute, rules in schema.get('properties', {}).items():
+            if not is_supported_property(rules):
+                self.uncovered_properties.add(attribute)
+                continue
+            checks = compile_checks(entity_type, attribute, rules)
+            if checks:
+                self.checks[attribute] = checks
+
+    def covers(self, attributes: dict) -> bool:
+        return self.covers_all and self.uncovered_properties.isdisjoint(attributes)
+
+    def validate(self, attributes: dict) -> Dict[str, List[str]]:
+        errors: Dict[str, List[str]] = {}
+        for attribute in self.required:
+            if attribute not in attributes:
+                errors[attribute] = [required_error(attribute)]
+        for attribute, checks in self.checks.items():
+            if attribute not in attributes:
+                continue
+            value = attributes[attribute]
+            messages = [message for message in (check(value) for check in checks) if message]
+            if messages:
+                errors.setdefault(attribute, []).extend(messages)
+        return errors
+
+
+def is_supported_property(rules: dict) -> bool:
+    keywords = set(rules).difference(ANNOTATION_KEYWORDS)
+    if not keywords.issubset(PROPERTY_KEYWORDS):
+        return False
+    return 'not' not in rules or set(rules['not']) == {'enum'}
+
+
+def compile_checks(entity_type: str, attribute: str, rules: dict) -> List[ValueCheck]:
+    checks = []
+    if 'type' in rules:
+        checks.append(type_check(rules['type']))
+    if 'enum' in rules:
+        checks.append(enum_check(rules['enum']))
+    if 'pattern' in rules:
+        checks.append(pattern_check(rules['pattern']))
+    if set(rules.get('not', {})) == {'enum'}:
+        checks.append(not_enum_check(rules['not']['enum'], entity_type, attribute))
+    return checks
+
+
+def type_check(json_type) -> ValueCheck:
+    json_types = json_type if isinstance(json_type, list) else [json_type]
+    python_types = tuple(python_type for name in json_types for python_type in JSON_TYPES.get(name, ()))
+    message = f'should be {",".join(json_types)}'
+
+    def check(value):
+        if isinstance(value, bool) and bool not in python_types:
+            return message
+        if not isinstance(value, python_types):
+            return message
+        return None
+    return check
+
+
+def enum_check(enum: list) -> ValueCheck:
+    allowed = frozenset(value for value in enum if not isinstance(value, (list, dict)))
+    allowed_values = ', '.join(f"'{value}'" for value in enum)
+    message = f'should be equal to one of the allowed values: [{allowed_values}]'
+
+    def check(value):
+        try:
+            return None if value in allowed else message
+        except TypeError:
+            return message
+    return check
+
+
+def pattern_check(pattern: str) -> ValueCheck:
+    regex = re.compile(pattern)
+    message = f'should match pattern "{pattern}"'
+
+    def check(value):
+        if isinstance(value, str) and not regex.search(value):
+            return message
+        return None
+    return check
+
+
+def not_enum_check(enum: list, entity_type: str, attribute: str) -> ValueCheck:
+    forbidden = frozenset(value for value in enum if not isinstance(value, (list, dict)))
+    message = not_valid_error(entity_type, attribute)
+
+    def check(value):
+        try:
+            return message if value in forbidden else None
+        except TypeError:
+            return None
+    return check
+
+
+def required_error(attribute: str) -> str:
+    return f"should have required property '{attribute}'"
+
+
+def not_valid_error(entity_type: str, attribute: str) -> str:
+    return f'{entity_type} should have required property: \'{attribute}\''
+
+
+def ascii_lower(value: Any) -> Any:
+    if isinstance(value, str):
+        return value.lower() if value.isascii() else value.translate(ASCII_LOWERCASE)
+    if isinstance(value, list):
+        return [ascii_lower(item) for item in value]
+    if isinstance(value, dict):
+        return {ascii_lower(key): ascii_lower(item) for key, item in value.items()}
+    return value
@@ -0,0 +1,225 @@
+import heapq
+import itertools
+import logging
+import math
+import threading
+import time
+from typing import Any, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.circuit_breaker import NOT_VALIDATED_KEY, RETRY_LATER
+from submission_validator.validation.entities import entity_types_of, is_independent, prepare_data, validate_entities
+
+CHUNK_SIZE = 100
+MAX_WORKERS = 4
+INTERACTIVE_PRIORITY = 0
+BULK_PRIORITY = 10
+_NOT_PREPARED = object()
+
+
+class Chunk(NamedTuple):
+    validators: List[BaseValidator]
+    contexts: List[Any]
+    entities: List[Entity]
+    whole_submission: bool
+
+    @property
+    def size(self) -> int:
+        return len(self.validators) * len(self.entities)
+
+
+class ValidationJob:
+    def __init__(self, submission: Submission, validators: Sequence[BaseValidator], priority: int,
+                 deadline: Optional[float], chunk_size: int):
+        self.submission = submission
+        self.validators = validators
+        self.priority = priority
+        self.deadline = deadline
+        self.completed = 0
+        self.errors: List[Exception] = []
+        self.started = time.monotonic()
+        self.finished = None
+        self.waiting = False
+        chunks = list(self.__split(chunk_size))
+        self.total = sum(chunk.size for chunk in chunks)
+        self.__chunks = iter(chunks)
+        self.__upcoming = next(self.__chunks, None)
+        self.__pending = 0
+        self.__exclusive = False
+        self.__done = threading.Event()
+
+    def progress(self) -> float:
+        return self.completed / self.total if self.total else 1.0
+
+    def is_done(self) -> bool:
+        return self.__done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self.__done.wait(timeout)
+
+    def next_chunk(self) -> Optional[Chunk]:
+        chunk = self.__upcoming
+        if chunk is None:
+            self.__finish_if_complete()
+            return None
+        # A whole-submission validator may touch any entity, so it never runs alongside other chunks of its job
+        if self.__exclusive or (chunk.whole_submission and self.__pending):
+            self.waiting = True
+            return None
+        self.__upcoming = next(self.__chunks, None)
+        self.__exclusive = chunk.whole_submission
+        self.__pending += 1
+        return chunk
+
+    def complete_chunk(self, chunk: Chunk) -> bool:
+        self.completed += chunk.size
+        self.__pending -= 1
+        self.__exclusive = False
+        self.__finish_if_complete()
+        if self.waiting and self.__pending == 0:
+            self.waiting = False
+            return True
+        return False
+
+    def __finish_if_complete(self):
+        if self.__upcoming is None and self.__pending == 0 and not self.__done.is_set():
+            self.finished = time.monotonic()
+            self.__done.set()
+
+    def __split(self, chunk_size: int) -> Iterator[Chunk]:
+        # Entities are chunked by type and every chunk runs all of its validators in turn, so no entity is validated
+        # by two workers at once; validators without independent entities get the whole submission after the chunks
+        prepared = []
+        for validator in self.validators:
+            if is_independent(validator):
+                context = self.__prepare(validator)
+                if context is not _NOT_PREPARED:
+                    prepared.append((validator, context))
+        for entity_type in list(self.submission.get_entity_types()):
+            type_validators = [
+                (validator, context) for validator, context in prepared
+                if entity_type in entity_types_of(validator, self.submission)
+            ]
+            if not type_validators:
+                continue
+            validators = [validator for validator, _ in type_validators]
+            contexts = [context for _, context in type_validators]
+            entities = list(self.submission.get_entities(entity_type))
+            for start in range(0, len(entities), chunk_size):
+                yield Chunk(validators, contexts, entities[start:start + chunk_size], False)
+        for validator in self.validators:
+            if not is_independent(validator):
+                entities = [
+                    entity for entity_type in entity_types_of(validator, self.submission)
+                    for entity in self.submission.get_entities(entity_type)
+                ]
+                yield Chunk([validator], [None], entities, True)
+
+    def __prepare(self, validator: BaseValidator) -> Any:
+        try:
+            return prepare_data(validator, self.submission)
+        except Exception as error:
+            logging.exception(f'Preparing validation with {validator.__class__} failed')
+            self.errors.append(error)
+            for entity_type in entity_types_of(validator, self.submission):
+                for entity in self.submission.get_entities(entity_type):
+                    entity.add_error(NOT_VALIDATED_KEY, ValidationScheduler.format_failed_error(entity_type))
+            return _NOT_PREPARED
+
+
+class ValidationScheduler:
+    def __init__(self, max_workers: int = MAX_WORKERS, chunk_size: int = CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.__queue: List[Tuple[int, float, int, ValidationJob]] = []
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+        self.__closed = False
+        self.__workers = [threading.Thread(target=self.__work, daemon=True) for _ in range(max_workers)]
+        for worker in self.__workers:
+            worker.start()
+
+    def submit(self, submission: Submission, validators: Sequence[BaseValidator], priority: int = BULK_PRIORITY,
+               timeout: float = None) -> ValidationJob:
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        job = ValidationJob(submission, validators, priority, deadline, self.chunk_size)
+        logging.info(f'Scheduling validation of {job.total} entities with priority {priority}')
+        with self.__condition:
+            self.__push(job)
+            self.__condition.notify()
+        return job
+
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            self.__condition.notify_all()
+        for worker in self.__workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __push(self, job: ValidationJob):
+        deadline = job.deadline if job.deadline is not None else math.inf
+        heapq.heappush(self.__queue, (job.priority, deadline, next(self.__sequence), job))
+
+    def __next(self) -> Optional[Tuple[ValidationJob, Chunk]]:
+        with self.__condition:
+            while True:
+                while self.__queue:
+                    job = heapq.heappop(self.__queue)[-1]
+                    chunk = job.next_chunk()
+                    if chunk is not None:
+                        self.__push(job)
+                        self.__condition.notify()
+                        return job, chunk
+                if self.__closed:
+                    return None
+                self.__condition.wait()
+
+    def __work(self):
+        while True:
+            scheduled = self.__next()
+            if scheduled is None:
+                return
+            job, chunk = scheduled
+            if chunk.whole_submission:
+                self.__validate_submission(job, chunk.validators[0])
+            else:
+                for validator, context in zip(chunk.validators, chunk.contexts):
+                    self.__validate_entities(job, validator, context, chunk.entities)
+            with self.__condition:
+                if job.complete_chunk(chunk):
+                    self.__push(job)
+                    self.__condition.notify()
+
+    @staticmethod
+    def __validate_submission(job: ValidationJob, validator: BaseValidator):
+        try:
+            validator.validate_data(job.submission)
+        except Exception as error:
+            logging.exception(f'Validation with {validator.__class__} failed')
+            job.errors.append(error)
+
+    @staticmethod
+    def __validate_entities(job: ValidationJob, validator: BaseValidator, context: Any, entities: List[Entity]):
+        # Validators that validate a chunk at once fail as a whole, the rest fail one entity at a time
+        batches = [entities] if hasattr(validator, 'validate_entities') else [[entity] for entity in entities]
+        for batch in batches:
+            try:
+                validate_entities(validator, batch, context)
+            except Exception as error:
+                logging.exception(f'Validation of {len(batch)} entities with {validator.__class__} failed')
+                job.errors.append(error)
+                for entity in batch:
+                    error_msg = ValidationScheduler.format_failed_error(entity.identifier.entity_type)
+                    entity.add_error(NOT_VALIDATED_KEY, error_msg)
+
+    @staticmethod
+    def format_failed_error(entity_type: str) -> str:
+        return f'Could not validate {entity_type}, {RETRY_LATER}.'
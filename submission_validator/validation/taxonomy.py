@@ -1,59 +1,88 @@
 import logging
+from typing import Iterable
 
 from submission_broker.submission.entity import Entity
 from submission_broker.submission.submission import Submission
 from submission_broker.validation.base import BaseValidator
 
+from submission_validator.services.circuit_breaker import NOT_VALIDATED_KEY, is_retry_later
 from submission_validator.services.ena_taxonomy import EnaTaxonomy
+from submission_validator.validation.errors import ErrorCollector
 
 
 class TaxonomyValidator(BaseValidator):
-    def __init__(self):
-        self.ena_taxonomy = EnaTaxonomy()
+    entity_types = ['sample']
+    independent_entities = True
+
+    def __init__(self, cache=None, ena_taxonomy: EnaTaxonomy = None):
+        self.ena_taxonomy = ena_taxonomy if ena_taxonomy else EnaTaxonomy(cache=cache)
 
     def validate_data(self, data: Submission):
         entities = data.get_entities('sample')
         logging.info(f'Validating taxonomy against scientific name in {len(entities)} sample(s)')
-        for entity in entities:
-            self.validate_entity(entity)
+        self.validate_entities(entities)
+
+    def cache_config(self) -> dict:
+        return {
+            'tax_id_url': self.ena_taxonomy.tax_id_url,
+            'species_url': self.ena_taxonomy.species_url
+        }
 
     def validate_entity(self, entity: Entity):
+        self.validate_entities([entity])
+
+    def validate_entities(self, entities: Iterable[Entity], context=None):
+        collector = ErrorCollector()
+        try:
+            for entity in entities:
+                self.collect_errors(entity, collector)
+        finally:
+            collector.flush()
+
+    def collect_errors(self, entity: Entity, collector: ErrorCollector):
         sample = entity.attributes
-        sample_errors = {}
         if 'tax_id' in sample and 'scientific_name' in sample:
             tax_response = self.ena_taxonomy.validate_taxonomy(
                 tax_id=sample['tax_id'],
                 scientific_name=sample['scientific_name']
             )
-            sample_errors = self.get_taxonomy_errors(tax_response)
-        else:
-            if 'tax_id' in sample:
-                tax_response = self.ena_taxonomy.validate_tax_id(sample['tax_id'])
-                sample_errors = self.get_errors(tax_response, 'tax_id')
-            elif 'scientific_name' in sample:
-                tax_response = self.ena_taxonomy.validate_scientific_name(sample['scientific_name'])
-                sample_errors = self.get_errors(tax_response, 'scientific_name')
-        for attribute, errors in sample_errors.items():
-            entity.add_errors(attribute, errors)
+            self.collect_taxonomy_errors(entity, tax_response, collector)
+        elif 'tax_id' in sample:
+            tax_response = self.ena_taxonomy.validate_tax_id(sample['tax_id'])
+            self.__collect_response_error(entity, tax_response, 'tax_id', collector)
+        elif 'scientific_name' in sample:
+            tax_response = self.ena_taxonomy.validate_scientific_name(sample['scientific_name'])
+            self.__collect_response_error(entity, tax_response, 'scientific_name', collector)
 
     @staticmethod
     def get_taxonomy_errors(response: dict) -> dict:
-        errors = {}
-        if 'tax_id' in response:
-            TaxonomyValidator.__set_errors_from_response(response['tax_id'], 'tax_id', errors)
-        if 'scientific_name' in response:
-            TaxonomyValidator.__set_errors_from_response(response['scientific_name'], 'scientific_name', errors)
-        TaxonomyValidator.__set_errors_from_response(response, 'tax_id', errors)
-        TaxonomyValidator.__set_errors_from_response(response, 'scientific_name', errors)
-        return errors
+        sample = Entity('sample', '', {})
+        collector = ErrorCollector()
+        TaxonomyValidator.collect_taxonomy_errors(sample, response, collector)
+        collector.flush()
+        return sample.get_errors()
 
     @staticmethod
     def get_errors(response: dict, key: str) -> dict:
-        errors = {}
-        TaxonomyValidator.__set_errors_from_response(response, key, errors)
-        return errors
+        sample = Entity('sample', '', {})
+        collector = ErrorCollector()
+        TaxonomyValidator.__collect_response_error(sample, response, key, collector)
+        collector.flush()
+        return sample.get_errors()
+
+    @staticmethod
+    def collect_taxonomy_errors(entity: Entity, response: dict, collector: ErrorCollector):
+        if 'tax_id' in response:
+            TaxonomyValidator.__collect_response_error(entity, response['tax_id'], 'tax_id', collector)
+        if 'scientific_name' in response:
+            species_response = response['scientific_name']
+            TaxonomyValidator.__collect_response_error(entity, species_response, 'scientific_name', collector)
+        TaxonomyValidator.__collect_response_error(entity, response, 'tax_id', collector)
+        TaxonomyValidator.__collect_response_error(entity, response, 'scientific_name', collector)
 
     @staticmethod
-    def __set_errors_from_response(response: dict, key, errors: dict):
+    def __collect_response_error(entity: Entity, response: dict, key: str, collector: ErrorCollector):
         if 'error' in response:
-            errors.setdefault(key, []).append(response['error'])
+            if is_retry_later(response['error']):
+                key = NOT_VALIDATED_KEY
+            collector.add(entity, key, response['error'])
@@ -1,63 +1,232 @@
 import logging
+import threading
+from collections import OrderedDict
 from contextlib import closing
+from functools import lru_cache
 import io
-from typing import Dict
-
-import boto3
-from botocore.exceptions import ClientError
+from os.path import join
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
 
 from submission_broker.submission.entity import Entity
 from submission_broker.submission.submission import Submission
 from submission_broker.validation.base import BaseValidator
 
+from submission_validator.services.checksum import ChecksumCalculator, MAX_WORKERS
+from submission_validator.services.lazy_import import lazy_import
+from submission_validator.services.profiling import external_call
+
+boto3 = lazy_import('boto3')
+botocore_exceptions = lazy_import('botocore.exceptions')
+
 ENDPOINT = 'https://s3.embassy.ebi.ac.uk'
 REGION = 'eu-west-2'
 BUCKET = 'covid-utils-ui-88560523'
 CHECKSUMS_FILE_NAME = 'checksums.csv'
+MAX_FOLDERS = 64
+
+FileReference = Tuple[str, str, str]
+
+
+class FileOutcome(NamedTuple):
+    file_name: str
+    stated_checksum: Optional[str]
+    errors: Tuple[Tuple[str, str], ...]
+    filled_checksum: Optional[str]
+
+
+class ManifestDiff(NamedTuple):
+    added: Set[str]
+    removed: Set[str]
+    changed: Set[str]
+
+    def files(self) -> Set[str]:
+        return self.added | self.removed | self.changed
+
+
+def diff_manifests(previous: Dict[str, str], current: Dict[str, str]) -> ManifestDiff:
+    added = current.keys() - previous.keys()
+    removed = previous.keys() - current.keys()
+    changed = {file_name for file_name in current.keys() & previous.keys() if current[file_name] != previous[file_name]}
+    return ManifestDiff(set(added), set(removed), changed)
 
 
 class UploadValidator(BaseValidator):
-    def __init__(self, folder_uuid: str):
+    entity_types = ['run_experiment']
+    independent_entities = True
+
+    def __init__(self, folder_uuid: str = None, verify_checksums: bool = False, local_folder: str = None,
+                 max_workers: int = MAX_WORKERS, max_folders: int = MAX_FOLDERS):
         self.folder_uuid = folder_uuid
-        self.file_checksum_map = self.get_file_checksum_map(folder_uuid)
+        self.file_checksum_map = self.get_file_checksum_map(folder_uuid) if folder_uuid else {}
+        self.verify_checksums = verify_checksums
+        self.local_folder = local_folder
+        self.max_workers = max_workers
+        self.max_folders = max_folders
+        self.checked_files = 0
+        self.__outcomes: Dict[FileReference, FileOutcome] = {}
+        self.__references: Dict[str, Set[FileReference]] = {}
+        self.__verification_errors: Dict[str, Optional[str]] = {}
+        self.__folders: OrderedDict = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def for_folder(self, folder_uuid: str) -> 'UploadValidator':
+        with self.__lock:
+            validator = self.__folders.pop(folder_uuid, None)
+        if validator is None:
+            validator = UploadValidator(folder_uuid, self.verify_checksums, self.local_folder, self.max_workers)
+        else:
+            validator.reload_checksums()
+        with self.__lock:
+            self.__folders[folder_uuid] = validator
+            while len(self.__folders) > self.max_folders:
+                self.__folders.popitem(last=False)
+        return validator
+
+    def reload_checksums(self) -> ManifestDiff:
+        with self.__lock:
+            checksum_map = self.get_file_checksum_map(self.folder_uuid)
+            diff = diff_manifests(self.file_checksum_map, checksum_map)
+            self.file_checksum_map = checksum_map
+            for file_name in diff.files():
+                for reference in self.__references.pop(file_name, ()):
+                    self.__outcomes.pop(reference, None)
+                self.__verification_errors.pop(file_name, None)
+            logging.info(
+                f'Reloaded checksums: {len(diff.added)} added, {len(diff.removed)} removed, '
+                f'{len(diff.changed)} changed file(s)')
+            return diff
 
-    def validate_data(self, data: Submission):
+    def validate_data(self, data: Submission, folder_uuid: str = None):
+        if folder_uuid is not None and folder_uuid != self.folder_uuid:
+            self.for_folder(folder_uuid).validate_data(data)
+            return
         entities = data.get_entities('run_experiment')
         logging.info(f'Validating file checksums for {len(entities)} run(s)')
-        for entity in entities:
-            self.validate_entity(entity)
+        self.validate_entities(entities)
+
+    def validate_entities(self, entities: Iterable[Entity], context=None):
+        with self.__lock:
+            for entity in entities:
+                self.validate_entity(entity)
+            if self.verify_checksums:
+                self.verify_uploaded_files(entities)
+
+    def cache_config(self) -> dict:
+        return {
+            'folder_uuid': self.folder_uuid,
+            'checksums': self.file_checksum_map,
+            'verify_checksums': self.verify_checksums
+        }
 
     def validate_entity(self, entity: Entity):
+        with self.__lock:
+            for file_attribute, check_attribute in self.file_attributes(entity):
+                reference = (entity.identifier.entity_type, entity.identifier.index, file_attribute)
+                file_name = entity.attributes[file_attribute]
+                outcome = self.__outcomes.get(reference)
+                if outcome is None or outcome.file_name != file_name or \
+                        outcome.stated_checksum != entity.attributes.get(check_attribute):
+                    outcome = self.check_file(entity.attributes, file_attribute, check_attribute)
+                    self.__outcomes[reference] = outcome
+                    self.__references.setdefault(file_name, set()).add(reference)
+                self.apply_outcome(entity, check_attribute, outcome)
+
+    def verify_uploaded_files(self, entities: Iterable[Entity]):
+        with self.__lock:
+            references: Dict[str, List[Tuple[Entity, str]]] = {}
+            for entity in entities:
+                for file_attribute, check_attribute in self.file_attributes(entity):
+                    file_name = entity.attributes[file_attribute]
+                    if file_name in self.file_checksum_map:
+                        references.setdefault(file_name, []).append((entity, check_attribute))
+            unverified = [file_name for file_name in references if file_name not in self.__verification_errors]
+            logging.info(f'Verifying content checksums of {len(unverified)} of {len(references)} uploaded file(s)')
+            uploaded_checksums = self.calculate_checksums(unverified)
+            errors = dict(self.__verification_errors)
+            for file_name in unverified:
+                upload_checksum = self.file_checksum_map[file_name]
+                calculated_checksum = uploaded_checksums.get(file_name)
+                if calculated_checksum is None:
+                    errors[file_name] = self.unreadable_file_error(file_name)
+                    continue
+                if calculated_checksum != upload_checksum.lower():
+                    errors[file_name] = self.content_mismatch_error(calculated_checksum, upload_checksum)
+                else:
+                    errors[file_name] = None
+                self.__verification_errors[file_name] = errors[file_name]
+            for file_name, entity_attributes in references.items():
+                error = errors[file_name]
+                if error is None:
+                    continue
+                for entity, check_attribute in entity_attributes:
+                    entity.add_error(check_attribute, error)
+
+    def calculate_checksums(self, file_names: Iterable[str]) -> Dict[str, str]:
+        if self.local_folder:
+            calculator = ChecksumCalculator(max_workers=self.max_workers)
+            paths = {join(self.local_folder, file_name): file_name for file_name in file_names}
+            return {paths[path]: checksum for path, checksum in calculator.md5_of_paths(paths.keys()).items()}
+        calculator = ChecksumCalculator(self.get_s3_client(), BUCKET, max_workers=self.max_workers)
+        keys = {f'{self.folder_uuid}/{file_name}': file_name for file_name in file_names}
+        return {keys[key]: checksum for key, checksum in calculator.md5_of_objects(keys.keys()).items()}
+
+    @staticmethod
+    def file_attributes(entity: Entity) -> Iterator[Tuple[str, str]]:
         file_number = 1
         while True:
             file_attribute = f'uploaded_file_{file_number}'
-            check_attribute = file_attribute + '_checksum'
             if file_attribute not in entity.attributes:
                 break
-            self.validate_file(entity, file_attribute, check_attribute)
+            yield file_attribute, file_attribute + '_checksum'
             file_number = file_number + 1
 
     def validate_file(self, entity: Entity, file_attribute: str, check_attribute: str):
-        file_name = entity.attributes[file_attribute]
+        self.apply_outcome(entity, check_attribute, self.check_file(entity.attributes, file_attribute, check_attribute))
+
+    def check_file(self, attributes: dict, file_attribute: str, check_attribute: str) -> FileOutcome:
+        self.checked_files += 1
+        file_name = attributes[file_attribute]
+        stated_checksum = attributes.get(check_attribute)
         if file_name not in self.file_checksum_map:
-            entity.add_error(file_attribute, f'File has not been uploaded to drag-and-drop: {file_name}')
-            return
+            error = self.missing_file_error(file_name)
+            return FileOutcome(file_name, stated_checksum, ((file_attribute, error),), None)
         upload_checksum = self.file_checksum_map[file_name]
-        if check_attribute in entity.attributes:
-            stated_checksum = entity.attributes[check_attribute]
-            if stated_checksum != upload_checksum:
-                entity.add_error(
-                    check_attribute,
-                    f'The checksum found on drag-and-drop {upload_checksum} does not match: {stated_checksum}')
-                return
-        else:
-            entity.attributes[check_attribute] = upload_checksum
+        if stated_checksum is None:
+            return FileOutcome(file_name, stated_checksum, (), upload_checksum)
+        if stated_checksum != upload_checksum:
+            error = self.checksum_mismatch_error(upload_checksum, stated_checksum)
+            return FileOutcome(file_name, stated_checksum, ((check_attribute, error),), None)
+        return FileOutcome(file_name, stated_checksum, (), None)
+
+    @staticmethod
+    def apply_outcome(entity: Entity, check_attribute: str, outcome: FileOutcome):
+        for attribute, error in outcome.errors:
+            entity.add_error(attribute, error)
+        if outcome.filled_checksum is not None:
+            entity.attributes[check_attribute] = outcome.filled_checksum
+
+    @staticmethod
+    def missing_file_error(file_name: str) -> str:
+        return f'File has not been uploaded to drag-and-drop: {file_name}'
+
+    @staticmethod
+    def checksum_mismatch_error(upload_checksum: str, stated_checksum: str) -> str:
+        return f'The checksum found on drag-and-drop {upload_checksum} does not match: {stated_checksum}'
+
+    @staticmethod
+    def content_mismatch_error(calculated_checksum: str, upload_checksum: str) -> str:
+        return f'The checksum of the file uploaded to drag-and-drop {calculated_checksum} ' \
+               f'does not match: {upload_checksum}'
+
+    @staticmethod
+    def unreadable_file_error(file_name: str) -> str:
+        return f'Could not read the file uploaded to drag-and-drop: {file_name}'
 
     @staticmethod
     def get_file_checksum_map(folder_uuid: str) -> Dict[str, str]:
         try:
             checksums_text = UploadValidator.get_checksums_file(f'{folder_uuid}/{CHECKSUMS_FILE_NAME}')
-        except ClientError as error:
+        except botocore_exceptions.ClientError as error:
             checksums_text = ''
             error_info = error.response.get('Error', {})
             logging.warning(
@@ -71,6 +240,12 @@ class UploadValidator(BaseValidator):
     @staticmethod
     def get_checksums_file(file_key: str) -> str:
         with closing(io.BytesIO()) as checksums_file:
-            s3 = boto3.client('s3', endpoint_url=ENDPOINT, region_name=REGION)
-            s3.download_fileobj(BUCKET, file_key, checksums_file)
+            s3 = UploadValidator.get_s3_client()
+            with external_call('s3_checksums_file'):
+                s3.download_fileobj(BUCKET, file_key, checksums_file)
             return checksums_file.getvalue().decode("utf-8")
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def get_s3_client():
+        return boto3.client('s3', endpoint_url=ENDPOINT, region_name=REGION)
@@ -0,0 +1,134 @@
+import threading
+from functools import lru_cache
+from os.path import dirname, isfile, join
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Union
+
+from lxml import etree
+
+SCHEMA_DIR = join(dirname(__file__), 'schema')
+SET_SUFFIX = '_SET'
+
+XmlDocument = Union[str, bytes]
+XmlSource = Union[str, BinaryIO]
+
+_schema_locks: Dict[str, threading.Lock] = {}
+_schema_locks_guard = threading.Lock()
+
+
+class XmlSchemaValidator:
+    def __init__(self, schema_dir: str = SCHEMA_DIR):
+        self.schema_dir = schema_dir
+        self.__parser = etree.XMLParser(no_network=True, resolve_entities=False)
+
+    def get_schema(self, schema_name: str) -> etree.XMLSchema:
+        return load_schema(self.get_schema_path(schema_name))
+
+    def get_schema_path(self, schema_name: str) -> str:
+        return join(self.schema_dir, f'{schema_name}.xsd')
+
+    def validate(self, xml_document: XmlDocument, schema_name: str = None) -> List[dict]:
+        if isinstance(xml_document, str):
+            xml_document = xml_document.encode('utf-8')
+        try:
+            root = etree.fromstring(xml_document, self.__parser)
+        except etree.XMLSyntaxError as error:
+            return [self.format_error(log_entry) for log_entry in error.error_log]
+        return self.validate_element(root, schema_name)
+
+    def validate_all(self, xml_documents: Iterable[XmlDocument], schema_name: str = None) -> List[List[dict]]:
+        return [self.validate(xml_document, schema_name) for xml_document in xml_documents]
+
+    def validate_stream(self, xml_source: XmlSource, schema_name: str = None) -> Iterator[dict]:
+        depth = 0
+        position = 0
+        member_tag = None
+        try:
+            for event, element in etree.iterparse(xml_source, events=('start', 'end'), no_network=True,
+                                                  resolve_entities=False, huge_tree=True):
+                if event == 'start':
+                    if depth == 0 and element.tag.endswith(SET_SUFFIX):
+                        member_tag = self.schema_name_for(element.tag)
+                    depth += 1
+                    continue
+                depth -= 1
+                if member_tag and depth == 1:
+                    position += 1
+                    root_path = f'/{element.getparent().tag}/{element.tag}[{position}]'
+                    if etree.QName(element.tag).localname != member_tag:
+                        yield self.format_unexpected_member_error(element, root_path, member_tag)
+                    else:
+                        for error in self.validate_element(element, schema_name or member_tag):
+                            error['path'] = root_path + error['path'][len(element.tag) + 1:]
+                            yield error
+                    self.__release(element)
+                elif not member_tag and depth == 0:
+                    yield from self.validate_element(element, schema_name)
+        except etree.XMLSyntaxError as error:
+            yield from (self.format_error(log_entry) for log_entry in error.error_log)
+
+    def validate_element(self, element, schema_name: str = None) -> List[dict]:
+        if not schema_name:
+            schema_name = self.schema_name_for(element.tag)
+        schema_path = self.get_schema_path(schema_name)
+        if not isfile(schema_path):
+            return [self.format_missing_schema_error(element, schema_name)]
+        try:
+            schema = load_schema(schema_path)
+        except etree.XMLSchemaParseError:
+            return [self.format_missing_schema_error(element, schema_name)]
+        # An XMLSchema keeps its error_log on the instance, so shared schemas validate one element at a time
+        with schema_lock(schema_path):
+            if schema.validate(element):
+                return []
+            return [self.format_error(log_entry) for log_entry in schema.error_log]
+
+    @staticmethod
+    def __release(element):
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+    @staticmethod
+    def schema_name_for(tag: str) -> str:
+        tag = etree.QName(tag).localname
+        if tag.endswith(SET_SUFFIX):
+            tag = tag[:-len(SET_SUFFIX)]
+        return tag
+
+    @staticmethod
+    def format_error(log_entry) -> dict:
+        return {
+            'line': log_entry.line,
+            'column': log_entry.column,
+            'path': log_entry.path,
+            'error': log_entry.message
+        }
+
+    @staticmethod
+    def format_unexpected_member_error(element, path: str, member_tag: str) -> dict:
+        return {
+            'line': element.sourceline,
+            'column': 0,
+            'path': path,
+            'error': f'Element {element.tag} is not expected in a {member_tag}{SET_SUFFIX}, expected {member_tag}'
+        }
+
+    @staticmethod
+    def format_missing_schema_error(element, schema_name: str) -> dict:
+        return {
+            'line': element.sourceline,
+            'column': 0,
+            'path': f'/{element.tag}',
+            'error': f'No schema for {schema_name}'
+        }
+
+
+def schema_lock(schema_path: str) -> threading.Lock:
+    with _schema_locks_guard:
+        return _schema_locks.setdefault(schema_path, threading.Lock())
+
+
+@lru_cache(maxsize=None)
+def load_schema(schema_path: str) -> etree.XMLSchema:
+    parser = etree.XMLParser(no_network=True, resolve_entities=False)
+    return etree.XMLSchema(etree.parse(schema_path, parser))
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import random
+import threading
+from http import HTTPStatus
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+TAX_ID_PATH = '/taxonomy/rest/tax-id/'
+SCIENTIFIC_NAME_PATH = '/data/taxonomy/v1/taxon/scientific-name/'
+SYNTHETIC_NAME_PREFIX = 'Species '
+NO_RESULTS = 'No results.'
+NOT_NUMERIC = 'Taxon Id must be numeric.'
+
+Latency = Callable[[random.Random], float]
+Response = Tuple[int, Dict[str, str], bytes]
+
+
+def constant_latency(seconds: float) -> Latency:
+    return lambda rng: seconds
+
+
+def uniform_latency(low: float, high: float) -> Latency:
+    return lambda rng: rng.uniform(low, high)
+
+
+def lognormal_latency(median: float, sigma: float) -> Latency:
+    return lambda rng: median * rng.lognormvariate(0, sigma)
+
+
+class StubBehaviour:
+    def __init__(self, latency: Latency = None, error_rate: float = 0, throttle_rate: float = 0,
+                 retry_after: int = 1, validator_response: List[dict] = None, seed: int = None):
+        self.latency = latency if latency else constant_latency(0)
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.validator_response = validator_response if validator_response is not None else []
+        self.random = random.Random(seed)
+
+
+class StubServer:
+    def __init__(self, behaviour: StubBehaviour = None, taxa: Iterable[dict] = None, host: str = '127.0.0.1',
+                 port: int = 0):
+        self.behaviour = behaviour if behaviour else StubBehaviour()
+        self.taxa = list(taxa) if taxa is not None else None
+        self.host = host
+        self.port = port
+        self.status_counts: Dict[int, int] = {}
+        self.request_count = 0
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__server = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__started = threading.Event()
+        self.__writers = set()
+
+    @property
+    def url(self) -> str:
+        return f'http://{self.host}:{self.port}'
+
+    @property
+    def validator_url(self) -> str:
+        return f'{self.url}/validate'
+
+    def start(self) -> 'StubServer':
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+        self.__started.wait()
+        return self
+
+    def stop(self):
+        if self.__loop is not None:
+            asyncio.run_coroutine_threadsafe(self.__shutdown(), self.__loop).result()
+            self.__loop.call_soon_threadsafe(self.__loop.stop)
+            self.__thread.join()
+            self.__loop = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __run(self):
+        self.__loop = asyncio.new_event_loop()
+        self.__server = self.__loop.run_until_complete(asyncio.start_server(self.__handle, self.host, self.port))
+        self.port = self.__server.sockets[0].getsockname()[1]
+        self.__started.set()
+        try:
+            self.__loop.run_forever()
+        finally:
+            self.__loop.close()
+
+    async def __shutdown(self):
+        self.__server.close()
+        for writer in list(self.__writers):
+            writer.close()
+        handlers = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await asyncio.gather(*handlers, return_exceptions=True)
+        await self.__server.wait_closed()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.__writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = await self.__read_headers(reader)
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                status, response_headers, response_body = await self.__respond(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self.__write(writer, status, response_headers, response_body, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.__writers.discard(writer)
+            writer.close()
+
+    @staticmethod
+    async def __read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode('latin-1').strip()
+            if not line:
+                return headers
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def __respond(self, method: str, path: str, body: bytes) -> Response:
+        behaviour = self.behaviour
+        await asyncio.sleep(behaviour.latency(behaviour.random))
+        draw = behaviour.random.random()
+        if draw < behaviour.throttle_rate:
+            response = HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': str(behaviour.retry_after)}, b''
+        elif draw < behaviour.throttle_rate + behaviour.error_rate:
+            response = HTTPStatus.SERVICE_UNAVAILABLE, {}, b''
+        elif method == 'POST':
+            response = self.__validate(body)
+        elif method == 'GET' and TAX_ID_PATH in path:
+            response = self.__tax_id(unquote(path.split(TAX_ID_PATH, 1)[1]))
+        elif method == 'GET' and SCIENTIFIC_NAME_PATH in path:
+            response = self.__scientific_name(unquote(path.split(SCIENTIFIC_NAME_PATH, 1)[1]))
+        else:
+            response = HTTPStatus.NOT_FOUND, {}, b''
+        self.request_count += 1
+        status = int(response[0])
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        return response
+
+    def __validate(self, body: bytes) -> Response:
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {}, b''
+        if 'schema' not in payload or 'object' not in payload:
+            return HTTPStatus.BAD_REQUEST, {}, b''
+        return StubServer.__json(self.behaviour.validator_response)
+
+    def __tax_id(self, tax_id: str) -> Response:
+        if not tax_id.isdigit():
+            return HTTPStatus.BAD_REQUEST, {}, NOT_NUMERIC.encode()
+        taxon = self.__find_taxon('taxId', tax_id)
+        if taxon is None and self.taxa is None:
+            taxon = StubServer.__synthetic_taxon(tax_id)
+        if taxon is None:
+            return HTTPStatus.OK, {}, NO_RESULTS.encode()
+        return StubServer.__json(taxon)
+
+    def __scientific_name(self, scientific_name: str) -> Response:
+        taxon = self.__find_taxon('scientificName', scientific_name)
+        tax_id = scientific_name[len(SYNTHETIC_NAME_PREFIX):]
+        is_synthetic = scientific_name.startswith(SYNTHETIC_NAME_PREFIX) and tax_id.isdigit()
+        if taxon is None and self.taxa is None and is_synthetic:
+            taxon = StubServer.__synthetic_taxon(tax_id)
+        if taxon is None:
+            return HTTPStatus.OK, {}, NO_RESULTS.encode()
+        return StubServer.__json([taxon])
+
+    def __find_taxon(self, key: str, value: str) -> Optional[dict]:
+        for taxon in self.taxa or []:
+            if taxon[key] == value:
+                return taxon
+        return None
+
+    @staticmethod
+    def __synthetic_taxon(tax_id: str) -> dict:
+        return {'taxId': tax_id, 'scientificName': f'{SYNTHETIC_NAME_PREFIX}{tax_id}', 'submittable': 'true'}
+
+    @staticmethod
+    def __json(content) -> Response:
+        return HTTPStatus.OK, {'Content-Type': 'application/json'}, json.dumps(content).encode()
+
+    @staticmethod
+    def __write(writer: asyncio.StreamWriter, status: int, headers: Dict[str, str], body: bytes, keep_alive: bool):
+        lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}', f'Content-Length: {len(body)}',
+                 f'Connection: {"keep-alive" if keep_alive else "close"}']
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
@@ -0,0 +1,95 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+
+from botocore.exceptions import ClientError, EndpointConnectionError
+from botocore.response import StreamingBody
+
+from submission_validator.services.checksum import ChecksumCalculator
+
+
+class LocalS3:
+    def __init__(self, objects: dict):
+        self.objects = objects
+        self.ranges = []
+
+    def head_object(self, Bucket, Key):
+        return {'ContentLength': len(self.__get(Key))}
+
+    def get_object(self, Bucket, Key, Range):
+        content = self.__get(Key)
+        self.ranges.append(Range)
+        start, _, end = Range[len('bytes='):].partition('-')
+        body = content[int(start):int(end) + 1]
+        return {'Body': StreamingBody(io.BytesIO(body), len(body))}
+
+    def __get(self, key):
+        if key == 'unreachable':
+            raise EndpointConnectionError(endpoint_url='https://s3.example.org')
+        if key not in self.objects:
+            raise ClientError({'Error': {'Code': 'NoSuchKey', 'Message': 'Not Found'}}, 'GetObject')
+        return self.objects[key]
+
+
+class TestChecksumCalculator(unittest.TestCase):
+    def setUp(self):
+        self.content = os.urandom(10 * 1024)
+        self.expected_md5 = hashlib.md5(self.content).hexdigest()
+
+    def test_object_should_be_hashed_in_ranges(self):
+        # Given
+        s3 = LocalS3({'uuid/file.fastq.gz': self.content})
+        calculator = ChecksumCalculator(s3, 'bucket', chunk_size=1024, range_size=4096)
+
+        # When
+        checksum = calculator.md5_of_object('uuid/file.fastq.gz')
+
+        # Then
+        self.assertEqual(self.expected_md5, checksum)
+        self.assertListEqual(['bytes=0-4095', 'bytes=4096-8191', 'bytes=8192-10239'], s3.ranges)
+
+    def test_progress_should_be_reported_per_chunk(self):
+        # Given
+        progress = []
+        s3 = LocalS3({'file': self.content})
+        calculator = ChecksumCalculator(s3, 'bucket', chunk_size=4096, progress=lambda *args: progress.append(args))
+
+        # When
+        calculator.md5_of_object('file')
+
+        # Then
+        self.assertListEqual([('file', 4096, 10240), ('file', 8192, 10240), ('file', 10240, 10240)], progress)
+
+    def test_objects_should_be_hashed_in_parallel_with_missing_as_none(self):
+        # Given
+        empty_md5 = hashlib.md5(b'').hexdigest()
+        s3 = LocalS3({'first': self.content, 'empty': b''})
+        calculator = ChecksumCalculator(s3, 'bucket', max_workers=2)
+
+        # When
+        checksums = calculator.md5_of_objects(['first', 'empty', 'missing', 'unreachable'])
+
+        # Then
+        expected_checksums = {'first': self.expected_md5, 'empty': empty_md5, 'missing': None, 'unreachable': None}
+        self.assertDictEqual(expected_checksums, checksums)
+
+    def test_local_paths_should_be_hashed(self):
+        # Given
+        calculator = ChecksumCalculator(chunk_size=1000)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'file.cram')
+            with open(path, 'wb') as file:
+                file.write(self.content)
+            missing_path = os.path.join(folder, 'missing.cram')
+
+            # When
+            checksums = calculator.md5_of_paths([path, missing_path])
+
+        # Then
+        self.assertDictEqual({path: self.expected_md5, missing_path: None}, checksums)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.services.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN, OPEN, NOT_VALIDATED_KEY
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy
+from submission_validator.services.rate_limit import RateController
+from submission_validator.validation.json import JsonValidator, REQUEST_TIMEOUT
+from submission_validator.validation.reference import ReferenceValidator
+from tests.stub_server import StubBehaviour, StubServer
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker('backend', failure_threshold=2, reset_timeout=10)
+
+    def test_consecutive_failures_should_open_circuit(self):
+        # When
+        self.breaker.record_failure()
+        still_closed = self.breaker.state
+        self.breaker.record_failure()
+
+        # Then
+        self.assertEqual(CLOSED, still_closed)
+        self.assertEqual(OPEN, self.breaker.state)
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_should_reset_failures(self):
+        # When
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+
+        # Then
+        self.assertEqual(CLOSED, self.breaker.state)
+
+    @patch('submission_validator.services.circuit_breaker.time.monotonic')
+    def test_open_circuit_should_allow_single_probe_after_timeout(self, mock_monotonic):
+        # Given
+        mock_monotonic.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+
+        # When
+        mock_monotonic.return_value = 110
+        probe_allowed = self.breaker.allow()
+        second_allowed = self.breaker.allow()
+
+        # Then
+        self.assertTrue(probe_allowed)
+        self.assertFalse(second_allowed)
+        self.assertEqual(HALF_OPEN, self.breaker.state)
+
+    @patch('submission_validator.services.circuit_breaker.time.monotonic')
+    def test_failed_probe_should_reopen_circuit(self, mock_monotonic):
+        # Given
+        mock_monotonic.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        mock_monotonic.return_value = 110
+        self.breaker.allow()
+
+        # When
+        self.breaker.record_failure()
+
+        # Then
+        self.assertEqual(OPEN, self.breaker.state)
+        self.assertFalse(self.breaker.allow())
+
+    @patch('submission_validator.services.circuit_breaker.time.monotonic')
+    def test_unexpected_probe_error_should_not_block_later_probes(self, mock_monotonic):
+        # Given
+        mock_monotonic.return_value = 100
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        mock_monotonic.return_value = 110
+        session = MagicMock()
+        session.post.side_effect = RuntimeError('unexpected')
+        validator = JsonValidator('http://validator/validate', local_validation=False, breaker=self.breaker,
+                                  session=session)
+        validator.schema_by_type = {'study': {'type': 'object'}}
+        submission = Submission()
+        study = submission.map('study', 'study1', {'study_alias': 'study1'})
+
+        # When
+        with self.assertRaises(RuntimeError):
+            validator.validate_entity(study)
+        mock_monotonic.return_value = 120
+
+        # Then
+        self.assertEqual(OPEN, self.breaker.state)
+        self.assertTrue(self.breaker.allow())
+
+    def test_schema_service_call_should_time_out(self):
+        # Given
+        session = MagicMock()
+        session.post.return_value.ok = True
+        session.post.return_value.content = b'[]'
+        validator = JsonValidator('http://validator/validate', local_validation=False, session=session)
+        validator.schema_by_type = {'study': {'type': 'object'}}
+        submission = Submission()
+        study = submission.map('study', 'study1', {'study_alias': 'study1'})
+
+        # When
+        validator.validate_entity(study)
+
+        # Then
+        self.assertFalse(study.has_errors())
+        self.assertEqual(REQUEST_TIMEOUT, session.post.call_args.kwargs['timeout'])
+
+
+class TestCircuitBreakerWithStubServer(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.behaviour = StubBehaviour(error_rate=1)
+        self.server = StubServer(self.behaviour).start()
+        self.addCleanup(self.server.stop)
+
+    def test_schema_service_outage_should_fail_fast_and_recover(self):
+        # Given
+        breaker = CircuitBreaker('validator', failure_threshold=2, reset_timeout=0.05)
+        validator = JsonValidator(self.server.validator_url, local_validation=False, breaker=breaker)
+        validator.schema_by_type = {'study': {'type': 'object'}}
+        submission = Submission()
+        for index in range(5):
+            submission.map('study', f'study{index}', {'study_alias': f'study{index}'})
+
+        # When
+        validator.validate_data(submission)
+        requests_during_outage = self.server.request_count
+        self.behaviour.error_rate = 0
+        with patch('submission_validator.services.circuit_breaker.time.monotonic', return_value=1e9):
+            recovered = submission.map('study', 'study5', {'study_alias': 'study5'})
+            validator.validate_entity(recovered)
+
+        # Then
+        self.assertEqual(2, requests_during_outage)
+        self.assertEqual(CLOSED, breaker.state)
+        self.assertFalse(recovered.has_errors())
+        self.assertDictEqual(
+            {NOT_VALIDATED_KEY: [JsonValidator.format_not_validated_error('study')]},
+            submission.get_entity('study', 'study4').get_errors())
+
+    def test_other_validators_should_keep_running_during_outage(self):
+        # Given
+        validators = [
+            JsonValidator(self.server.validator_url, local_validation=False),
+            ReferenceValidator()
+        ]
+        validators[0].schema_by_type = {'run_experiment': {'type': 'object'}}
+        submission = Submission()
+        submission.map('run_experiment', 'run1', {'sample_ref': 'missing'})
+
+        # When
+        for validator in validators:
+            validator.validate_data(submission)
+
+        # Then
+        errors = submission.get_entity('run_experiment', 'run1').get_errors()
+        self.assertIn(NOT_VALIDATED_KEY, errors)
+        self.assertIn('sample_ref', errors)
+
+    def test_ena_outage_should_stop_calls_once_open(self):
+        # Given
+        breaker = CircuitBreaker('ena', failure_threshold=2, reset_timeout=60)
+        ena_taxonomy = EnaTaxonomy(self.server.url, controller=RateController(), latency_budget=0,
+                                   local_taxonomy=LocalTaxonomy([]), breaker=breaker)
+
+        # When
+        responses = [ena_taxonomy.validate_tax_id(str(tax_id)) for tax_id in range(5000, 5005)]
+
+        # Then
+        self.assertEqual(OPEN, breaker.state)
+        self.assertEqual(2, self.server.request_count)
+        self.assertDictEqual(EnaTaxonomy.format_unavailable_error('tax_id', '5004'), responses[-1])
+
+    def test_ena_outage_should_not_report_inconsistent_taxonomy(self):
+        # Given
+        breaker = CircuitBreaker('ena', failure_threshold=1, reset_timeout=60)
+        ena_taxonomy = EnaTaxonomy(self.server.url, controller=RateController(), latency_budget=0,
+                                   local_taxonomy=LocalTaxonomy([]), breaker=breaker)
+
+        # When
+        response = ena_taxonomy.validate_taxonomy('Homo sapiens', '9606')
+
+        # Then
+        self.assertEqual(OPEN, breaker.state)
+        self.assertNotIn('error', response)
+        self.assertDictEqual(EnaTaxonomy.format_unavailable_error('scientific_name', 'Homo sapiens'),
+                             response['scientific_name'])
+        self.assertDictEqual(EnaTaxonomy.format_unavailable_error('tax_id', '9606'), response['tax_id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
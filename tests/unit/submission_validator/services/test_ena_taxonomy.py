@@ -1,14 +1,18 @@
+import json
 import unittest
 from http import HTTPStatus
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, mock_open
 
-from submission_validator.services.ena_taxonomy import EnaTaxonomy
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy, SHARED_CONTROLLER
+from submission_validator.services.rate_limit import RateController
+
+NO_LOCAL_TAXONOMY = LocalTaxonomy([], check_format=False)
 
 
 class TestEnaTaxonomy(unittest.TestCase):
     def setUp(self):
         self.maxDiff = None
-        self.ena_taxonomy = EnaTaxonomy(ena_url='')
+        self.ena_taxonomy = EnaTaxonomy(ena_url='', controller=RateController(), local_taxonomy=NO_LOCAL_TAXONOMY)
 
     @staticmethod
     def expected_error(key, value, details='') -> str:
@@ -59,7 +63,7 @@ class TestEnaTaxonomy(unittest.TestCase):
         expected_error = self.expected_error('tax_id', valid_tax_id, 'It is not submittable.')
 
         mock_get.return_value.status_code = HTTPStatus(200)
-        mock_get.return_value.json.return_value = results_message
+        mock_get.return_value.content = json.dumps(results_message)
 
         result = self.ena_taxonomy.validate_tax_id(valid_tax_id)
         self.assertIn('error', result)
@@ -82,7 +86,7 @@ class TestEnaTaxonomy(unittest.TestCase):
         }
 
         mock_get.return_value.status_code = HTTPStatus(200)
-        mock_get.return_value.json.return_value = results_message
+        mock_get.return_value.content = json.dumps(results_message)
 
         result = self.ena_taxonomy.validate_tax_id(valid_tax_id)
         self.assertNotIn('error', result)
@@ -133,7 +137,7 @@ class TestEnaTaxonomy(unittest.TestCase):
         expected_error = self.expected_error('scientific_name', valid_scientific_name, 'It is not submittable.')
 
         mock_get.return_value.status_code = HTTPStatus(200)
-        mock_get.return_value.json.return_value = results_message
+        mock_get.return_value.content = json.dumps(results_message)
 
         error_result = self.ena_taxonomy.validate_scientific_name(valid_scientific_name)
         self.assertIn('error', error_result)
@@ -158,7 +162,7 @@ class TestEnaTaxonomy(unittest.TestCase):
         ]
 
         mock_get.return_value.status_code = HTTPStatus(200)
-        mock_get.return_value.json.return_value = results_message
+        mock_get.return_value.content = json.dumps(results_message)
 
         result = self.ena_taxonomy.validate_scientific_name(valid_scientific_name)
         self.assertNotIn('error', result)
@@ -204,6 +208,180 @@ class TestEnaTaxonomy(unittest.TestCase):
         self.assertIn('error', error_result)
         self.assertEqual(expected_error_message, error_result['error'])
 
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_cached_response_should_not_call_ena(self, mock_get):
+        # Given
+        cached_response = {'taxId': '9606', 'scientificName': 'Homo sapiens'}
+        cache = MagicMock()
+        cache.get.return_value = cached_response
+        ena_taxonomy = EnaTaxonomy(ena_url='', cache=cache, controller=RateController(),
+                                   local_taxonomy=NO_LOCAL_TAXONOMY)
+
+        # When
+        result = ena_taxonomy.validate_tax_id('9606')
+
+        # Then
+        self.assertDictEqual(cached_response, result)
+        cache.get.assert_called_once_with('/taxonomy/rest/tax-id/9606')
+        mock_get.assert_not_called()
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_negative_response_should_be_cached(self, mock_get):
+        # Given
+        invalid_tax_id = '999999999999'
+        cache = MagicMock()
+        cache.get.return_value = None
+        ena_taxonomy = EnaTaxonomy(ena_url='', cache=cache, controller=RateController(),
+                                   local_taxonomy=NO_LOCAL_TAXONOMY)
+        mock_get.return_value.status_code = HTTPStatus(200)
+        mock_get.return_value.text = 'No results.'
+
+        # When
+        result = ena_taxonomy.validate_tax_id(invalid_tax_id)
+
+        # Then
+        cache.set.assert_called_once_with(f'/taxonomy/rest/tax-id/{invalid_tax_id}', result)
+        self.assertEqual(self.expected_error('tax_id', invalid_tax_id), result['error'])
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_unavailable_response_should_not_be_cached(self, mock_get):
+        # Given
+        cache = MagicMock()
+        cache.get.return_value = None
+        ena_taxonomy = EnaTaxonomy(ena_url='', cache=cache, controller=RateController(), latency_budget=0,
+                                   local_taxonomy=NO_LOCAL_TAXONOMY)
+        mock_get.return_value.status_code = HTTPStatus(503)
+        mock_get.return_value.text = 'Service Unavailable'
+
+        # When
+        ena_taxonomy.validate_tax_id('9606')
+
+        # Then
+        cache.set.assert_not_called()
+
+    @patch('submission_validator.services.ena_taxonomy.time.sleep')
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_transient_failure_should_be_retried(self, mock_get, mock_sleep):
+        # Given
+        valid_tax_id = '9606'
+        throttled = MagicMock(status_code=HTTPStatus(429), headers={'Retry-After': '2'})
+        found = MagicMock(status_code=HTTPStatus(200), text='')
+        found.content = json.dumps({'taxId': valid_tax_id, 'submittable': 'true'})
+        mock_get.side_effect = [throttled, found]
+
+        # When
+        result = self.ena_taxonomy.validate_tax_id(valid_tax_id)
+
+        # Then
+        self.assertNotIn('error', result)
+        self.assertEqual(2, mock_get.call_count)
+        mock_sleep.assert_called_once_with(2.0)
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_transient_failure_outside_budget_should_not_return_invalid_error(self, mock_get):
+        # Given
+        ena_taxonomy = EnaTaxonomy(ena_url='', controller=RateController(), latency_budget=0,
+                                   local_taxonomy=NO_LOCAL_TAXONOMY)
+        mock_get.return_value.status_code = HTTPStatus(503)
+        mock_get.return_value.text = 'Service Unavailable'
+
+        # When
+        result = ena_taxonomy.validate_tax_id('9606')
+
+        # Then
+        self.assertEqual(
+            'Could not validate tax_id: 9606. ENA taxonomy service is unavailable, please retry later.',
+            result['error'])
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_overload_should_not_limit_instances_with_their_own_controller(self, mock_get):
+        # Given
+        overloaded = EnaTaxonomy(ena_url='', controller=RateController(), latency_budget=0)
+        other = EnaTaxonomy(ena_url='', controller=RateController())
+        initial_limit = other.controller.concurrency.limit
+        mock_get.return_value.status_code = HTTPStatus(503)
+        mock_get.return_value.text = 'Service Unavailable'
+
+        # When
+        overloaded.validate_tax_id('5678')
+
+        # Then
+        self.assertLess(overloaded.controller.concurrency.limit, initial_limit)
+        self.assertEqual(initial_limit, other.controller.concurrency.limit)
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_malformed_response_should_not_be_cached(self, mock_get):
+        # Given
+        cache = MagicMock()
+        cache.get.return_value = None
+        ena_taxonomy = EnaTaxonomy(ena_url='', cache=cache, controller=RateController(),
+                                   local_taxonomy=NO_LOCAL_TAXONOMY)
+        mock_get.return_value.status_code = HTTPStatus(200)
+        mock_get.return_value.text = '{"taxId": '
+        mock_get.return_value.content = b'{"taxId": '
+
+        # When
+        result = ena_taxonomy.validate_tax_id('5678')
+
+        # Then
+        self.assertDictEqual(EnaTaxonomy.format_unavailable_error('tax_id', '5678'), result)
+        self.assertEqual(1, ena_taxonomy.breaker.failures)
+        cache.set.assert_not_called()
+
+    def test_default_instances_should_share_process_controller(self):
+        # When
+        first = EnaTaxonomy()
+        second = EnaTaxonomy(cache=MagicMock())
+
+        # Then
+        self.assertIs(SHARED_CONTROLLER, first.controller)
+        self.assertIs(SHARED_CONTROLLER, second.controller)
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_malformed_values_should_not_call_ena(self, mock_get):
+        # Given
+        ena_taxonomy = EnaTaxonomy(ena_url='')
+
+        # When
+        tax_id_results = [ena_taxonomy.validate_tax_id(tax_id) for tax_id in ['', 'NOT_NUMERIC_TAX_ID', '12.5']]
+        name_results = [ena_taxonomy.validate_scientific_name(name) for name in ['', '  ', '?']]
+
+        # Then
+        mock_get.assert_not_called()
+        self.assertEqual(6, ena_taxonomy.avoided_calls)
+        self.assertEqual(self.expected_error('tax_id', 'NOT_NUMERIC_TAX_ID', 'Taxon Id must be numeric.'),
+                         tax_id_results[1]['error'])
+        self.assertEqual(self.expected_error('scientific_name', '?'), name_results[2]['error'])
+
+    @patch('submission_validator.services.ena_taxonomy.requests.get')
+    def test_known_taxa_should_not_call_ena(self, mock_get):
+        # Given
+        ena_taxonomy = EnaTaxonomy(ena_url='')
+
+        # When
+        human = ena_taxonomy.validate_taxonomy('Homo sapiens', '9606')
+        not_submittable = ena_taxonomy.validate_scientific_name('Nitrospira')
+
+        # Then
+        mock_get.assert_not_called()
+        self.assertNotIn('error', human)
+        self.assertEqual(self.expected_error('scientific_name', 'Nitrospira', 'It is not submittable.'),
+                         not_submittable['error'])
+        self.assertEqual(3, ena_taxonomy.avoided_calls)
+
+    def test_local_taxonomy_should_load_snapshot(self):
+        # Given
+        snapshot = [{'taxId': '5678', 'scientificName': 'Leishmania naiffi', 'submittable': 'true'}]
+        with patch('builtins.open', mock_open(read_data=json.dumps(snapshot))):
+            local_taxonomy = LocalTaxonomy.from_snapshot('snapshot.json')
+
+        # When
+        result = local_taxonomy.validate('tax_id', '5678')
+
+        # Then
+        self.assertDictEqual(snapshot[0], result)
+        self.assertIsNone(local_taxonomy.validate('tax_id', '9606'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+import unittest
+
+from submission_validator.services.lazy_import import LazyModule, lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+    def test_already_imported_module_should_be_returned(self):
+        self.assertIs(sys.modules['unittest'], lazy_import('unittest'))
+
+    def test_module_should_be_imported_on_attribute_access(self):
+        # Given
+        module = LazyModule('submission_validator.services.serializer')
+
+        # When
+        serializer = module.get_serializer('json')
+
+        # Then
+        self.assertEqual('json', serializer.name)
+
+    def test_validators_should_not_import_heavy_dependencies(self):
+        # Given
+        script = (
+            'import sys\n'
+            'import submission_validator.validation.taxonomy\n'
+            'import submission_validator.validation.upload\n'
+            'import submission_validator.validation.docker\n'
+            'print(",".join(m for m in ("requests", "boto3", "botocore", "docker") if m in sys.modules))'
+        )
+
+        # When
+        result = subprocess.run([sys.executable, '-c', script], capture_output=True, text=True, check=True)
+
+        # Then
+        self.assertEqual('', result.stdout.strip())
+
+
+if __name__ == '__main__':
+    unittest.main()
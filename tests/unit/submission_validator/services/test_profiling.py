@@ -0,0 +1,127 @@
+import os
+import pstats
+import tempfile
+import time
+import unittest
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.checksum import ChecksumCalculator
+from submission_validator.services.profiling import ValidationProfiler, external_call
+
+
+class SlowValidator(BaseValidator):
+    def validate_entity(self, entity: Entity):
+        with external_call('ena_taxonomy'):
+            time.sleep(entity.attributes['delay'])
+
+
+class ChecksumValidator(BaseValidator):
+    independent_entities = True
+
+    def __init__(self, folder: str):
+        self.calculator = ChecksumCalculator()
+        self.folder = folder
+
+    def validate_data(self, data: Submission):
+        self.validate_entities(data.get_entities('sample'))
+
+    def validate_entities(self, entities, context=None):
+        self.calculator.md5_of_paths([os.path.join(self.folder, 'reads.fastq') for _ in entities])
+
+
+def build_submission(entity_count: int, delays: list = None) -> Submission:
+    submission = Submission()
+    for index in range(entity_count):
+        delay = delays[index] if delays else 0.002 * (index + 1)
+        submission.map('sample', f'sample{index}', {'delay': delay})
+    return submission
+
+
+class TestValidationProfiler(unittest.TestCase):
+    def test_slowest_entities_should_be_kept_with_their_spans(self):
+        # Given
+        profiler = ValidationProfiler(top_n=2)
+        validator = profiler.wrap(SlowValidator())
+
+        # When
+        validator.validate_data(build_submission(10, [0.001] * 8 + [0.05, 0.1]))
+
+        # Then
+        slowest = profiler.slowest()
+        self.assertEqual(10, profiler.profiled_entities)
+        self.assertListEqual(['sample9', 'sample8'], [profile.index for profile in slowest])
+        self.assertEqual(1, slowest[0].spans['ena_taxonomy'][0])
+        self.assertGreaterEqual(slowest[0].wall_time, slowest[0].spans['ena_taxonomy'][1])
+
+    def test_sampling_should_skip_entities(self):
+        # Given
+        profiler = ValidationProfiler(sample_rate=0)
+        validator = profiler.wrap(SlowValidator())
+
+        # When
+        validator.validate_data(build_submission(10))
+
+        # Then
+        self.assertEqual(0, profiler.profiled_entities)
+        self.assertListEqual([], profiler.slowest())
+
+    def test_wrapping_should_leave_validator_unchanged(self):
+        # Given
+        profiler = ValidationProfiler()
+        validator = SlowValidator()
+        profiler.wrap(validator).validate_data(build_submission(3))
+
+        # When
+        validator.validate_data(build_submission(3))
+
+        # Then
+        self.assertEqual(3, profiler.profiled_entities)
+        self.assertDictEqual({}, vars(validator))
+
+    def test_chunked_validators_should_be_profiled_per_entity(self):
+        # Given
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        with open(os.path.join(folder.name, 'reads.fastq'), 'wb') as reads_file:
+            reads_file.write(b'ACGT')
+        profiler = ValidationProfiler()
+        validator = profiler.wrap(ChecksumValidator(folder.name))
+
+        # When
+        validator.validate_data(build_submission(3))
+
+        # Then
+        self.assertEqual(3, profiler.profiled_entities)
+        self.assertListEqual(
+            ['ChecksumValidator;sample', 'ChecksumValidator;sample;local_checksum'], sorted(profiler.stacks))
+
+    def test_external_call_without_profiler_should_not_record(self):
+        with external_call('ena_taxonomy'):
+            pass
+
+    def test_profiles_should_be_dumped(self):
+        # Given
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        profiler = ValidationProfiler(cprofile=True)
+        validator = profiler.wrap(SlowValidator())
+        validator.validate_data(build_submission(3))
+        collapsed_path = os.path.join(folder.name, 'validation.folded')
+        stats_path = os.path.join(folder.name, 'validation.prof')
+
+        # When
+        profiler.dump_collapsed(collapsed_path)
+        profiler.dump_stats(stats_path)
+
+        # Then
+        with open(collapsed_path, encoding='utf-8') as collapsed_file:
+            stacks = [line.rsplit(' ', 1)[0] for line in collapsed_file]
+        self.assertListEqual(['SlowValidator;sample', 'SlowValidator;sample;ena_taxonomy'], stacks)
+        self.assertGreater(pstats.Stats(stats_path).total_calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from submission_validator.services.rate_limit import AdaptiveConcurrency, RateController, TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    @patch('submission_validator.services.rate_limit.time.sleep')
+    def test_burst_should_not_wait_and_excess_should_wait(self, mock_sleep):
+        # Given
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        # When
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+
+        # Then
+        waited = mock_sleep.call_args[0][0]
+        self.assertAlmostEqual(0.1, waited, places=2)
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+    def test_success_should_increase_limit_additively(self):
+        # Given
+        concurrency = AdaptiveConcurrency(initial_limit=4, max_limit=5)
+
+        # When
+        for _ in range(4):
+            concurrency.on_success()
+
+        # Then
+        self.assertGreater(concurrency.limit, 4.9)
+        for _ in range(100):
+            concurrency.on_success()
+        self.assertEqual(5, concurrency.limit)
+
+    def test_overload_should_decrease_limit_multiplicatively(self):
+        # Given
+        concurrency = AdaptiveConcurrency(initial_limit=8, min_limit=1)
+
+        # When
+        concurrency.on_overload()
+        concurrency.on_overload()
+
+        # Then
+        self.assertEqual(2, concurrency.limit)
+        for _ in range(10):
+            concurrency.on_overload()
+        self.assertEqual(1, concurrency.limit)
+
+    def test_in_flight_requests_should_not_exceed_limit(self):
+        # Given
+        controller = RateController(TokenBucket(rate=1000, capacity=1000), AdaptiveConcurrency(initial_limit=2))
+        in_flight = []
+        lock = threading.Lock()
+        counter = [0]
+
+        def request():
+            with controller.slot():
+                with lock:
+                    counter[0] += 1
+                    in_flight.append(counter[0])
+                time.sleep(0.01)
+                with lock:
+                    counter[0] -= 1
+
+        # When
+        threads = [threading.Thread(target=request) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Then
+        self.assertLessEqual(max(in_flight), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from submission_validator.services.result_store import DiskResultStore, MemoryResultStore
+
+ERRORS = {'sample': {'sample1': {'tax_id': ['Not valid tax_id: 1.']}}}
+
+
+class ResultStoreTests:
+    def create_store(self, max_entries: int, ttl: float):
+        raise NotImplementedError
+
+    def test_stored_results_should_be_returned(self):
+        # Given
+        store = self.create_store(2, 60)
+
+        # When
+        store.set('fingerprint', ERRORS)
+
+        # Then
+        self.assertDictEqual(ERRORS, store.get('fingerprint'))
+        self.assertIsNone(store.get('other'))
+
+    def test_least_recently_used_result_should_be_evicted(self):
+        # Given
+        store = self.create_store(2, 60)
+        store.set('first', ERRORS)
+        store.set('second', ERRORS)
+        store.get('first')
+
+        # When
+        store.set('third', ERRORS)
+
+        # Then
+        self.assertIsNotNone(store.get('first'))
+        self.assertIsNone(store.get('second'))
+        self.assertEqual(2, len(store))
+
+    def test_expired_results_should_not_be_returned(self):
+        # Given
+        store = self.create_store(2, 60)
+        with patch('submission_validator.services.result_store.time.time') as mock_time:
+            mock_time.return_value = 1000
+            store.set('fingerprint', ERRORS)
+
+            # When
+            mock_time.return_value = 1061
+            result = store.get('fingerprint')
+
+        # Then
+        self.assertIsNone(result)
+        self.assertEqual(0, len(store))
+
+
+class TestMemoryResultStore(ResultStoreTests, unittest.TestCase):
+    def create_store(self, max_entries: int, ttl: float):
+        return MemoryResultStore(max_entries, ttl)
+
+
+class TestDiskResultStore(ResultStoreTests, unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def create_store(self, max_entries: int, ttl: float):
+        return DiskResultStore(self.folder.name, max_entries, ttl)
+
+    def test_results_should_be_shared_between_instances(self):
+        # Given
+        self.create_store(2, 60).set('fingerprint', ERRORS)
+
+        # When
+        result = self.create_store(2, 60).get('fingerprint')
+
+        # Then
+        self.assertDictEqual(ERRORS, result)
+
+    def test_result_evicted_while_reading_should_be_a_miss(self):
+        # Given
+        store = self.create_store(2, 60)
+        store.set('fingerprint', ERRORS)
+
+        # When
+        with patch('submission_validator.services.result_store.os.utime', side_effect=FileNotFoundError):
+            result = store.get('fingerprint')
+
+        # Then
+        self.assertIsNone(result)
+
+
+if __name__ == '__main__':
+    unittest.main()
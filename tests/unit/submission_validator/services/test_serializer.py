@@ -0,0 +1,43 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from submission_validator.services import serializer
+from submission_validator.services.serializer import OrjsonSerializer, StdlibSerializer, get_serializer
+
+
+class TestSerializer(unittest.TestCase):
+    def setUp(self):
+        self.payload = {'schema': {'required': ['tax_id']}, 'object': {'tax_id': '9606', 'name': 'Ünïcode'}}
+
+    def test_stdlib_serializer_should_round_trip_to_bytes(self):
+        self.assert_round_trip(StdlibSerializer)
+
+    @unittest.skipIf(serializer.orjson is None, 'orjson is not installed')
+    def test_orjson_serializer_should_round_trip_to_bytes(self):
+        self.assert_round_trip(OrjsonSerializer)
+
+    def assert_round_trip(self, json_serializer):
+        # When
+        encoded = json_serializer.dumps(self.payload)
+
+        # Then
+        self.assertIsInstance(encoded, bytes)
+        self.assertDictEqual(self.payload, json_serializer.loads(encoded))
+        self.assertDictEqual(self.payload, json.loads(encoded))
+
+    @unittest.skipIf(serializer.orjson is None, 'orjson is not installed')
+    def test_default_serializer_should_be_orjson_when_installed(self):
+        self.assertIs(OrjsonSerializer, get_serializer())
+        self.assertIs(StdlibSerializer, get_serializer('json'))
+
+    @patch.object(serializer, 'orjson', None)
+    def test_default_serializer_should_fall_back_to_stdlib(self):
+        # Then
+        self.assertIs(StdlibSerializer, get_serializer())
+        with self.assertRaises(ImportError):
+            get_serializer('orjson')
+
+
+if __name__ == '__main__':
+    unittest.main()
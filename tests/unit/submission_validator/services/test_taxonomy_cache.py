@@ -0,0 +1,127 @@
+import gc
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from submission_validator.services.taxonomy_cache import SqliteTaxonomyCache
+
+
+def write_entries(path: str, worker: int):
+    cache = SqliteTaxonomyCache(path)
+    for number in range(50):
+        cache.set(f'{worker}/{number}', {'taxId': str(number)})
+        cache.get(f'{(worker + 1) % 4}/{number}')
+    cache.close()
+
+
+class TestSqliteTaxonomyCache(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'taxonomy.sqlite')
+        self.cache = SqliteTaxonomyCache(self.path, ttl=60)
+
+    def tearDown(self):
+        self.cache.close()
+        self.folder.cleanup()
+
+    def test_missing_key_should_return_none(self):
+        self.assertIsNone(self.cache.get('url/9606'))
+
+    def test_stored_responses_should_be_shared_between_instances(self):
+        # Given
+        positive = {'taxId': '9606', 'scientificName': 'Homo sapiens'}
+        negative = {'error': 'Not valid tax_id: 999999999999.'}
+
+        # When
+        self.cache.set('url/9606', positive)
+        self.cache.set('url/999999999999', negative)
+        other_cache = SqliteTaxonomyCache(self.path)
+
+        # Then
+        self.assertDictEqual(positive, other_cache.get('url/9606'))
+        self.assertDictEqual(negative, other_cache.get('url/999999999999'))
+        other_cache.close()
+
+    @patch('submission_validator.services.taxonomy_cache.time.time')
+    def test_expired_responses_should_not_be_returned(self, mock_time):
+        # Given
+        mock_time.return_value = 1000
+        self.cache.set('url/9606', {'taxId': '9606'})
+
+        # When
+        mock_time.return_value = 1061
+        cached = self.cache.get('url/9606')
+        self.cache.purge_expired()
+        mock_time.return_value = 1000
+
+        # Then
+        self.assertIsNone(cached)
+        self.assertIsNone(self.cache.get('url/9606'))
+
+    def test_concurrent_processes_should_read_and_write(self):
+        # When
+        # Forking while other tests' threads hold locks can deadlock the workers
+        with multiprocessing.get_context('spawn').Pool(4) as pool:
+            pool.starmap(write_entries, [(self.path, worker) for worker in range(4)])
+
+        # Then
+        for worker in range(4):
+            self.assertDictEqual({'taxId': '49'}, self.cache.get(f'{worker}/49'))
+
+    def test_close_should_close_connections_of_all_threads(self):
+        # Given
+        connections = []
+        sqlite_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            connections.append(sqlite_connect(*args, **kwargs))
+            return connections[-1]
+        barrier = threading.Barrier(4)
+
+        def set_entry(number: int):
+            barrier.wait()
+            self.cache.set(f'url/{number}', {'taxId': str(number)})
+        with patch('submission_validator.services.taxonomy_cache.sqlite3.connect', side_effect=connect):
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(set_entry, range(4)))
+
+        # When
+        self.cache.close()
+
+        # Then
+        self.assertEqual(4, len(connections))
+        for connection in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute('SELECT 1')
+        self.assertDictEqual({'taxId': '3'}, self.cache.get('url/3'))
+
+    def test_connection_should_be_closed_when_its_thread_exits(self):
+        # Given
+        connections = []
+        sqlite_connect = sqlite3.connect
+
+        def connect(*args, **kwargs):
+            connections.append(sqlite_connect(*args, **kwargs))
+            return connections[-1]
+        thread = threading.Thread(target=self.cache.set, args=('url/1', {'taxId': '1'}))
+
+        # When
+        with patch('submission_validator.services.taxonomy_cache.sqlite3.connect', side_effect=connect):
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        # Then
+        self.assertEqual(1, len(connections))
+        with self.assertRaises(sqlite3.ProgrammingError):
+            connections[0].execute('SELECT 1')
+        self.assertDictEqual({'taxId': '1'}, self.cache.get('url/1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
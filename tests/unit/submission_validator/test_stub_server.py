@@ -0,0 +1,83 @@
+import unittest
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy
+from submission_validator.services.rate_limit import RateController
+from submission_validator.validation.json import JsonValidator
+from tests.stub_server import StubBehaviour, StubServer, constant_latency
+
+
+class TestStubServer(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.local_taxonomy = LocalTaxonomy([])
+
+    def test_taxonomy_should_be_served_for_synthetic_taxa(self):
+        # Given
+        with StubServer() as server:
+            ena_taxonomy = EnaTaxonomy(server.url, controller=RateController(), local_taxonomy=self.local_taxonomy)
+
+            # When
+            response = ena_taxonomy.validate_taxonomy('Species 5678', '5678')
+
+        # Then
+        self.assertNotIn('error', response)
+        self.assertEqual('Species 5678', response['tax_id']['scientificName'])
+        self.assertEqual(2, server.request_count)
+
+    def test_unknown_scientific_name_should_not_be_valid(self):
+        # Given
+        with StubServer() as server:
+            ena_taxonomy = EnaTaxonomy(server.url, controller=RateController(), local_taxonomy=self.local_taxonomy)
+
+            # When
+            response = ena_taxonomy.validate_scientific_name('Unknown species')
+
+        # Then
+        self.assertDictEqual({'error': 'Not valid scientific_name: Unknown species.'}, response)
+
+    def test_unknown_tax_id_should_match_ena_no_results_response(self):
+        # Given
+        with StubServer(taxa=[]) as server:
+            ena_taxonomy = EnaTaxonomy(server.url, controller=RateController(), local_taxonomy=self.local_taxonomy)
+
+            # When
+            response = ena_taxonomy.validate_tax_id('5678')
+
+        # Then
+        self.assertDictEqual({'error': 'Not valid tax_id: 5678.'}, response)
+        self.assertEqual({200: 1}, server.status_counts)
+
+    def test_throttled_requests_should_report_unavailable_service(self):
+        # Given
+        behaviour = StubBehaviour(latency=constant_latency(0.001), throttle_rate=1, retry_after=0)
+        with StubServer(behaviour) as server:
+            ena_taxonomy = EnaTaxonomy(server.url, controller=RateController(), latency_budget=0,
+                                       local_taxonomy=self.local_taxonomy)
+
+            # When
+            response = ena_taxonomy.validate_tax_id('5678')
+
+        # Then
+        self.assertDictEqual(EnaTaxonomy.format_unavailable_error('tax_id', '5678'), response)
+        self.assertEqual({429: 1}, server.status_counts)
+
+    def test_validator_contract_should_return_configured_errors(self):
+        # Given
+        validator_response = [{'dataPath': '.release_date', 'errors': ["should have required property 'release_date'"]}]
+        submission = Submission()
+        entity = submission.map('study', 'study1', {'study_alias': 'study1'})
+        with StubServer(StubBehaviour(validator_response=validator_response)) as server:
+            validator = JsonValidator(server.validator_url, local_validation=False)
+            validator.schema_by_type = {'study': {'type': 'object'}}
+
+            # When
+            validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({'release_date': ["should have required property 'release_date'"]}, entity.get_errors())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import patch, MagicMock
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy
+from submission_validator.validation.json import JsonValidator
+from submission_validator.validation.result_cache import CachingValidator
+from submission_validator.validation.upload import UploadValidator
+
+MISSING_ALIAS = "should have required property 'sample_alias'"
+
+
+class CountingValidator(BaseValidator):
+    entity_types = ['sample']
+
+    def __init__(self, error: str = MISSING_ALIAS, schema_version: int = 1):
+        self.error = error
+        self.schema_version = schema_version
+        self.calls = 0
+
+    def cache_config(self) -> dict:
+        return {'schema_version': self.schema_version}
+
+    def validate_entity(self, entity: Entity):
+        self.calls += 1
+        if entity.identifier.entity_type == 'sample' and 'sample_alias' not in entity.attributes:
+            entity.add_error('sample_alias', self.error)
+
+
+def build_submission(tax_id: str = '9606') -> Submission:
+    submission = Submission()
+    submission.map('study', 'study1', {'study_alias': 'study1'})
+    submission.map('sample', 'sample1', {'tax_id': tax_id})
+    submission.map('sample', 'sample2', {'tax_id': tax_id, 'sample_alias': 'alias2'})
+    return submission
+
+
+class TestCachingValidator(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.validator = CountingValidator()
+        self.caching_validator = CachingValidator([self.validator])
+        self.caching_validator.validate_data(build_submission())
+
+    def test_cache_hit_should_restore_errors_without_validating(self):
+        # Given
+        submission = build_submission()
+
+        # When
+        self.caching_validator.validate_data(submission)
+
+        # Then
+        self.assertEqual(3, self.validator.calls)
+        self.assertEqual(1, self.caching_validator.hits)
+        self.assertDictEqual({'sample': {'sample1': {'sample_alias': [MISSING_ALIAS]}}}, submission.get_all_errors())
+
+    def test_changed_entity_should_be_validated_again(self):
+        # When
+        self.caching_validator.validate_data(build_submission('10090'))
+
+        # Then
+        self.assertEqual(6, self.validator.calls)
+        self.assertEqual(2, self.caching_validator.misses)
+
+    def test_changed_validator_config_should_be_validated_again(self):
+        # Given
+        self.validator.schema_version = 2
+
+        # When
+        self.caching_validator.validate_data(build_submission())
+
+        # Then
+        self.assertEqual(6, self.validator.calls)
+
+    def test_changed_links_should_be_validated_again(self):
+        # Given
+        submission = build_submission()
+        submission.get_entity('sample', 'sample1').add_link('study', 'study1')
+
+        # When
+        self.caching_validator.validate_data(submission)
+
+        # Then
+        self.assertEqual(6, self.validator.calls)
+
+    def test_unavailable_service_results_should_not_be_cached(self):
+        # Given
+        unavailable_error = EnaTaxonomy.format_unavailable_error('tax_id', '9606')['error']
+        validator = CountingValidator(unavailable_error)
+        caching_validator = CachingValidator([validator])
+
+        # When
+        caching_validator.validate_data(build_submission())
+        caching_validator.validate_data(build_submission())
+
+        # Then
+        self.assertEqual(6, validator.calls)
+        self.assertEqual(0, caching_validator.hits)
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_cache_hit_should_restore_filled_attributes(self, mock: MagicMock):
+        # Given
+        mock.return_value = 'run1.fastq,checksum1\nrun2.fastq,checksum2'
+        caching_validator = CachingValidator([UploadValidator('uuid')])
+
+        def build_runs() -> Submission:
+            runs = Submission()
+            runs.map('run_experiment', 'run1', {'uploaded_file_1': 'run1.fastq'})
+            runs.map('run_experiment', 'run2', {'uploaded_file_1': 'run2.fastq', 'uploaded_file_1_checksum': 'wrong'})
+            return runs
+        validated = build_runs()
+        caching_validator.validate_data(validated)
+
+        # When
+        restored = build_runs()
+        caching_validator.validate_data(restored)
+
+        # Then
+        self.assertEqual(1, caching_validator.hits)
+        for index in ['run1', 'run2']:
+            self.assertDictEqual(validated.get_entity('run_experiment', index).attributes,
+                                 restored.get_entity('run_experiment', index).attributes)
+        restored_run = restored.get_entity('run_experiment', 'run1')
+        self.assertEqual('checksum1', restored_run.attributes['uploaded_file_1_checksum'])
+        self.assertDictEqual(validated.get_all_errors(), restored.get_all_errors())
+
+    def test_remote_schema_validation_should_keep_fingerprint_stable(self):
+        # Given
+        session = MagicMock()
+        session.post.return_value.ok = True
+        session.post.return_value.content = b'[]'
+        json_validator = JsonValidator('http://validator/validate', local_validation=False, session=session)
+        json_validator.schema_by_type = {'study': {'id': 'study-schema', 'type': 'object'}}
+        caching_validator = CachingValidator([json_validator])
+
+        # When
+        for _ in range(3):
+            caching_validator.validate_data(build_submission())
+
+        # Then
+        self.assertEqual(1, session.post.call_count)
+        self.assertEqual(1, caching_validator.misses)
+        self.assertEqual(2, caching_validator.hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
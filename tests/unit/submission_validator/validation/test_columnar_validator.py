@@ -0,0 +1,233 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.columnar import ColumnarValidator
+from submission_validator.validation.json import JsonValidator
+from tests.unit.submission_validator.validation.validation_utils import load_schema_files
+
+
+def validator_service(url, data, **kwargs):
+    # Stands in for the remote validator for the keywords the compiled rules leave to it
+    payload = json.loads(data)
+    schema, attributes = payload['schema'], payload['object']
+    schema_errors = []
+    for attribute, dependency in schema.get('dependencies', {}).items():
+        for required in dependency['required']:
+            if attribute in attributes and required not in attributes:
+                message = f'should have property {required} when property {attribute} is present'
+                schema_errors.append({'dataPath': '', 'errors': [message]})
+    if 'anyOf' in schema and not any(set(option['required']).issubset(attributes) for option in schema['anyOf']):
+        schema_errors.append({'dataPath': '', 'errors': ['should match some schema in anyOf']})
+    return MagicMock(ok=True, content=json.dumps(schema_errors).encode())
+
+
+def json_validator_for(schema_by_type: dict) -> JsonValidator:
+    session = MagicMock()
+    session.post.side_effect = validator_service
+    json_validator = JsonValidator('', session=session)
+    json_validator.schema_by_type = schema_by_type
+    return json_validator
+
+
+class TestColumnarValidator(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.json_validator = json_validator_for({})
+        load_schema_files(self.json_validator)
+        self.columnar_validator = ColumnarValidator(self.json_validator)
+
+    def test_missing_required_properties_should_return_errors(self):
+        # Given
+        submission = Submission()
+        assembly = submission.map('isolate_genome_assembly_information', 'assembly1', {
+            'assemblyname': 'P17157_1007',
+            'assembly_type': 'COVID-19 outbreak',
+            'program': 'Genome Detective',
+            'platform': 'Illumina MiSeq',
+            'fasta_flatfile_name': 'P17157_1007_contigs.txt'
+        })
+
+        # When
+        self.columnar_validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({'coverage': ["should have required property 'coverage'"]}, assembly.get_errors())
+
+    def test_enum_should_be_checked_after_lowercasing(self):
+        # Given
+        submission = Submission()
+        attributes = {'assemblyname': 'a', 'assembly_type': 'scaffold', 'coverage': '100', 'program': 'p',
+                      'platform': 'p', 'fasta_flatfile_name': 'f'}
+        valid = submission.map(
+            'isolate_genome_assembly_information', 'valid', dict(attributes, assembly_type='COVID-19 Outbreak'))
+        invalid = submission.map('isolate_genome_assembly_information', 'invalid', attributes)
+
+        # When
+        self.columnar_validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({}, valid.get_errors())
+        self.assertDictEqual(
+            {'assembly_type': ["should be equal to one of the allowed values: ['covid-19 outbreak']"]},
+            invalid.get_errors())
+
+    def test_run_experiment_should_not_be_lowercased(self):
+        # Given
+        submission = Submission()
+        run = submission.map('run_experiment', 'run1', {
+            'experiment_name': 'ERX4331406',
+            'sequencing_platform': 'illumina',
+            'sequencing_instrument': 'Illumina MiSeq',
+            'library_source': 'GENOMIC',
+            'library_selection': 'RANDOM',
+            'library_strategy': 'WGS',
+            'uploaded_file_1': 'file.fastq.gz'
+        })
+
+        # When
+        self.columnar_validator.validate_data(submission)
+
+        # Then
+        self.assertListEqual(['sequencing_platform'], list(run.get_errors()))
+
+    def test_not_enum_should_use_improved_message(self):
+        # Given
+        submission = Submission()
+        study = submission.map('study', 'study1', {'study_alias': 'Not Provided'})
+
+        # When
+        self.columnar_validator.validate_data(submission)
+
+        # Then
+        self.assertIn("study should have required property: 'study_alias'", study.get_errors()['study_alias'])
+
+    def test_type_and_pattern_should_be_checked(self):
+        # Given
+        validator = ColumnarValidator(json_validator_for({'sample': {'properties': {
+            'sample_title': {'type': 'string'},
+            'collection_date': {'type': 'string', 'pattern': '^[0-9]{4}(-[0-9]{2}){0,2}$'}
+        }}}))
+        submission = Submission()
+        sample = submission.map('sample', 'sample1', {'sample_title': 5, 'collection_date': 'yesterday'})
+
+        # When
+        validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({
+            'sample_title': ['should be string'],
+            'collection_date': ['should match pattern "^[0-9]{4}(-[0-9]{2}){0,2}$"']
+        }, sample.get_errors())
+
+    def test_uploaded_files_should_be_joined_with_manifest(self):
+        # Given
+        validator = ColumnarValidator(
+            json_validator_for({}), {'first-file': 'first-checksum', 'second-file': 'second-checksum'})
+        submission = Submission()
+        filled = submission.map('run_experiment', 'run1', {'uploaded_file_1': 'first-file'})
+        missing = submission.map(
+            'run_experiment', 'run2', {'uploaded_file_1': 'first-file', 'uploaded_file_2': 'missing-file'})
+        mismatched = submission.map('run_experiment', 'run3', {
+            'uploaded_file_1': 'second-file',
+            'uploaded_file_1_checksum': 'wrong-checksum'
+        })
+
+        # When
+        validator.validate_data(submission)
+
+        # Then
+        self.assertEqual('first-checksum', filled.attributes['uploaded_file_1_checksum'])
+        self.assertDictEqual({}, filled.get_errors())
+        self.assertDictEqual({'uploaded_file_2': ['File has not been uploaded to drag-and-drop: missing-file']},
+                             missing.get_errors())
+        self.assertDictEqual(
+            {'uploaded_file_1_checksum': [
+                'The checksum found on drag-and-drop second-checksum does not match: wrong-checksum'
+            ]},
+            mismatched.get_errors())
+
+    def test_columnar_and_json_validation_should_match(self):
+        # Given
+        schema = {
+            'type': 'object',
+            'required': ['coverage'],
+            'properties': {
+                'assembly_type': {'enum': ['scaffold', 'covid-19 outbreak']},
+                'coverage': {'type': 'string'},
+                'insert_size': {'type': 'string', 'format': 'integer'}
+            },
+            'dependencies': {'uploaded_file_2': {'required': ['insert_size']}}
+        }
+        json_validator = json_validator_for({'isolate_genome_assembly_information': schema})
+        rows = [
+            {'assembly_type': 'scaffold', 'coverage': '1'},
+            {'assembly_type': 'contig', 'coverage': '1'},
+            {'assembly_type': ['list']},
+            {'assembly_type': 'scaffold', 'coverage': '1', 'uploaded_file_2': 'second-file'},
+            {'assembly_type': 'contig', 'coverage': '1', 'uploaded_file_2': 'second-file', 'insert_size': '300'}
+        ]
+        row_submission, column_submission = Submission(), Submission()
+        for index, attributes in enumerate(rows):
+            row_submission.map('isolate_genome_assembly_information', str(index), dict(attributes))
+            column_submission.map('isolate_genome_assembly_information', str(index), dict(attributes))
+
+        # When
+        for entity in row_submission.get_entities('isolate_genome_assembly_information'):
+            json_validator.validate_entity(entity)
+        ColumnarValidator(json_validator).validate_data(column_submission)
+
+        # Then
+        self.assertDictEqual(row_submission.get_all_errors(), column_submission.get_all_errors())
+        self.assertListEqual(
+            ['should have property insert_size when property uploaded_file_2 is present'],
+            column_submission.get_entity('isolate_genome_assembly_information', '3').get_errors()[''])
+        self.assertEqual(4, json_validator.session.post.call_count)
+
+    def test_schema_with_any_of_should_be_validated_by_json_validator(self):
+        # Given
+        schema = {
+            'type': 'object',
+            'properties': {'host_age': {'type': 'string'}},
+            'anyOf': [{'required': ['host_age']}, {'required': ['host_sex']}]
+        }
+        json_validator = json_validator_for({'sample': schema})
+        row_submission, column_submission = Submission(), Submission()
+        for submission in (row_submission, column_submission):
+            submission.map('sample', 'aged', {'host_age': 5})
+            submission.map('sample', 'unknown', {})
+
+        # When
+        for entity in row_submission.get_entities('sample'):
+            json_validator.validate_entity(entity)
+        ColumnarValidator(json_validator).validate_data(column_submission)
+
+        # Then
+        self.assertDictEqual(row_submission.get_all_errors(), column_submission.get_all_errors())
+        self.assertEqual(4, json_validator.session.post.call_count)
+
+    def test_run_experiment_with_second_file_should_check_dependencies(self):
+        # Given
+        submission = Submission()
+        run = submission.map('run_experiment', 'run1', {
+            'experiment_name': 'ERX4331406',
+            'sequencing_platform': 'ILLUMINA',
+            'sequencing_instrument': 'Illumina MiSeq',
+            'library_source': 'GENOMIC',
+            'library_selection': 'RANDOM',
+            'library_strategy': 'WGS',
+            'uploaded_file_1': 'file_1.fastq.gz',
+            'uploaded_file_2': 'file_2.fastq.gz'
+        })
+
+        # When
+        self.columnar_validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual(
+            {'': ['should have property insert_size when property uploaded_file_2 is present']}, run.get_errors())
+
+if __name__ == '__main__':
+    unittest.main()
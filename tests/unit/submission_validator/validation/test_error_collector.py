@@ -0,0 +1,54 @@
+import unittest
+
+from submission_broker.submission.entity import Entity
+
+from submission_validator.validation.errors import ErrorCollector
+
+MISSING_FILE = 'File has not been uploaded to drag-and-drop: {}'
+
+
+class TestErrorCollector(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.collector = ErrorCollector()
+        self.run1 = Entity('run_experiment', 'run1', {})
+        self.run2 = Entity('run_experiment', 'run2', {})
+
+    def test_errors_should_only_reach_entities_on_flush(self):
+        # Given
+        self.collector.add(self.run1, 'uploaded_file_1', MISSING_FILE, 'a.fastq')
+        self.collector.add(self.run2, 'uploaded_file_1', 'Not valid.')
+        self.collector.add(self.run1, 'uploaded_file_1', MISSING_FILE, 'b.fastq')
+
+        # When
+        has_errors_before_flush = self.run1.has_errors()
+        self.collector.flush()
+
+        # Then
+        self.assertFalse(has_errors_before_flush)
+        self.assertDictEqual({
+            'uploaded_file_1': [
+                'File has not been uploaded to drag-and-drop: a.fastq',
+                'File has not been uploaded to drag-and-drop: b.fastq'
+            ]
+        }, self.run1.get_errors())
+        self.assertDictEqual({'uploaded_file_1': ['Not valid.']}, self.run2.get_errors())
+        self.assertEqual(0, len(self.collector))
+
+    def test_identical_messages_should_be_stored_once(self):
+        # Given
+        for entity in (self.run1, self.run2):
+            self.collector.add(entity, 'uploaded_file_1', MISSING_FILE, 'a.fastq')
+            self.collector.add(entity, 'uploaded_file_2', 'Not valid.')
+
+        # When
+        self.collector.flush()
+
+        # Then
+        self.assertEqual(2, self.collector.message_count)
+        self.assertEqual(self.run1.get_errors(), self.run2.get_errors())
+        self.assertIs(self.run1.get_errors()['uploaded_file_1'][0], self.run2.get_errors()['uploaded_file_1'][0])
+
+
+if __name__ == '__main__':
+    unittest.main()
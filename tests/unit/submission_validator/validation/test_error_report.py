@@ -0,0 +1,134 @@
+import io
+import json
+import threading
+import unittest
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.validation.report import CallbackSink, ErrorRecord, ErrorReport, JsonLinesSink, QueueSink
+
+MISSING_FILE = 'File has not been uploaded to drag-and-drop: missing.file'
+
+
+class MissingFileValidator(BaseValidator):
+    entity_types = ['run_experiment']
+
+    def validate_entity(self, entity: Entity):
+        entity.add_error('uploaded_file_1', MISSING_FILE)
+        entity.add_errors('uploaded_file_2', [MISSING_FILE])
+
+
+class BatchMissingFileValidator(MissingFileValidator):
+    def validate_data(self, data: Submission):
+        for entity in data.get_entities('run_experiment'):
+            self.validate_entity(entity)
+
+
+class ChunkedMissingFileValidator(MissingFileValidator):
+    independent_entities = True
+
+    def __init__(self):
+        self.validated = []
+
+    def validate_data(self, data: Submission):
+        self.validate_entities(data.get_entities('run_experiment'))
+
+    def validate_entities(self, entities, context=None):
+        for entity in entities:
+            self.validate_entity(entity)
+            self.validated.append(entity.identifier.index)
+
+
+class TestErrorReport(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.submission = Submission()
+        for index in range(3):
+            self.submission.map('run_experiment', f'run{index}', {})
+
+    def test_errors_should_be_emitted_without_being_kept(self):
+        # Given
+        records = []
+        report = ErrorReport(CallbackSink(records.append))
+        validator = report.wrap(MissingFileValidator())
+
+        # When
+        validator.validate_data(self.submission)
+
+        # Then
+        self.assertEqual(6, report.count)
+        self.assertEqual(ErrorRecord('run_experiment', 'run0', 'uploaded_file_1', MISSING_FILE), records[0])
+        self.assertEqual(ErrorRecord('run_experiment', 'run2', 'uploaded_file_2', MISSING_FILE), records[-1])
+        self.assertFalse(self.submission.has_errors())
+
+    def test_errors_of_chunked_validators_should_be_emitted_before_the_pass_ends(self):
+        # Given
+        inner = ChunkedMissingFileValidator()
+        validated_at_emit = []
+        report = ErrorReport(CallbackSink(lambda record: validated_at_emit.append(len(inner.validated))))
+        validator = report.wrap(inner, chunk_size=1)
+
+        # When
+        validator.validate_data(self.submission)
+
+        # Then
+        self.assertListEqual([0, 0, 1, 1, 2, 2], validated_at_emit)
+        self.assertListEqual(['run0', 'run1', 'run2'], inner.validated)
+        self.assertFalse(self.submission.has_errors())
+
+    def test_only_new_errors_of_whole_submission_validators_should_be_emitted(self):
+        # Given
+        records = []
+        report = ErrorReport(CallbackSink(records.append))
+        self.submission.get_entity('run_experiment', 'run1').add_error('uploaded_file_1', 'Earlier error')
+        validator = report.wrap(BatchMissingFileValidator())
+
+        # When
+        validator.validate_data(self.submission)
+
+        # Then
+        self.assertEqual(6, report.count)
+        self.assertNotIn('Earlier error', [record.message for record in records])
+        self.assertListEqual(['run_experiment'], validator.entity_types)
+
+    def test_json_lines_should_reference_deduplicated_messages(self):
+        # Given
+        output = io.StringIO()
+        report = ErrorReport(JsonLinesSink(output, message_ids=True))
+
+        # When
+        report.wrap(MissingFileValidator()).validate_data(self.submission)
+        report.close()
+
+        # Then
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertDictEqual({'message_id': 0, 'message': MISSING_FILE}, lines[0])
+        self.assertEqual(7, len(lines))
+        self.assertDictEqual(
+            {'entity_type': 'run_experiment', 'index': 'run2', 'attribute': 'uploaded_file_2', 'message_id': 0},
+            lines[-1])
+
+    def test_bounded_queue_should_stream_records_to_consumer(self):
+        # Given
+        sink = QueueSink(maxsize=1)
+        report = ErrorReport(sink)
+
+        def validate():
+            report.wrap(MissingFileValidator()).validate_data(self.submission)
+            report.close()
+
+        # When
+        producer = threading.Thread(target=validate)
+        producer.start()
+        records = list(sink.records())
+        producer.join()
+
+        # Then
+        self.assertEqual(6, len(records))
+        self.assertIs(records[0].message, records[-1].message)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import json
 import unittest
 from os.path import dirname, join
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 
 import requests
 
@@ -13,7 +13,7 @@ from tests.unit.submission_validator.validation.validation_utils import load_sch
 
 class TestIssuesGeneration(unittest.TestCase):
     def setUp(self):
-        self.schema_validator = JsonValidator("")
+        self.schema_validator = JsonValidator("", local_validation=False)
         load_schema_files(self.schema_validator)
         self.maxDiff = None
         current_folder = dirname(__file__)
@@ -26,7 +26,7 @@ class TestIssuesGeneration(unittest.TestCase):
     @patch('submission_validator.validation.json.requests.post')
     def test_when_validate_invalid_entity_with_valid_schema_should_return_errors(self, mock_post):
         # Given
-        mock_post.return_value.json.side_effect = ([
+        validator_responses = ([
                 {
                     'dataPath': '.assembly_type',
                     'errors': [
@@ -51,6 +51,7 @@ class TestIssuesGeneration(unittest.TestCase):
             [],
             []
         )
+        mock_post.side_effect = [MagicMock(content=json.dumps(errors)) for errors in validator_responses]
         mock_post.return_value.status = requests.codes['ok']
         expected_issues = {
             "isolate_genome_assembly_information": {
@@ -73,5 +74,42 @@ class TestIssuesGeneration(unittest.TestCase):
         self.assertDictEqual(expected_issues, self.submission.get_all_errors())
 
 
+    @patch('submission_validator.validation.json.requests.post')
+    def test_locally_covered_entity_should_return_same_errors_without_service(self, mock_post):
+        # Given
+        local_validator = JsonValidator("")
+        load_schema_files(local_validator)
+        assembly = self.submission.get_entity('isolate_genome_assembly_information', 'P17157_1007')
+        expected_errors = {
+            'assembly_type': ["should be equal to one of the allowed values: ['covid-19 outbreak']"],
+            'coverage': ["should have required property 'coverage'"]
+        }
+
+        # When
+        local_validator.validate_entity(assembly)
+
+        # Then
+        mock_post.assert_not_called()
+        self.assertDictEqual(expected_errors, assembly.get_errors())
+
+    @patch('submission_validator.validation.json.requests.post')
+    def test_entity_with_uncovered_rules_should_use_service(self, mock_post):
+        # Given
+        local_validator = JsonValidator("")
+        load_schema_files(local_validator)
+        mock_post.return_value.content = json.dumps([
+            {'dataPath': '.study_alias', 'errors': ['should NOT be valid']}
+        ])
+        study = self.submission.get_entity('study', 'PRJEB39632')
+
+        # When
+        local_validator.validate_entity(study)
+
+        # Then
+        mock_post.assert_called_once()
+        expected_errors = {'study_alias': ["study should have required property: 'study_alias'"]}
+        self.assertDictEqual(expected_errors, study.get_errors())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.reference import ReferenceValidator
+
+
+class TestReferenceValidator(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.reference_validator = ReferenceValidator()
+        self.submission = Submission()
+        self.study = self.submission.map('study', 'study1', {'study_accession': 'PRJEB39632'})
+        self.sample = self.submission.map('sample', 'sample1', {'sample_alias': 'P17157_1007'})
+        self.run = self.submission.map('run_experiment', 'run1', {'experiment_name': 'ERX4331406'})
+        self.run.add_accession('ENA_Run', 'ERR4387385')
+
+    def test_resolved_references_should_not_return_errors(self):
+        # Given
+        self.run.attributes['sample_ref'] = 'P17157_1007'
+        self.run.attributes['study_ref'] = 'PRJEB39632'
+        assembly = self.submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': 'ERR4387385'})
+        Submission.link_entities(self.run, self.sample)
+        Submission.link_entities(self.run, self.study)
+
+        # When
+        self.reference_validator.validate_data(self.submission)
+
+        # Then
+        self.assertFalse(self.submission.has_errors())
+        self.assertDictEqual({}, assembly.get_errors())
+
+    def test_dangling_run_ref_should_return_error(self):
+        # Given
+        assembly = self.submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': 'missing-run'})
+        expected_errors = {
+            'run_ref': ['Referenced run_experiment has not been found in the submission: missing-run']
+        }
+
+        # When
+        self.reference_validator.validate_data(self.submission)
+
+        # Then
+        self.assertDictEqual(expected_errors, assembly.get_errors())
+
+    def test_dangling_sample_and_study_refs_should_return_errors(self):
+        # Given
+        self.run.attributes['sample_ref'] = 'missing-sample'
+        self.run.attributes['study_ref'] = 'missing-study'
+        expected_errors = {
+            'sample_ref': ['Referenced sample has not been found in the submission: missing-sample'],
+            'study_ref': ['Referenced study has not been found in the submission: missing-study']
+        }
+
+        # When
+        self.reference_validator.validate_data(self.submission)
+
+        # Then
+        self.assertDictEqual(expected_errors, self.run.get_errors())
+
+    def test_archived_accessions_should_not_return_errors(self):
+        # Given
+        self.run.attributes['sample_ref'] = 'SAMEA7054106'
+        self.run.attributes['study_ref'] = 'PRJEB12345'
+        assembly = self.submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': 'ERR0000001'})
+
+        # When
+        self.reference_validator.validate_data(self.submission)
+
+        # Then
+        self.assertFalse(self.submission.has_errors())
+        self.assertDictEqual({}, assembly.get_errors())
+
+    def test_archived_accessions_should_be_rejected_without_patterns(self):
+        # Given
+        validator = ReferenceValidator(accession_patterns={})
+        assembly = self.submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': 'ERR0000001'})
+        expected_errors = {
+            'run_ref': ['Referenced run_experiment has not been found in the submission: ERR0000001']
+        }
+
+        # When
+        validator.validate_data(self.submission)
+
+        # Then
+        self.assertDictEqual(expected_errors, assembly.get_errors())
+
+    def test_dangling_link_should_return_error(self):
+        # Given
+        self.run.add_link('sample', 'missing-sample')
+        expected_errors = {
+            'sample': ['Referenced sample has not been found in the submission: missing-sample']
+        }
+
+        # When
+        self.reference_validator.validate_data(self.submission)
+
+        # Then
+        self.assertDictEqual(expected_errors, self.run.get_errors())
+
+    def test_index_should_contain_indexes_accessions_and_identifier_attributes(self):
+        # When
+        identifiers = self.reference_validator.index_identifiers(self.submission)
+
+        # Then
+        self.assertSetEqual({'study1', 'PRJEB39632'}, identifiers['study'])
+        self.assertSetEqual({'sample1', 'P17157_1007'}, identifiers['sample'])
+        self.assertSetEqual({'run1', 'ERX4331406', 'ERR4387385'}, identifiers['run_experiment'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from submission_validator.validation.rules import CompiledSchema, ascii_lower
+
+
+class TestCompiledSchema(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.schema = {
+            'id': 'run-schema',
+            'type': 'object',
+            'required': ['experiment_name', 'library_strategy'],
+            'properties': {
+                'experiment_name': {'description': 'The name of this experiment.', 'type': 'string'},
+                'library_strategy': {'enum': ['WGS', 'WGA']},
+                'release_date': {'type': 'string', 'format': 'date'},
+                'library_name': {'type': 'string', 'pattern': '^[A-Z0-9_]+$'},
+                'study_alias': {'type': 'string', 'not': {'enum': ['not provided']}}
+            },
+            'dependencies': {'uploaded_file_2': {'required': ['insert_size']}}
+        }
+        self.compiled_schema = CompiledSchema('run_experiment', self.schema)
+
+    def test_supported_rules_should_cover_entity(self):
+        self.assertTrue(self.compiled_schema.covers({'experiment_name': 'e', 'library_strategy': 'WGS'}))
+
+    def test_unsupported_property_and_dependency_should_not_cover_entity(self):
+        self.assertFalse(self.compiled_schema.covers({'release_date': '2020-08-31'}))
+        self.assertFalse(self.compiled_schema.covers({'uploaded_file_2': 'file.fastq.gz'}))
+
+    def test_unsupported_schema_keyword_should_never_cover_entity(self):
+        # Given
+        compiled_schema = CompiledSchema('sample', dict(self.schema, anyOf=[{'required': ['tax_id']}]))
+
+        # Then
+        self.assertFalse(compiled_schema.covers({}))
+
+    def test_compiled_rules_should_return_service_messages(self):
+        # Given
+        attributes = {'experiment_name': 1, 'library_name': 'lib-1', 'study_alias': 'not provided'}
+
+        # When
+        errors = self.compiled_schema.validate(attributes)
+
+        # Then
+        self.assertDictEqual({
+            'library_strategy': ["should have required property 'library_strategy'"],
+            'experiment_name': ['should be string'],
+            'library_name': ['should match pattern "^[A-Z0-9_]+$"'],
+            'study_alias': ["run_experiment should have required property: 'study_alias'"]
+        }, errors)
+
+    def test_ascii_lower_should_keep_non_ascii_characters(self):
+        self.assertDictEqual({'country': 'Åland islands', 'list': ['abc']},
+                             ascii_lower({'Country': 'Åland Islands', 'List': ['ABC']}))
+
+
+if __name__ == '__main__':
+    unittest.main()
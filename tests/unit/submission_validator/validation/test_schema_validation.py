@@ -17,7 +17,7 @@ class TestSchemaValidation(unittest.TestCase):
         with open(join(dirname(__file__), "../../../resources/data_for_test_issues.json")) as test_data_file:
             test_data = json.load(test_data_file)
 
-        self.schema_validator = JsonValidator("")
+        self.schema_validator = JsonValidator("", local_validation=False)
         load_schema_files(self.schema_validator)
 
         self.submission = Submission()
@@ -27,7 +27,7 @@ class TestSchemaValidation(unittest.TestCase):
     @patch('submission_validator.validation.json.requests.post')
     def test_when_entity_valid_should_return_no_errors(self, mock_post):
         # Given
-        mock_post.return_value.json.return_value = []
+        mock_post.return_value.content = json.dumps([])
         mock_post.return_value.status = requests.codes['ok']
 
         # When
@@ -40,14 +40,14 @@ class TestSchemaValidation(unittest.TestCase):
     @patch('submission_validator.validation.json.requests.post')
     def test_when_entity_invalid_entity_with_valid_schema_should_return_errors(self, mock_post):
         # Given
-        mock_post.return_value.json.return_value = [
+        mock_post.return_value.content = json.dumps([
             {
                 "dataPath": ".release_date",
                 "errors": [
                     "should have required property 'release_date'"
                 ]
             }
-        ]
+        ])
         mock_post.return_value.status = requests.codes['ok']
         expected_errors = {
             "isolate_genome_assembly_information": {
@@ -83,5 +83,23 @@ class TestSchemaValidation(unittest.TestCase):
         self.assertDictEqual(expected_errors, self.submission.get_all_errors())
 
 
+    @patch('submission_validator.validation.json.requests.post')
+    def test_payload_should_contain_schema_and_lowercase_entity(self, mock_post):
+        # Given
+        mock_post.return_value.content = json.dumps([])
+        study = self.submission.get_entity('study', 'PRJEB39632')
+        expected_schema = dict(self.schema_validator.schema_by_type['study'])
+        expected_schema.pop('id', None)
+        expected_object = json.loads(json.dumps(study.attributes).lower())
+
+        # When
+        self.schema_validator.validate_entity(study)
+
+        # Then
+        payload = json.loads(mock_post.call_args[1]['data'])
+        self.assertDictEqual(expected_schema, payload['schema'])
+        self.assertDictEqual(expected_object, payload['object'])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,7 +2,10 @@ import unittest
 from unittest.mock import MagicMock
 
 from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
 
+from submission_validator.services.circuit_breaker import NOT_VALIDATED_KEY
+from submission_validator.services.ena_taxonomy import EnaTaxonomy
 from submission_validator.validation.taxonomy import TaxonomyValidator
 
 
@@ -186,6 +189,55 @@ class TestTaxonomyValidator(unittest.TestCase):
         self.assertTrue(sample.has_errors())
         self.assertDictEqual(expected_error, sample.get_errors())
 
+    def test_error_helpers_should_return_errors_by_attribute(self):
+        # Given
+        response = {
+            'tax_id': {'error': 'Not valid tax_id: 999999999999.'},
+            'scientific_name': self.valid_human,
+            'error': 'Information is not consistent between taxId: 999999999999 and scientificName: Homo sapiens'
+        }
+
+        # When
+        taxonomy_errors = TaxonomyValidator.get_taxonomy_errors(response)
+        tax_id_errors = TaxonomyValidator.get_errors(response['tax_id'], 'tax_id')
+
+        # Then
+        self.assertDictEqual({
+            'tax_id': [response['tax_id']['error'], response['error']],
+            'scientific_name': [response['error']]
+        }, taxonomy_errors)
+        self.assertDictEqual({'tax_id': [response['tax_id']['error']]}, tax_id_errors)
+
+    def test_collected_errors_should_be_kept_when_validation_fails(self):
+        # Given
+        error = 'Not valid tax_id: 999999999999.'
+        self.taxonomy_validator.ena_taxonomy.validate_tax_id = MagicMock(
+            side_effect=[{'error': error}, ConnectionError('ENA is down')])
+        submission = Submission()
+        invalid = submission.map('sample', 'sample1', {'tax_id': '999999999999'})
+        submission.map('sample', 'sample2', {'tax_id': '9606'})
+
+        # When
+        with self.assertRaises(ConnectionError):
+            self.taxonomy_validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({'tax_id': [error]}, invalid.get_errors())
+
+    def test_unavailable_ena_should_mark_sample_not_validated(self):
+        # Given
+        self.taxonomy_validator.ena_taxonomy.validate_tax_id = MagicMock(
+            return_value=EnaTaxonomy.format_unavailable_error('tax_id', '9606'))
+        sample = Entity('sample', 'sample1', {'tax_id': '9606'})
+
+        # When
+        self.taxonomy_validator.validate_entity(sample)
+
+        # Then
+        self.assertDictEqual(
+            {NOT_VALIDATED_KEY: [EnaTaxonomy.format_unavailable_error('tax_id', '9606')['error']]},
+            sample.get_errors())
+
 
 if __name__ == '__main__':
     unittest.main()
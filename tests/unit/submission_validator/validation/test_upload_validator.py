@@ -1,8 +1,12 @@
+import hashlib
+import os
+import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
 from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
 
-from submission_validator.validation.upload import UploadValidator, CHECKSUMS_FILE_NAME
+from submission_validator.validation.upload import UploadValidator, CHECKSUMS_FILE_NAME, ManifestDiff, diff_manifests
 
 
 class TestUploadValidator(unittest.TestCase):
@@ -136,3 +140,120 @@ class TestUploadValidator(unittest.TestCase):
 
         # Then
         self.assertDictEqual({}, entity.get_errors())
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_verified_content_mismatch_should_log_error(self, mock: MagicMock):
+        # Given
+        folder = self.create_folder({'run0.fastq': b'reads 0', 'run1.fastq': b'reads 1'})
+        stated_checksum = hashlib.md5(b'other reads').hexdigest()
+        mock.return_value = f"run0.fastq,{hashlib.md5(b'reads 0').hexdigest()}\nrun1.fastq,{stated_checksum}"
+        validator = UploadValidator('uuid', verify_checksums=True, local_folder=folder)
+        submission = self.build_submission(2)
+
+        # When
+        validator.validate_data(submission)
+
+        # Then
+        expected_error = UploadValidator.content_mismatch_error(hashlib.md5(b'reads 1').hexdigest(), stated_checksum)
+        self.assertDictEqual({
+            'run_experiment': {
+                'run1': {'uploaded_file_1_checksum': [expected_error]}
+            }
+        }, submission.get_all_errors())
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_verified_unreadable_file_should_log_error(self, mock: MagicMock):
+        # Given
+        folder = self.create_folder({'run0.fastq': b'reads 0'})
+        mock.return_value = f"run0.fastq,{hashlib.md5(b'reads 0').hexdigest()}\nrun1.fastq,0123456789abcdef"
+        validator = UploadValidator('uuid', verify_checksums=True, local_folder=folder)
+        submission = self.build_submission(2)
+
+        # When
+        validator.validate_data(submission)
+
+        # Then
+        self.assertDictEqual({
+            'run_experiment': {
+                'run1': {'uploaded_file_1_checksum': ['Could not read the file uploaded to drag-and-drop: run1.fastq']}
+            }
+        }, submission.get_all_errors())
+
+    def test_manifest_diff_should_report_added_removed_and_changed_files(self):
+        # When
+        diff = diff_manifests({'a': '1', 'b': '2', 'c': '3'}, {'a': '1', 'b': '20', 'd': '4'})
+
+        # Then
+        self.assertEqual(ManifestDiff(added={'d'}, removed={'c'}, changed={'b'}), diff)
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_reloaded_manifest_should_only_revalidate_affected_files(self, mock: MagicMock):
+        # Given
+        mock.return_value = 'run0.fastq,checksum0\nrun1.fastq,checksum1'
+        validator = UploadValidator('uuid')
+        validator.validate_data(self.build_submission(3))
+        mock.return_value = 'run0.fastq,checksum0\nrun1.fastq,new-checksum1\nrun2.fastq,checksum2'
+
+        # When
+        diff = validator.reload_checksums()
+        submission = self.build_submission(3)
+        validator.validate_data(submission)
+
+        # Then
+        self.assertEqual(ManifestDiff(added={'run2.fastq'}, removed=set(), changed={'run1.fastq'}), diff)
+        self.assertEqual(5, validator.checked_files)
+        self.assertFalse(submission.has_errors())
+        run = submission.get_entity('run_experiment', 'run1')
+        self.assertEqual('new-checksum1', run.attributes['uploaded_file_1_checksum'])
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_verified_files_should_only_be_hashed_again_when_changed(self, mock: MagicMock):
+        # Given
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        checksums = []
+        for index in range(2):
+            content = f'reads {index}'.encode()
+            with open(os.path.join(folder.name, f'run{index}.fastq'), 'wb') as fastq_file:
+                fastq_file.write(content)
+            checksums.append(f'run{index}.fastq,{hashlib.md5(content).hexdigest()}')
+        mock.return_value = '\n'.join(checksums)
+        validator = UploadValidator('uuid', verify_checksums=True, local_folder=folder.name)
+        validator.validate_data(self.build_submission(2))
+        with open(os.path.join(folder.name, 'run1.fastq'), 'wb') as fastq_file:
+            fastq_file.write(b'more reads')
+        mock.return_value = '\n'.join([checksums[0], 'run1.fastq,0123456789abcdef'])
+        validator.reload_checksums()
+
+        # When
+        with patch.object(UploadValidator, 'calculate_checksums', wraps=validator.calculate_checksums) as calculate:
+            submission = self.build_submission(2)
+            validator.validate_data(submission)
+
+        # Then
+        calculate.assert_called_once_with(['run1.fastq'])
+        self.assertDictEqual({
+            'run_experiment': {
+                'run1': {
+                    'uploaded_file_1_checksum': [
+                        f"The checksum of the file uploaded to drag-and-drop {hashlib.md5(b'more reads').hexdigest()} "
+                        f"does not match: 0123456789abcdef"
+                    ]
+                }
+            }
+        }, submission.get_all_errors())
+
+    def create_folder(self, files: dict) -> str:
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        for file_name, content in files.items():
+            with open(os.path.join(folder.name, file_name), 'wb') as upload_file:
+                upload_file.write(content)
+        return folder.name
+
+    @staticmethod
+    def build_submission(run_count: int) -> Submission:
+        submission = Submission()
+        for index in range(run_count):
+            submission.map('run_experiment', f'run{index}', {'uploaded_file_1': f'run{index}.fastq'})
+        return submission
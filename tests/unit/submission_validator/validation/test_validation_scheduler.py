@@ -0,0 +1,295 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch, MagicMock
+
+import requests
+
+from submission_broker.submission.entity import Entity
+from submission_broker.submission.submission import Submission
+from submission_broker.validation.base import BaseValidator
+
+from submission_validator.services.ena_taxonomy import EnaTaxonomy, LocalTaxonomy
+from submission_validator.services.rate_limit import RateController, TokenBucket
+from submission_validator.validation.reference import ReferenceValidator
+from submission_validator.validation.scheduler import ValidationScheduler, INTERACTIVE_PRIORITY, BULK_PRIORITY
+from submission_validator.validation.taxonomy import TaxonomyValidator
+from submission_validator.validation.upload import UploadValidator
+from tests.stub_server import StubBehaviour, StubServer, constant_latency
+
+
+class StubBackendValidator(BaseValidator):
+    entity_types = ['sample']
+    independent_entities = True
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def validate_entity(self, entity: Entity):
+        time.sleep(self.latency)
+        entity.add_error('tax_id', f'Not valid tax_id: {entity.attributes["tax_id"]}.')
+
+
+class FailingValidator(BaseValidator):
+    independent_entities = True
+
+    def __init__(self, failing_indexes=None):
+        self.failing_indexes = failing_indexes
+
+    def validate_entity(self, entity: Entity):
+        if self.failing_indexes is None or entity.identifier.index in self.failing_indexes:
+            raise ConnectionError('Backend is down')
+        entity.add_error('tax_id', 'Validated')
+
+
+class FailingSubmissionValidator(BaseValidator):
+    def validate_data(self, data: Submission):
+        raise ConnectionError('Backend is down')
+
+
+class OverlapProbe:
+    def __init__(self):
+        self.busy = set()
+        self.overlaps = []
+        self.lock = threading.Lock()
+
+    def enter(self, key):
+        with self.lock:
+            if key in self.busy or (key is None and self.busy) or None in self.busy:
+                self.overlaps.append(key)
+            self.busy.add(key)
+
+    def leave(self, key):
+        with self.lock:
+            self.busy.discard(key)
+
+
+class ProbeEntityValidator(BaseValidator):
+    independent_entities = True
+
+    def __init__(self, probe: OverlapProbe):
+        self.probe = probe
+
+    def validate_entity(self, entity: Entity):
+        self.probe.enter(id(entity))
+        time.sleep(0.0005)
+        entity.attributes[f'probe_{id(self)}'] = 'seen'
+        self.probe.leave(id(entity))
+
+
+class ProbeSubmissionValidator(BaseValidator):
+    def __init__(self, probe: OverlapProbe):
+        self.probe = probe
+
+    def validate_data(self, data: Submission):
+        self.probe.enter(None)
+        time.sleep(0.01)
+        self.probe.leave(None)
+
+
+def build_submission(sample_count: int) -> Submission:
+    submission = Submission()
+    for index in range(sample_count):
+        submission.map('sample', f'sample{index}', {'tax_id': str(index)})
+        submission.map('study', f'study{index}', {})
+    return submission
+
+
+class TestValidationScheduler(unittest.TestCase):
+    def setUp(self):
+        self.validator = StubBackendValidator(latency=0.001)
+
+    def test_all_entities_should_be_validated_and_progress_reported(self):
+        # Given
+        submission = build_submission(250)
+
+        # When
+        with ValidationScheduler(max_workers=3, chunk_size=20) as scheduler:
+            job = scheduler.submit(submission, [self.validator])
+            self.assertTrue(job.wait(10))
+
+        # Then
+        self.assertEqual(250, job.total)
+        self.assertEqual(250, job.completed)
+        self.assertEqual(1.0, job.progress())
+        self.assertEqual(250, len(submission.get_errors('sample')))
+        self.assertDictEqual({}, submission.get_errors('study'))
+
+    def test_interactive_submission_should_not_wait_for_bulk_submission(self):
+        # Given
+        bulk_submission = build_submission(3000)
+        small_submission = build_submission(10)
+
+        # When
+        with ValidationScheduler(max_workers=2, chunk_size=10) as scheduler:
+            bulk_job = scheduler.submit(bulk_submission, [self.validator], priority=BULK_PRIORITY)
+            time.sleep(0.05)
+            small_job = scheduler.submit(small_submission, [self.validator], priority=INTERACTIVE_PRIORITY)
+            self.assertTrue(small_job.wait(5))
+            bulk_progress = bulk_job.progress()
+            bulk_job.wait(30)
+
+        # Then
+        self.assertEqual(1.0, small_job.progress())
+        self.assertLess(bulk_progress, 1.0)
+        self.assertLess(small_job.finished - small_job.started, 1.0)
+        self.assertTrue(bulk_job.is_done())
+
+    def test_earlier_deadline_should_be_scheduled_first(self):
+        # Given
+        late_submission = build_submission(50)
+        urgent_submission = build_submission(50)
+
+        # When
+        with ValidationScheduler(max_workers=1, chunk_size=10) as scheduler:
+            blocking_job = scheduler.submit(build_submission(10), [StubBackendValidator(latency=0.01)])
+            late_job = scheduler.submit(late_submission, [self.validator], timeout=60)
+            urgent_job = scheduler.submit(urgent_submission, [self.validator], timeout=1)
+            for job in [blocking_job, late_job, urgent_job]:
+                job.wait(10)
+            finished = sorted([('late', late_job.finished), ('urgent', urgent_job.finished)], key=lambda item: item[1])
+
+        # Then
+        self.assertEqual('urgent', finished[0][0])
+
+    def test_failing_validator_should_not_stop_other_validators(self):
+        # Given
+        submission = build_submission(5)
+
+        # When
+        with ValidationScheduler(max_workers=2) as scheduler:
+            job = scheduler.submit(submission, [FailingValidator(), self.validator])
+            job.wait(10)
+
+        # Then
+        self.assertTrue(job.errors)
+        self.assertEqual(5, len(submission.get_errors('sample')))
+
+    def test_failing_entity_should_not_drop_the_rest_of_its_chunk(self):
+        # Given
+        submission = build_submission(5)
+
+        # When
+        with ValidationScheduler(max_workers=1, chunk_size=10) as scheduler:
+            job = scheduler.submit(submission, [FailingValidator(failing_indexes={'sample1'})])
+            job.wait(10)
+
+        # Then
+        self.assertEqual(1, len(job.errors))
+        self.assertDictEqual({'not_validated': ['Could not validate sample, please retry later.']},
+                             submission.get_entity('sample', 'sample1').get_errors())
+        self.assertDictEqual({'tax_id': ['Validated']}, submission.get_entity('sample', 'sample2').get_errors())
+
+    def test_failing_submission_validator_should_finish_job(self):
+        # Given
+        submission = build_submission(5)
+
+        # When
+        with ValidationScheduler(max_workers=2) as scheduler:
+            job = scheduler.submit(submission, [FailingSubmissionValidator(), self.validator])
+
+            # Then
+            self.assertTrue(job.wait(10))
+        self.assertEqual(1, len(job.errors))
+        self.assertEqual(1.0, job.progress())
+        self.assertEqual(5, len(submission.get_errors('sample')))
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_upload_validator_should_verify_uploaded_files(self, mock: MagicMock):
+        # Given
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        with open(os.path.join(folder.name, 'run0.fastq'), 'wb') as fastq_file:
+            fastq_file.write(b'reads 0')
+        mock.return_value = 'run0.fastq,0123456789abcdef'
+        submission = Submission()
+        run = submission.map('run_experiment', 'run0', {'uploaded_file_1': 'run0.fastq'})
+        validator = UploadValidator('uuid', verify_checksums=True, local_folder=folder.name)
+
+        # When
+        with ValidationScheduler(max_workers=2) as scheduler:
+            job = scheduler.submit(submission, [validator])
+            job.wait(10)
+
+        # Then
+        self.assertListEqual([], job.errors)
+        self.assertEqual('0123456789abcdef', run.attributes['uploaded_file_1_checksum'])
+        self.assertDictEqual({
+            'uploaded_file_1_checksum': [
+                UploadValidator.content_mismatch_error(hashlib.md5(b'reads 0').hexdigest(), '0123456789abcdef')
+            ]
+        }, run.get_errors())
+
+    def test_submission_validator_should_resolve_references(self):
+        # Given
+        submission = Submission()
+        submission.map('run_experiment', 'run1', {})
+        assembly = submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': 'missing-run'})
+
+        # When
+        with ValidationScheduler(max_workers=1) as scheduler:
+            scheduler.submit(submission, [ReferenceValidator()]).wait(10)
+
+        # Then
+        self.assertIn('run_ref', assembly.get_errors())
+
+    def test_interactive_submission_should_not_wait_for_bulk_taxonomy_validation(self):
+        # Given
+        server = StubServer(StubBehaviour(latency=constant_latency(0.003))).start()
+        self.addCleanup(server.stop)
+        session = requests.Session()
+        self.addCleanup(session.close)
+        controller = RateController(TokenBucket(rate=2000, capacity=100))
+        validator = TaxonomyValidator(ena_taxonomy=EnaTaxonomy(
+            server.url, controller=controller, local_taxonomy=LocalTaxonomy([]), session=session))
+
+        def build_samples(count: int) -> Submission:
+            samples = Submission()
+            for index in range(count):
+                samples.map('sample', f'sample{index}', {'tax_id': str(index), 'scientific_name': f'Species {index}'})
+            return samples
+        bulk_submission, small_submission = build_samples(300), build_samples(10)
+
+        # When
+        with ValidationScheduler(max_workers=2, chunk_size=10) as scheduler:
+            bulk_job = scheduler.submit(bulk_submission, [validator], priority=BULK_PRIORITY)
+            time.sleep(0.05)
+            small_job = scheduler.submit(small_submission, [validator], priority=INTERACTIVE_PRIORITY)
+            self.assertTrue(small_job.wait(5))
+            bulk_progress = bulk_job.progress()
+            self.assertTrue(bulk_job.wait(30))
+
+        # Then
+        self.assertLess(bulk_progress, 1.0)
+        self.assertLess(small_job.finished - small_job.started, 1.0)
+        self.assertListEqual([], bulk_job.errors + small_job.errors)
+        self.assertFalse(small_submission.has_errors())
+        self.assertFalse(bulk_submission.has_errors())
+
+    def test_no_entity_should_be_validated_by_two_workers_at_once(self):
+        # Given
+        probe = OverlapProbe()
+        validators = [ProbeEntityValidator(probe), ProbeEntityValidator(probe), ProbeSubmissionValidator(probe)]
+        submission = build_submission(100)
+
+        # When
+        with ValidationScheduler(max_workers=4, chunk_size=5) as scheduler:
+            job = scheduler.submit(submission, validators)
+            self.assertTrue(job.wait(10))
+
+        # Then
+        self.assertListEqual([], probe.overlaps)
+        self.assertEqual(job.total, job.completed)
+        self.assertEqual(1.0, job.progress())
+
+    def test_empty_submission_should_finish(self):
+        with ValidationScheduler(max_workers=1) as scheduler:
+            job = scheduler.submit(Submission(), [self.validator])
+            self.assertTrue(job.wait(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
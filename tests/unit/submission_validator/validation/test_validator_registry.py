@@ -0,0 +1,180 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+
+from submission_broker.submission.submission import Submission
+
+from submission_validator.validation.reference import ReferenceValidator
+from submission_validator.validation.registry import ValidatorRegistry, create_registry
+from submission_validator.validation.scheduler import ValidationScheduler
+from submission_validator.validation.upload import UploadValidator
+
+
+class SessionValidator:
+    def __init__(self, session):
+        self.session = session
+
+
+class TestValidatorRegistry(unittest.TestCase):
+    def test_get_should_create_each_instance_once(self):
+        # Given
+        registry = ValidatorRegistry()
+        created = []
+        barrier = threading.Barrier(8)
+
+        def factory(_):
+            created.append(object())
+            return created[-1]
+        registry.register_resource('resource', factory)
+
+        def get_resource(_):
+            barrier.wait()
+            return registry.get('resource')
+
+        # When
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            instances = list(executor.map(get_resource, range(8)))
+
+        # Then
+        self.assertEqual(1, len(created))
+        self.assertTrue(all(instance is created[0] for instance in instances))
+
+    def test_factories_should_receive_shared_resources(self):
+        # Given
+        registry = ValidatorRegistry()
+        registry.register_resource('session', lambda _: object())
+        registry.register_validator('first', lambda shared: SessionValidator(shared.get('session')))
+        registry.register_validator('second', lambda shared: SessionValidator(shared.get('session')))
+
+        # When
+        first, second = registry.validators()
+
+        # Then
+        self.assertIsNot(first, second)
+        self.assertIs(first.session, second.session)
+
+    def test_close_should_close_instances_in_reverse_creation_order(self):
+        # Given
+        closed = []
+        registry = ValidatorRegistry()
+        registry.register_resource('session', lambda _: MagicMock(close=lambda: closed.append('session')))
+        registry.register_validator('json', lambda shared: MagicMock(
+            spec=['close', 'session'], session=shared.get('session'), close=lambda: closed.append('json')))
+        registry.register_validator('reference', lambda _: ReferenceValidator())
+
+        # When
+        with registry:
+            registry.validators()
+
+        # Then
+        self.assertListEqual(['json', 'session'], closed)
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_upload_validator_should_be_reused_per_folder(self, mock: MagicMock):
+        # Given
+        mock.return_value = 'file.fastq,checksum'
+        registry = ValidatorRegistry()
+        registry.register_validator('upload', lambda _: UploadValidator())
+
+        # When
+        with self.assertLogs(level='WARNING'):
+            without_folder = registry.validators()
+        first = registry.validators('uuid1')[0]
+        again = registry.validators('uuid1')[0]
+        other = registry.validators('uuid2')[0]
+
+        # Then
+        self.assertListEqual([], without_folder)
+        self.assertIs(first, again)
+        self.assertIsNot(first, other)
+        self.assertEqual('uuid1', first.folder_uuid)
+        self.assertEqual(3, mock.call_count)
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_upload_validate_data_should_use_given_folder(self, mock: MagicMock):
+        # Given
+        mock.side_effect = lambda path: 'file.fastq,checksum' if path.startswith('uuid1/') else ''
+        validator = UploadValidator()
+        submission = Submission()
+        run = submission.map(
+            'run_experiment', 'run1', {'uploaded_file_1': 'file.fastq', 'uploaded_file_1_checksum': 'checksum'})
+
+        # When
+        validator.validate_data(submission, folder_uuid='uuid1')
+
+        # Then
+        self.assertDictEqual({}, run.get_errors())
+        self.assertEqual({}, validator.file_checksum_map)
+
+    def test_shared_reference_validator_should_validate_submissions_concurrently(self):
+        # Given
+        validator = ReferenceValidator()
+        submissions = []
+        for index in range(16):
+            submission = Submission()
+            submission.map('run_experiment', f'run{index}', {'experiment_name': f'run{index}'})
+            submission.map('isolate_genome_assembly_information', 'assembly1', {'run_ref': f'run{index - index % 2}'})
+            submissions.append(submission)
+
+        # When
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(validator.validate_data, submissions))
+
+        # Then
+        for index, submission in enumerate(submissions):
+            self.assertEqual(index % 2 == 1, submission.has_errors(), f'submission {index}')
+
+    @patch.object(UploadValidator, 'get_checksums_file')
+    def test_registry_validators_should_run_through_scheduler(self, mock: MagicMock):
+        # Given
+        mock.side_effect = lambda path: 'file.fastq,checksum1' if path.startswith('uuid1/') else 'file.fastq,checksum2'
+        registry = ValidatorRegistry()
+        registry.register_validator('reference', lambda _: ReferenceValidator())
+        registry.register_validator('upload', lambda _: UploadValidator())
+        submissions = []
+        for index in range(8):
+            submission = Submission()
+            submission.map('sample', f'sample{index}', {})
+            submission.map('run_experiment', f'run{index}', {
+                'sample_ref': f'sample{index - index % 2}',
+                'uploaded_file_1': 'file.fastq',
+                'uploaded_file_1_checksum': 'checksum1'
+            })
+            submissions.append(submission)
+
+        # When
+        with registry, ValidationScheduler(max_workers=4) as scheduler:
+            jobs = [
+                scheduler.submit(submission, registry.validators(f'uuid{index % 2 + 1}'))
+                for index, submission in enumerate(submissions)
+            ]
+            for job in jobs:
+                job.wait(10)
+
+        # Then
+        for index, (job, submission) in enumerate(zip(jobs, submissions)):
+            errors = submission.get_entity('run_experiment', f'run{index}').get_errors()
+            self.assertListEqual([], job.errors)
+            self.assertEqual(index % 2 == 1, 'sample_ref' in errors, f'submission {index}')
+            self.assertEqual(index % 2 == 1, 'uploaded_file_1_checksum' in errors, f'submission {index}')
+
+    def test_create_registry_should_share_http_session(self):
+        # Given
+        session = MagicMock()
+        with patch('submission_validator.validation.registry.requests.Session', return_value=session):
+            registry = create_registry('http://validator/validate', ena_url='http://ena')
+
+            # When
+            with registry:
+                json_validator, taxonomy_validator, reference_validator = registry.validators()
+
+        # Then
+        self.assertIs(session, json_validator.session)
+        self.assertIs(session, taxonomy_validator.ena_taxonomy.session)
+        self.assertIsInstance(reference_validator, ReferenceValidator)
+        session.close.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,187 @@
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from submission_validator.validation.xml import XmlSchemaValidator, load_schema
+
+VALID_RUN = '<RUN alias="run1" center_name="EBI">' \
+            '<EXPERIMENT_REF refname="experiment1"/>' \
+            '<DATA_BLOCK><FILES>' \
+            '<FILE filename="run1.fastq.gz" filetype="fastq" checksum_method="MD5" ' \
+            'checksum="0123456789abcdef0123456789abcdef"/>' \
+            '</FILES></DATA_BLOCK>' \
+            '</RUN>'
+INVALID_RUN = '<RUN alias="run2"><DATA_BLOCK/></RUN>'
+
+
+class TestXmlSchemaValidator(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+        self.xml_validator = XmlSchemaValidator()
+
+    def test_valid_run_set_should_not_return_errors(self):
+        # Given
+        run_set = f'<RUN_SET>{VALID_RUN}</RUN_SET>'
+
+        # When
+        errors = self.xml_validator.validate(run_set)
+
+        # Then
+        self.assertListEqual([], errors)
+
+    def test_invalid_run_should_return_error_location(self):
+        # Given
+        run_set = f'<RUN_SET>{VALID_RUN}\n{INVALID_RUN}</RUN_SET>'
+
+        # When
+        errors = self.xml_validator.validate(run_set)
+
+        # Then
+        self.assertEqual(1, len(errors))
+        self.assertEqual(2, errors[0]['line'])
+        self.assertEqual('/RUN_SET/RUN[2]/DATA_BLOCK', errors[0]['path'])
+        self.assertIn("Element 'DATA_BLOCK': This element is not expected.", errors[0]['error'])
+
+    def test_malformed_xml_should_return_error(self):
+        # Given
+        malformed_run = '<RUN_SET><RUN alias="run1"></RUN_SET>'
+
+        # When
+        errors = self.xml_validator.validate(malformed_run)
+
+        # Then
+        self.assertTrue(errors)
+        self.assertEqual(1, errors[0]['line'])
+
+    def test_explicit_schema_name_should_be_used(self):
+        # When
+        errors = self.xml_validator.validate(VALID_RUN, 'EXPERIMENT')
+
+        # Then
+        self.assertTrue(errors)
+
+    def test_validate_all_should_return_errors_per_document(self):
+        # When
+        errors = self.xml_validator.validate_all([VALID_RUN, INVALID_RUN, VALID_RUN])
+
+        # Then
+        self.assertEqual(3, len(errors))
+        self.assertListEqual([], errors[0])
+        self.assertTrue(errors[1])
+        self.assertListEqual([], errors[2])
+
+    def test_schemas_should_be_compiled_once(self):
+        # Given
+        load_schema.cache_clear()
+
+        # When
+        self.xml_validator.validate_all([VALID_RUN, VALID_RUN, f'<RUN_SET>{VALID_RUN}</RUN_SET>'])
+        XmlSchemaValidator().validate(VALID_RUN)
+
+        # Then
+        cache_info = load_schema.cache_info()
+        self.assertEqual(1, cache_info.misses)
+        self.assertEqual(3, cache_info.hits)
+
+    def test_stream_of_valid_runs_should_not_return_errors(self):
+        # Given
+        run_set = io.BytesIO(f'<RUN_SET>{VALID_RUN}{VALID_RUN}</RUN_SET>'.encode('utf-8'))
+
+        # When
+        errors = list(self.xml_validator.validate_stream(run_set))
+
+        # Then
+        self.assertListEqual([], errors)
+
+    def test_stream_should_return_error_with_line_and_absolute_path(self):
+        # Given
+        run_set = io.BytesIO(f'<RUN_SET>\n{VALID_RUN}\n{VALID_RUN}\n{INVALID_RUN}\n</RUN_SET>'.encode('utf-8'))
+
+        # When
+        errors = list(self.xml_validator.validate_stream(run_set))
+
+        # Then
+        self.assertEqual(1, len(errors))
+        self.assertEqual(4, errors[0]['line'])
+        self.assertEqual('/RUN_SET/RUN[3]/DATA_BLOCK', errors[0]['path'])
+
+    def test_stream_should_reject_elements_of_another_set(self):
+        # Given
+        experiment = '<EXPERIMENT alias="experiment1"/>'
+        run_set = io.BytesIO(f'<RUN_SET>\n{VALID_RUN}\n{experiment}\n</RUN_SET>'.encode('utf-8'))
+
+        # When
+        errors = list(self.xml_validator.validate_stream(run_set))
+
+        # Then
+        self.assertListEqual([{
+            'line': 3,
+            'column': 0,
+            'path': '/RUN_SET/EXPERIMENT[2]',
+            'error': 'Element EXPERIMENT is not expected in a RUN_SET, expected RUN'
+        }], errors)
+
+    def test_stream_should_release_validated_elements(self):
+        # Given
+        run_set = io.BytesIO(f'<RUN_SET>{VALID_RUN}{VALID_RUN}{VALID_RUN}</RUN_SET>'.encode('utf-8'))
+        released = []
+        validate_element = self.xml_validator.validate_element
+
+        def record_preceding_siblings(element, schema_name=None):
+            released.append([len(sibling) for sibling in element.itersiblings(preceding=True)])
+            return validate_element(element, schema_name)
+        self.xml_validator.validate_element = record_preceding_siblings
+
+        # When
+        list(self.xml_validator.validate_stream(run_set))
+
+        # Then
+        self.assertListEqual([[], [0], [0]], released)
+
+    def test_stream_of_single_run_should_validate_root(self):
+        # Given
+        run = io.BytesIO(INVALID_RUN.encode('utf-8'))
+
+        # When
+        errors = list(self.xml_validator.validate_stream(run))
+
+        # Then
+        self.assertEqual(1, len(errors))
+        self.assertEqual('/RUN/DATA_BLOCK', errors[0]['path'])
+
+    def test_stream_of_malformed_xml_should_return_error(self):
+        # Given
+        run_set = io.BytesIO(f'<RUN_SET>{VALID_RUN}<RUN>'.encode('utf-8'))
+
+        # When
+        errors = list(self.xml_validator.validate_stream(run_set))
+
+        # Then
+        self.assertTrue(errors)
+
+    def test_unknown_root_should_return_missing_schema_error(self):
+        # Given
+        document = '<ANALYSIS_SET><ANALYSIS alias="analysis1"/></ANALYSIS_SET>'
+
+        # When
+        errors = self.xml_validator.validate(document)
+
+        # Then
+        expected_error = {'line': 1, 'column': 0, 'path': '/ANALYSIS_SET', 'error': 'No schema for ANALYSIS'}
+        self.assertListEqual([expected_error], errors)
+
+    def test_concurrent_validation_should_keep_errors_per_document(self):
+        # Given
+        documents = [VALID_RUN if index % 2 else INVALID_RUN for index in range(64)]
+
+        # When
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            errors = list(executor.map(self.xml_validator.validate, documents))
+
+        # Then
+        for index, document_errors in enumerate(errors):
+            self.assertEqual(index % 2 == 0, bool(document_errors), f'document {index}')
+
+
+if __name__ == '__main__':
+    unittest.main()